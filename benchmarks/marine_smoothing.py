@@ -0,0 +1,244 @@
+"""
+Benchmark of the marine flow directions smoothing: quality against cost.
+
+The surface used to compute marine flow directions can be smoothed with a
+few Chebyshev iterations instead of the complete solution of the diffusion
+system when `smthIt` is set (see `SEAMesh._smoothSolver`). For increasing numbers of
+iterations, this benchmark reports the smoothing time, the maximum
+elevation difference with the complete solution and the proportion of
+marine nodes having the same steepest receiver.
+
+Two modes are available:
+
+- by default, a goSPL model is run for one time step with marine deposition
+  on an icosphere mesh and `SEAMesh.smoothBenchmark` is called (requires the
+  complete goSPL installation, can be run with mpirun);
+- with ``--standalone``, the smoothing operator (same fortran coefficients,
+  Jacobi preconditioned Chebyshev iterations with Gershgorin bounds) is
+  evaluated in serial with scipy, the complete solution being obtained with a
+  direct solver.
+
+Usage::
+
+    python benchmarks/marine_smoothing.py --standalone --levels 5 6 7
+    mpirun -np 4 python benchmarks/marine_smoothing.py --levels 7
+"""
+
+import os
+import argparse
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from time import perf_counter
+
+from startup import icosphere
+
+SWEEPS = (5, 10, 20, 50, 100)
+
+YAML = """name: marine smoothing benchmark
+
+domain:
+    npdata: ['{mesh}','v','c','z']
+    flowdir: 5
+    seadepo: True
+
+time:
+    start: 0.
+    end: {dt}
+    tout: {dt}
+    dt: {dt}
+
+spl:
+    K: 3.e-8
+    d: 0.42
+
+diffusion:
+    hillslopeKa: 0.02
+    hillslopeKm: 0.2
+    nonlinKm: 100.
+    clinSlp: 5.e-5
+
+output:
+    dir: 'output{level}'
+    makedir: False
+"""
+
+
+def topography(coords):
+    """
+    Defines a synthetic topography with continents and oceans.
+
+    :arg coords: mesh vertices coordinates
+
+    :return: elevation (m)
+    """
+
+    xyz = coords / np.linalg.norm(coords, axis=1)[:, None]
+    lat = np.arcsin(xyz[:, 2])
+    lon = np.arctan2(xyz[:, 1], xyz[:, 0])
+
+    return (
+        2500.0 * np.sin(3.0 * lon) * np.cos(2.0 * lat)
+        + 800.0 * np.cos(7.0 * lon + 1.0) * np.sin(5.0 * lat)
+        + 300.0 * np.sin(17.0 * lon) * np.cos(13.0 * lat)
+        - 1000.0
+    )
+
+
+def chebyshev(A, b, x, dinv, emin, emax, nit):
+    """
+    Performs Jacobi preconditioned Chebyshev iterations.
+
+    :arg A: system matrix
+    :arg b: right hand side
+    :arg x: initial guess
+    :arg dinv: inverse of the matrix diagonal
+    :arg emin: lower eigenvalue bound of the preconditioned operator
+    :arg emax: upper eigenvalue bound of the preconditioned operator
+    :arg nit: number of iterations
+
+    :return: solution after nit iterations
+    """
+
+    theta = 0.5 * (emax + emin)
+    delta = 0.5 * (emax - emin)
+    sigma = theta / delta
+    rho = 1.0 / sigma
+    x = x.copy()
+    r = b - A @ x
+    d = dinv * r / theta
+    for _ in range(nit):
+        x += d
+        r -= A @ d
+        rhon = 1.0 / (2.0 * sigma - rho)
+        d = rhon * rho * d + 2.0 * rhon / delta * (dinv * r)
+        rho = rhon
+
+    return x
+
+
+def standaloneBench(level, dt, flowExp=1.1, sweeps=SWEEPS):
+    """
+    Serial evaluation of the smoothing operator on an icosphere.
+
+    :arg level: icosphere refinement level
+    :arg dt: time step (years)
+    :arg flowExp: flow direction exponent
+    :arg sweeps: numbers of Chebyshev iterations to evaluate
+    """
+
+    from gospl._fortran import definefv, sethillslopecoeff, mfdrcvrs
+
+    coords, cells = icosphere(level)
+    elev = topography(coords)
+    nb = len(coords)
+    ngbID = definefv(coords, cells.astype(np.int32), 1)[0]
+
+    # Smoothing operator (the offshore band covers the entire ocean by default)
+    sea = elev < 0.0
+    Cd = np.full(nb, 1.0e5)
+    Cd[sea] = 5.0e6
+    coeffs = sethillslopecoeff(nb, Cd * dt)
+    valid = ngbID >= 0
+    rows = np.repeat(np.arange(nb), valid.sum(axis=1))
+    A = sp.csr_matrix((coeffs[:, 1:][valid], (rows, ngbID[valid])), shape=(nb, nb))
+    A = (A + sp.diags(coeffs[:, 0])).tocsr()
+    diag = coeffs[:, 0]
+    ratio = np.max(1.0 - 1.0 / diag[diag > 0])
+    emin, emax = max(1.0 - ratio, 1.0e-12), 1.0 + ratio
+
+    t0 = perf_counter()
+    ref = spla.spsolve(A.tocsc(), elev)
+    tref = perf_counter() - t0
+    rcvRef = mfdrcvrs(12, flowExp, ref, -1.0e6)[0][sea, 0]
+
+    print(
+        "Level %d: %d nodes, %d marine nodes, full solution %0.04f seconds"
+        % (level, nb, np.count_nonzero(sea), tref),
+        flush=True,
+    )
+    dinv = 1.0 / diag
+    for nit in sweeps:
+        t0 = perf_counter()
+        smth = chebyshev(A, elev, elev, dinv, emin, emax, nit)
+        tsmth = perf_counter() - t0
+        rcv = mfdrcvrs(12, flowExp, smth, -1.0e6)[0][sea, 0]
+        print(
+            "  %4d iterations: %0.04f seconds | max elevation difference %0.03f m | same receivers %0.02f %%"
+            % (
+                nit,
+                tsmth,
+                np.abs(smth - ref).max(),
+                100.0 * np.count_nonzero(rcv == rcvRef) / max(len(rcv), 1),
+            ),
+            flush=True,
+        )
+
+    return
+
+
+def modelBench(workdir, level, dt, sweeps=SWEEPS):
+    """
+    Runs a goSPL model for one time step and calls its smoothing benchmark.
+
+    :arg workdir: working directory
+    :arg level: icosphere refinement level
+    :arg dt: time step (years)
+    :arg sweeps: numbers of Chebyshev iterations to evaluate
+    """
+
+    from mpi4py import MPI
+    from gospl.model import Model
+
+    MPIrank = MPI.COMM_WORLD.Get_rank()
+    mesh = os.path.join(workdir, "icosphere{}".format(level))
+    yml = os.path.join(workdir, "smoothing{}.yml".format(level))
+    if MPIrank == 0:
+        os.makedirs(workdir, exist_ok=True)
+        coords, cells = icosphere(level)
+        np.savez(mesh, v=coords, c=cells, z=topography(coords))
+        with open(yml, "w") as f:
+            f.write(YAML.format(mesh=mesh, dt=dt, level=level))
+    MPI.COMM_WORLD.Barrier()
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    model = Model(yml, verbose=False)
+    model.runProcesses()
+    model.smoothBenchmark(sweeps=sweeps)
+    model.destroy()
+    os.chdir(cwd)
+
+    return
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--levels", type=int, nargs="+", default=[5, 6, 7], help="refinement levels"
+    )
+    parser.add_argument("--dt", type=float, default=1.0e4, help="time step (years)")
+    parser.add_argument(
+        "--sweeps", type=int, nargs="+", default=list(SWEEPS), help="Chebyshev iterations"
+    )
+    parser.add_argument(
+        "--workdir", default="bench_smoothing", help="directory for meshes and outputs"
+    )
+    parser.add_argument(
+        "--standalone", action="store_true", help="serial evaluation without PETSc"
+    )
+    args = parser.parse_args()
+
+    for level in args.levels:
+        if args.standalone:
+            standaloneBench(level, args.dt, sweeps=args.sweeps)
+        else:
+            modelBench(os.path.abspath(args.workdir), level, args.dt, sweeps=args.sweeps)
+
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Startup benchmark of goSPL on icosphere meshes of increasing refinement.
+
+For each refinement level, an icosphere mesh is created and stored as a
+**.npz** file (keys ``v``, ``c`` and ``z``) in the working directory. Two
+measurements are available:
+
+- by default, the finite volume geometry builder (fortran subroutine
+  `definefv`) is applied on the entire mesh in a fresh process for each
+  level. The process loads the mesh first and the reported memory is the
+  increase of its peak resident memory during the builder call (temporary
+  arrays, outputs and fortran mesh tables).
+- with the ``--model`` flag, the time required to initialise a goSPL
+  `Model` (mesh loading, distribution and finite volume discretisation).
+
+Usage::
+
+    python benchmarks/startup.py --levels 5 6 7
+    mpirun -np 4 python benchmarks/startup.py --levels 7 8 --model
+"""
+
+import os
+import sys
+import json
+import argparse
+import resource
+import subprocess
+
+import numpy as np
+
+from time import perf_counter
+
+YAML = """name: startup benchmark
+
+domain:
+    npdata: ['{mesh}','v','c','z']
+    flowdir: 5
+    fast: True
+{extra}
+time:
+    start: 0.
+    end: 1000.
+    tout: 1000.
+    dt: 1000.
+
+output:
+    dir: 'output{level}'
+    makedir: False
+"""
+
+
+def icosphere(level, radius=6378137.0):
+    """
+    Builds an icosphere by recursive subdivision of an icosahedron.
+
+    :arg level: number of subdivisions
+    :arg radius: sphere radius (m)
+
+    :return: coords, cells
+    """
+
+    t = 0.5 * (1.0 + np.sqrt(5.0))
+    coords = np.array(
+        [
+            [-1, t, 0], [1, t, 0], [-1, -t, 0], [1, -t, 0],
+            [0, -1, t], [0, 1, t], [0, -1, -t], [0, 1, -t],
+            [t, 0, -1], [t, 0, 1], [-t, 0, -1], [-t, 0, 1],
+        ],
+        dtype=np.float64,
+    )
+    cells = np.array(
+        [
+            [0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
+            [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
+            [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
+            [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1],
+        ],
+        dtype=np.int64,
+    )
+    coords /= np.linalg.norm(coords, axis=1)[:, None]
+
+    for _ in range(level):
+        # Unique edges of the triangulation and their midpoints
+        edges = np.sort(
+            np.vstack([cells[:, [0, 1]], cells[:, [1, 2]], cells[:, [2, 0]]]), axis=1
+        )
+        keys = edges[:, 0] * len(coords) + edges[:, 1]
+        ukeys, inv = np.unique(keys, return_inverse=True)
+        mid = 0.5 * (coords[ukeys // len(coords)] + coords[ukeys % len(coords)])
+        mid /= np.linalg.norm(mid, axis=1)[:, None]
+        m = inv.reshape(3, -1).T + len(coords)
+        coords = np.vstack([coords, mid])
+        cells = np.vstack(
+            [
+                np.column_stack([cells[:, 0], m[:, 0], m[:, 2]]),
+                np.column_stack([cells[:, 1], m[:, 1], m[:, 0]]),
+                np.column_stack([cells[:, 2], m[:, 2], m[:, 1]]),
+                m,
+            ]
+        )
+
+    return coords * radius, cells
+
+
+def geometryBench(meshfile):
+    """
+    Times the finite volume geometry builder on the entire mesh. This function is meant to be called in a fresh process (see `geometryRun`).
+
+    :arg meshfile: icosphere mesh file
+
+    :return: elapsed time (s), peak resident memory increase (Mb)
+    """
+
+    from gospl._fortran import definefv
+
+    mesh = np.load(meshfile)
+    coords = mesh["v"]
+    cells = mesh["c"].astype(np.int32)
+    del mesh
+
+    peak0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = perf_counter()
+    ngbID, area, cvarea, ierr = definefv(coords, cells, 1)
+    elapsed = perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if ierr > 0:
+        raise RuntimeError("Vertices with more than 12 neighbours.")
+
+    return elapsed, (peak - peak0) / 1024.0
+
+
+def geometryRun(meshfile):
+    """
+    Runs the finite volume geometry benchmark in a fresh process.
+
+    :arg meshfile: icosphere mesh file
+
+    :return: elapsed time (s), peak resident memory increase (Mb)
+    """
+
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--geometry", meshfile],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def modelBench(workdir, level, extra):
+    """
+    Times the initialisation of a goSPL model.
+
+    :arg workdir: working directory
+    :arg level: refinement level
+    :arg extra: additional domain options
+
+    :return: elapsed time (s)
+    """
+
+    from mpi4py import MPI
+    from gospl.model import Model
+
+    MPIrank = MPI.COMM_WORLD.Get_rank()
+    yml = os.path.join(workdir, "startup{}.yml".format(level))
+    if MPIrank == 0:
+        with open(yml, "w") as f:
+            f.write(
+                YAML.format(
+                    mesh=os.path.join(workdir, "icosphere{}".format(level)),
+                    extra="".join("    {}\n".format(e) for e in extra),
+                    level=level,
+                )
+            )
+    MPI.COMM_WORLD.Barrier()
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    MPI.COMM_WORLD.Barrier()
+    t0 = perf_counter()
+    model = Model(yml, verbose=False)
+    MPI.COMM_WORLD.Barrier()
+    elapsed = perf_counter() - t0
+    model.destroy()
+    os.chdir(cwd)
+
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--levels", type=int, nargs="+", default=[5, 6, 7], help="refinement levels"
+    )
+    parser.add_argument(
+        "--workdir", default="bench_startup", help="directory for meshes and outputs"
+    )
+    parser.add_argument(
+        "--model", action="store_true", help="time the goSPL model initialisation"
+    )
+    parser.add_argument(
+        "--extra",
+        nargs="*",
+        default=[],
+        help="additional domain options (e.g. 'parmesh: True' 'meshcache: cache')",
+    )
+    parser.add_argument("--geometry", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Finite volume geometry benchmark of a single mesh (child process)
+    if args.geometry is not None:
+        print(json.dumps(geometryBench(args.geometry)), flush=True)
+        return
+
+    MPIrank = 0
+    if args.model:
+        from mpi4py import MPI
+
+        MPIrank = MPI.COMM_WORLD.Get_rank()
+
+    workdir = os.path.abspath(args.workdir)
+    if MPIrank == 0:
+        os.makedirs(workdir, exist_ok=True)
+        if args.model:
+            print("{:>6} {:>12} {:>12}".format("level", "nodes", "model (s)"), flush=True)
+        else:
+            print(
+                "{:>6} {:>12} {:>12} {:>14}".format(
+                    "level", "nodes", "FV (s)", "FV peak (Mb)"
+                ),
+                flush=True,
+            )
+
+    for level in args.levels:
+        meshfile = os.path.join(workdir, "icosphere{}.npz".format(level))
+        nodes = 0
+        if MPIrank == 0:
+            coords, cells = icosphere(level)
+            elev = 1000.0 * coords[:, 2] / np.linalg.norm(coords, axis=1)
+            np.savez(meshfile, v=coords, c=cells, z=elev)
+            nodes = len(coords)
+            del coords, cells, elev
+
+        if args.model:
+            MPI.COMM_WORLD.Barrier()
+            modelTime = modelBench(workdir, level, args.extra)
+            if MPIrank == 0:
+                print("{:>6d} {:>12d} {:>12.3f}".format(level, nodes, modelTime), flush=True)
+        else:
+            fvTime, fvPeak = geometryRun(meshfile)
+            print(
+                "{:>6d} {:>12d} {:>12.3f} {:>14.1f}".format(level, nodes, fvTime, fvPeak),
+                flush=True,
+            )
+
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ from time import process_time
 
 if "READTHEDOCS" not in os.environ:
     from gospl._fortran import mfdreceivers
+    from gospl._fortran import flowaccumulation
+
+from .flowshell import ShellOperator
 
 petsc4py.init(sys.argv)
 MPIrank = petsc4py.PETSc.COMM_WORLD.Get_rank()
@@ -37,6 +40,28 @@ class FAMesh(object):
         # KSP solver parameters
         self.rtol = 1.0e-10
 
+        # Persistent KSP solvers registry (keyed by role)
+        self.solvers = {}
+
+        # Persistent nested systems of the coupled solves (keyed by role)
+        self.nests = {}
+
+        # Active set (land nodes and their receivers) of the SPL solves
+        self.landSet = None
+        self.splRatio = 0.9
+
+        # Elevation-keyed caches for flow receivers and depressions state
+        self.rcvCache = []
+        self.rcvCacheSize = 2
+        self.rcvVersion = 0
+        self.rcvKey = 0
+        self.flowKey = None
+        self.fMatSame = False
+        self.cacheStats = {
+            "fill": np.zeros(2, dtype=int),
+            "receivers": np.zeros(2, dtype=int),
+        }
+
         # Identity matrix construction
         self.II = np.arange(0, self.lpoints + 1, dtype=petsc4py.PETSc.IntType)
         self.JJ = np.arange(0, self.lpoints, dtype=petsc4py.PETSc.IntType)
@@ -58,6 +83,9 @@ class FAMesh(object):
         if self.iceOn:
             self.iceFAG = self.hGlobal.duplicate()
             self.iceFAL = self.hLocal.duplicate()
+        if self.topoFlow:
+            self.topoL = self.hLocal.duplicate()
+            self.topoG = self.hGlobal.duplicate()
 
         return
 
@@ -83,16 +111,21 @@ class FAMesh(object):
 
         return matrix
 
-    def _matrix_build_diag(self, V, nnz=(1, 1)):
+    def _matrix_build_diag(self, V, nnz=(1, 1), sub=None):
         """
         Builds a PETSc diagonal matrix based on a given array `V`
 
         :arg V: diagonal data array
         :arg nnz: array containing the number of nonzero blocks
+        :arg sub: active set dictionary (optional, see `_landSet`)
 
         :return: sparse PETSc matrix
         """
 
+        if sub is not None:
+            empty = np.zeros((self.lpoints, 0))
+            return self._matrix_build_csr(empty.astype(int), empty, diag=V, sub=sub)
+
         matrix = self._matrix_build()
 
         # Define diagonal matrix
@@ -106,6 +139,207 @@ class FAMesh(object):
 
         return matrix
 
+    def _matrix_build_csr(self, cols, vals, diag=None, transpose=False, sub=None):
+        """
+        Builds a PETSc sparse matrix in a single pass from a set of neighbouring indices and associated coefficients (one column per direction or neighbour).
+
+        .. note::
+
+            The local Compressed Sparse Row (**CSR**) arrays are built directly from the `cols` and `vals` arrays and the matrix is preallocated with the exact number of diagonal and off-diagonal nonzeros per row before being filled with a single call to `setValuesLocalCSR`. This replaces the assembly of one temporary matrix per direction which were then summed together.
+
+            Entries pointing to the node itself, to undefined nodes (negative indices) or with null coefficients are skipped, and only the rows owned by the local partition are considered (ghost rows are defined on their own partition).
+
+        When `transpose` is set, the CSR arrays of the transposed matrix are assembled directly, which avoids the explicit transposition of the global PETSc matrix. In this case, entries associated to ghost rows are sent to the partition owning them during assembly.
+
+        When an active set `sub` is provided, the matrix is only defined over the active nodes (rows and columns) using the layout of the active set.
+
+        :arg cols: integer array of shape (lpoints, k) containing the local column indices for each row
+        :arg vals: float array of shape (lpoints, k) containing the associated coefficients
+        :arg diag: diagonal data array (optional)
+        :arg transpose: boolean to build the transposed matrix
+        :arg sub: active set dictionary (optional, see `_landSet`)
+
+        :return: sparse PETSc matrix
+        """
+
+        nodes = np.arange(0, self.lpoints, dtype=petsc4py.PETSc.IntType)
+        cols = cols.astype(petsc4py.PETSc.IntType)
+
+        # Off-diagonal entries
+        keep = (cols >= 0) & (cols != nodes[:, None]) & (vals != 0.0)
+        keep[self.ghostIDs, :] = False
+        if sub is not None:
+            keep &= sub["active"][:, None] & sub["active"][cols]
+        rows = np.broadcast_to(nodes[:, None], cols.shape)[keep]
+        cols = cols[keep]
+        data = vals[keep]
+
+        # Diagonal entries
+        if diag is not None:
+            inodes = nodes[self.glIDs]
+            if sub is not None:
+                inodes = inodes[sub["pos"]]
+            rows = np.concatenate((inodes, rows))
+            cols = np.concatenate((inodes, cols))
+            data = np.concatenate((diag[inodes], data))
+
+        if transpose:
+            rows, cols = cols, rows
+
+        # Sort the entries by rows to define the CSR arrays
+        order = np.argsort(rows, kind="stable")
+        rows = rows[order]
+        cols = cols[order]
+        data = data[order].astype(np.float64)
+        indptr = np.zeros(self.lpoints + 1, dtype=petsc4py.PETSc.IntType)
+        indptr[1:] = np.cumsum(np.bincount(rows, minlength=self.lpoints))
+
+        # Exact number of nonzeros in the diagonal and off-diagonal blocks
+        ondiag = (self.inIDs[rows] == 1) & (self.inIDs[cols] == 1)
+        dnnz = self.hLocal.duplicate()
+        onnz = self.hLocal.duplicate()
+        dnnz.setArray(np.bincount(rows[ondiag], minlength=self.lpoints))
+        onnz.setArray(np.bincount(rows[~ondiag], minlength=self.lpoints))
+        nnz = [self.hGlobal.duplicate(), self.hGlobal.duplicate()]
+        nnz[0].set(0.0)
+        nnz[1].set(0.0)
+        self.dm.localToGlobal(dnnz, nnz[0], addv=petsc4py.PETSc.InsertMode.ADD)
+        self.dm.localToGlobal(onnz, nnz[1], addv=petsc4py.PETSc.InsertMode.ADD)
+        prealloc = (
+            nnz[0].getArray().astype(petsc4py.PETSc.IntType),
+            nnz[1].getArray().astype(petsc4py.PETSc.IntType),
+        )
+        if sub is not None:
+            prealloc = (prealloc[0][sub["pos"]], prealloc[1][sub["pos"]])
+        dnnz.destroy()
+        onnz.destroy()
+        nnz[0].destroy()
+        nnz[1].destroy()
+
+        matrix = petsc4py.PETSc.Mat().create(comm=MPIcomm)
+        matrix.setType("aij")
+        if sub is not None:
+            matrix.setSizes(sub["sizes"])
+            if transpose:
+                matrix.setLGMap(sub["lgmap"][1], sub["lgmap"][1])
+            else:
+                matrix.setLGMap(sub["lgmap"][0], sub["lgmap"][1])
+        else:
+            matrix.setSizes(self.sizes)
+            if transpose:
+                matrix.setLGMap(self.lgmap_col, self.lgmap_col)
+            else:
+                matrix.setLGMap(self.lgmap_row, self.lgmap_col)
+        matrix.setFromOptions()
+        matrix.setPreallocationNNZ(prealloc)
+
+        matrix.setValuesLocalCSR(
+            indptr,
+            cols,
+            data,
+            addv=petsc4py.PETSc.InsertMode.ADD,
+        )
+        matrix.assemblyBegin()
+        matrix.assemblyEnd()
+
+        if self.memclear:
+            del nodes, keep, rows, cols, data, order, indptr, ondiag, prealloc
+            gc.collect()
+
+        return matrix
+
+    def _landSet(self):
+        """
+        Defines the active set of the stream power law solves: the land nodes and their receivers. The set is consistent across partitions and is given its own parallel layout (sizes and local to global mappings) used to assemble the matrices and vectors restricted to the active nodes.
+
+        .. note::
+
+            Marine nodes are not eroded and only receive sediment fluxes from land donors. Their rows in the SPL systems reduce to identity, so that nodes outside the active set keep their elevation and can be left out of the solves. When the active set covers most of the mesh (above `splRatio`) the full system is solved instead.
+
+        :return: active set dictionary (None when the full system is solved)
+        """
+
+        # Land nodes and their receivers
+        land = np.ones(self.lpoints, dtype=bool)
+        land[self.seaID] = False
+        active = land.copy()
+        rcvs = self.rcvIDi[land]
+        active[rcvs[self.wghtVali[land] > 0.0]] = True
+
+        # Consistent active nodes across partitions
+        self.tmpL.setArray(active.astype(np.float64))
+        self.tmp.set(0.0)
+        self.dm.localToGlobal(self.tmpL, self.tmp, addv=petsc4py.PETSc.InsertMode.ADD)
+        self.dm.globalToLocal(self.tmp, self.tmpL)
+        active = self.tmpL.getArray() > 0.0
+
+        # Active owned nodes ordered as in the global vectors
+        pos = np.where(active[self.glIDs])[0].astype(petsc4py.PETSc.IntType)
+        nloc = len(pos)
+        nsub = MPI.COMM_WORLD.allreduce(nloc, op=MPI.SUM)
+        if nsub == 0 or nsub > self.splRatio * self.mpoints:
+            return None
+        offset = MPI.COMM_WORLD.exscan(nloc)
+        if offset is None:
+            offset = 0
+
+        # Active set index of each local node (-1 for inactive nodes)
+        subIdx = -np.ones(self.tmp.getLocalSize(), dtype=np.float64)
+        subIdx[pos] = offset + np.arange(nloc)
+        self.tmp.setArray(subIdx)
+        self.dm.globalToLocal(self.tmp, self.tmpL)
+        subIdx = self.tmpL.getArray().astype(petsc4py.PETSc.IntType)
+        rowIdx = subIdx.copy()
+        rowIdx[self.ghostIDs] = -1
+
+        if self.landSet is not None:
+            self.landSet["lgmap"][0].destroy()
+            self.landSet["lgmap"][1].destroy()
+        self.landSet = {
+            "active": active,
+            "pos": pos,
+            "sizes": ((nloc, nsub), (nloc, nsub)),
+            "lgmap": (
+                petsc4py.PETSc.LGMap().create(rowIdx, comm=MPIcomm),
+                petsc4py.PETSc.LGMap().create(subIdx, comm=MPIcomm),
+            ),
+        }
+
+        if self.memclear:
+            del land, rcvs, subIdx, rowIdx
+            gc.collect()
+
+        return self.landSet
+
+    def _landVector(self, vec):
+        """
+        Extracts the values of the active nodes from a global vector (see `_landSet`).
+
+        :arg vec: PETSc global vector
+
+        :return: PETSc vector defined on the active set
+        """
+
+        sub = petsc4py.PETSc.Vec().createMPI(self.landSet["sizes"][0], comm=MPIcomm)
+        sub.setArray(vec.getArray()[self.landSet["pos"]])
+
+        return sub
+
+    def _landScatter(self, sub, base, vec):
+        """
+        Scatters a solution obtained on the active set back into a global vector. Nodes outside the active set take the values of the `base` vector.
+
+        :arg sub: PETSc vector defined on the active set
+        :arg base: PETSc global vector used for the inactive nodes
+        :arg vec: PETSc global vector to update
+        """
+
+        data = base.getArray().copy()
+        data[self.landSet["pos"]] = sub.getArray()
+        vec.setArray(data)
+
+        return
+
     def _make_reasons(self, reasons):
         """
         Provides reasons for PETSc error...
@@ -115,7 +349,416 @@ class FAMesh(object):
             [(getattr(reasons, r), r) for r in dir(reasons) if not r.startswith("_")]
         )
 
-    def _solve_KSP2(self, matrix, vector1, vector2):
+    def _matrix_build_shell(self, cols, vals, diag=None, transpose=False):
+        """
+        Builds a matrix-free PETSc shell matrix applying the operator defined by a set of neighbouring indices and associated coefficients (see `ShellOperator`). The arguments are the same as the ones used in `_matrix_build_csr`.
+
+        .. note::
+
+            No assembly is performed: the matrix-vector products are computed directly from the receivers and weights arrays, and the operator diagonal is available for point Jacobi preconditioning.
+
+        :arg cols: integer array of shape (lpoints, k) containing the local column indices for each row
+        :arg vals: float array of shape (lpoints, k) containing the associated coefficients
+        :arg diag: diagonal data array (optional)
+        :arg transpose: boolean to apply the transposed operator
+
+        :return: PETSc shell matrix
+        """
+
+        nodes = np.arange(0, self.lpoints, dtype=petsc4py.PETSc.IntType)
+        cols = cols.astype(petsc4py.PETSc.IntType)
+
+        # Off-diagonal entries
+        keep = (cols >= 0) & (cols != nodes[:, None]) & (vals != 0.0)
+        keep[self.ghostIDs, :] = False
+        rows = np.broadcast_to(nodes[:, None], cols.shape)[keep]
+
+        # Diagonal entries
+        ldiag = np.zeros(self.lpoints, dtype=np.float64)
+        if diag is not None:
+            ldiag[self.glIDs] = diag[self.glIDs]
+
+        context = ShellOperator(
+            self.dm,
+            rows,
+            cols[keep],
+            vals[keep].astype(np.float64),
+            ldiag,
+            transpose,
+        )
+        matrix = petsc4py.PETSc.Mat().createPython(
+            self.sizes, context=context, comm=MPIcomm
+        )
+        matrix.setUp()
+
+        return matrix
+
+    def _matrix_build_op(self, cols, vals, diag=None, transpose=False, assembled=False):
+        """
+        Returns the routing operator either as a matrix-free shell matrix (when `matfree` is turned on in the input file) or as an assembled sparse matrix.
+
+        :arg cols: integer array of shape (lpoints, k) containing the local column indices for each row
+        :arg vals: float array of shape (lpoints, k) containing the associated coefficients
+        :arg diag: diagonal data array (optional)
+        :arg transpose: boolean to define the transposed operator
+        :arg assembled: boolean to force the assembly of the matrix
+
+        :return: PETSc matrix
+        """
+
+        if self.matFree and not assembled:
+            return self._matrix_build_shell(cols, vals, diag, transpose)
+
+        return self._matrix_build_csr(cols, vals, diag, transpose)
+
+    def _getKSP(
+        self, role, matrix, ksptype, pctype, reuse=False, prefix=None, **tolerances
+    ):
+        """
+        Returns the persistent PETSc *scalable linear equations solvers* (**KSP**) associated to a given `role` (flow, SPL, hillslope, advection...). The solvers are kept alive across calls and time steps and stored in the `solvers` registry.
+
+        .. note::
+
+            The registry only keeps a reference to the operator set on the solver. Calling the solver again with the same matrix does not set up the preconditioner again as PETSc tracks the state of the operator. When `reuse` is set, the preconditioner built for a previous operator is also kept for a new one (``setReusePreconditioner``). Callers set it when they know that the new operator is identical or close to the previous one (*e.g.* flow matrix built from cached receivers).
+
+        :arg role: string defining the solver role
+        :arg matrix: PETSc sparse matrix used by the KSP solver
+        :arg ksptype: KSP type used when the solver is created
+        :arg pctype: preconditioner type used when the solver is created
+        :arg reuse: boolean to reuse the existing preconditioner
+        :arg prefix: options prefix used to set the solver from the command line
+        :arg tolerances: KSP tolerances used when the solver is created
+
+        :return: ksp PETSc KSP solver
+        """
+
+        t0 = process_time()
+        if role not in self.solvers:
+            ksp = petsc4py.PETSc.KSP().create(petsc4py.PETSc.COMM_WORLD)
+            ksp.setType(ksptype)
+            ksp.getPC().setType(pctype)
+            ksp.setTolerances(**tolerances)
+            if prefix is not None:
+                ksp.setOptionsPrefix(prefix)
+            self.solvers[role] = {
+                "solver": ksp,
+                "op": None,
+                "is": None,
+                "time": np.zeros(3),
+            }
+        solver = self.solvers[role]
+        ksp = solver["solver"]
+        if prefix is not None:
+            ksp.setFromOptions()
+
+        if solver["op"] is not None:
+            if solver["op"].getSizes() != matrix.getSizes():
+                # Operators defined on active sets may change size
+                ksp.reset()
+                reuse = False
+            solver["op"].destroy()
+        ksp.setOperators(matrix, matrix)
+        ksp.setReusePreconditioner(reuse)
+        solver["op"] = ksp.getOperators()[0]
+        ksp.setUp()
+        solver["time"][0] += process_time() - t0
+
+        return ksp
+
+    def _getNestKSP(self, role, sysMat, subpcs):
+        """
+        Returns the persistent PETSc KSP solver associated to a coupled system defined with nested submatrices (`role`: SPL with deposition or marine deposition). The solver uses a Transpose-Free Quasi-Minimal Residual method (`tfqmr`) with a ``fieldsplit`` preconditioner combining two separate preconditioners for the collections of variables.
+
+        .. note::
+
+            The KSP, the fieldsplit preconditioner and its sub-solvers are created only once and are reused for all subsequent calls with the same `role`. Only the operator is reset, unless the size of the coupled system has changed (active sets) in which case the solver is created again.
+
+            When the `schur` option is set, the fieldsplit preconditioner eliminates the fluxes and solves the Schur complement for the elevations (``full`` factorisation with a ``selfp`` preconditioning matrix, which is cheap to build as the coupling blocks are diagonal). As the Schur complement is solved iteratively (`gmres`), the preconditioner varies between iterations and the flexible `fgmres` method is used in place of `tfqmr`.
+
+        :arg role: string defining the solver role
+        :arg sysMat: nested PETSc matrix of the coupled system
+        :arg subpcs: preconditioner types for the two fields
+
+        :return: ksp PETSc KSP solver
+        """
+
+        t0 = process_time()
+        stime = np.zeros(3)
+        if role in self.solvers:
+            solver = self.solvers[role]
+            if solver["solver"].getOperators()[0].getSizes() != sysMat.getSizes():
+                # Coupled systems defined on active sets may change size
+                stime = solver["time"]
+                solver["solver"].destroy()
+                for k in range(2):
+                    solver["is"][0][k].destroy()
+                    solver["is"][1][k].destroy()
+                del self.solvers[role]
+        if role not in self.solvers:
+            ksp = petsc4py.PETSc.KSP().create(petsc4py.PETSc.COMM_WORLD)
+            if self.schurSplit:
+                # The inner Schur complement solve makes the preconditioner
+                # change between iterations which requires a flexible method
+                ksp.setType(petsc4py.PETSc.KSP.Type.FGMRES)
+            else:
+                ksp.setType(petsc4py.PETSc.KSP.Type.TFQMR)
+            ksp.setOperators(sysMat)
+            ksp.setTolerances(rtol=self.rtol)
+
+            pc = ksp.getPC()
+            pc.setType("fieldsplit")
+            nested_IS = sysMat.getNestISs()
+            if self.schurSplit:
+                # Eliminate the fluxes and solve the Schur complement on `h`
+                pc.setFieldSplitIS(("q", nested_IS[0][1]), ("h", nested_IS[0][0]))
+                pc.setFieldSplitType(petsc4py.PETSc.PC.CompositeType.SCHUR)
+                pc.setFieldSplitSchurFactType(
+                    petsc4py.PETSc.PC.FieldSplitSchurFactType.FULL
+                )
+                pc.setFieldSplitSchurPreType(
+                    petsc4py.PETSc.PC.FieldSplitSchurPreType.SELFP
+                )
+                ksp.setUp()
+                subksps = pc.getFieldSplitSubKSP()
+                subksps[0].setType("preonly")
+                subksps[0].getPC().setType(subpcs[1])
+                subksps[1].setType("gmres")
+                subksps[1].setTolerances(rtol=self.rtol)
+                subksps[1].getPC().setType(subpcs[0])
+            else:
+                pc.setFieldSplitIS(("h", nested_IS[0][0]), ("q", nested_IS[0][1]))
+                subksps = pc.getFieldSplitSubKSP()
+                for k in range(2):
+                    subksps[k].setType("preonly")
+                    subksps[k].getPC().setType(subpcs[k])
+            self.solvers[role] = {
+                "solver": ksp,
+                "op": None,
+                "is": nested_IS,
+                "time": stime,
+            }
+        else:
+            ksp = self.solvers[role]["solver"]
+            ksp.setOperators(sysMat)
+        ksp.setUp()
+        self.solvers[role]["time"][0] += process_time() - t0
+
+        return ksp
+
+    def _nestVector(self, data, sub=None):
+        """
+        Converts a local array into a PETSc global vector defined on the full mesh or on an active set.
+
+        :arg data: local data array
+        :arg sub: active set dictionary (optional, see `_landSet`)
+
+        :return: PETSc vector
+        """
+
+        vec = self.hGlobal.duplicate()
+        self.tmpL.setArray(data)
+        self.dm.localToGlobal(self.tmpL, vec)
+        if sub is not None:
+            svec = self._landVector(vec)
+            vec.destroy()
+            return svec
+
+        return vec
+
+    def _coupledSolve(self, role, A00, A11, diags, rhs, subpcs, sub=None):
+        r"""
+        Solves a coupled elevation/sediment flux system defined with nested submatrices (`role`: SPL with deposition or marine deposition):
+
+        .. math::
+
+            \begin{pmatrix} \mathrm{A_{00}} + \mathrm{D_{00}} & \mathrm{D_{01}} \\ \mathrm{D_{10}} & \mathrm{A_{11}} \end{pmatrix} \begin{pmatrix} \mathrm{h} \\ \mathrm{q} \end{pmatrix} = \begin{pmatrix} \mathrm{r_0} \\ \mathrm{r_1} \end{pmatrix}
+
+        where the :math:`\mathrm{D}` blocks are diagonal.
+
+        .. note::
+
+            The nested matrix, its blocks and the nested vectors are kept alive across time steps. At each call, only the values of the diagonal blocks are updated and the values of `A00` and `A11` are copied in place when their sparsity pattern is unchanged. The nested system is only rebuilt when one of these patterns (or the size of the system) changes. The time spent updating the blocks is recorded as setup time of the solver `role`.
+
+        The elevation solution is stored in the `newH` vector.
+
+        :arg role: string defining the solver role
+        :arg A00: PETSc matrix defining the elevation block
+        :arg A11: PETSc matrix defining the sediment flux block
+        :arg diags: local arrays defining the diagonal of the D00, D01 and D10 blocks
+        :arg rhs: PETSc global vectors defining the right hand sides of the two fields
+        :arg subpcs: preconditioner types for the two fields
+        :arg sub: active set dictionary (optional, see `_landSet`)
+        """
+
+        t0 = process_time()
+
+        # Check if the nested system could be reused
+        csr = [A00.getValuesCSR()[:2], A11.getValuesCSR()[:2]]
+        same = np.zeros(1, dtype=np.int64)
+        nest = self.nests.get(role)
+        if nest is not None and nest["mat"].getSizes()[0][1] == 2 * A00.getSize()[0]:
+            same[0] = int(
+                all(
+                    np.array_equal(csr[k][0], nest["csr"][k][0])
+                    and np.array_equal(csr[k][1], nest["csr"][k][1])
+                    for k in range(2)
+                )
+            )
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, same, op=MPI.MIN)
+
+        # Update the blocks in place or rebuild the nested system
+        dvecs = [self._nestVector(diags[k], sub) for k in range(3)]
+        if same[0] == 1:
+            blocks = nest["blocks"]
+            A00.copy(blocks[0][0], structure=petsc4py.PETSc.Mat.Structure.SAME_NONZERO_PATTERN)
+            A11.copy(blocks[1][1], structure=petsc4py.PETSc.Mat.Structure.SAME_NONZERO_PATTERN)
+            blocks[0][1].setDiagonal(dvecs[1])
+            blocks[1][0].setDiagonal(dvecs[2])
+        else:
+            if nest is not None:
+                self._destroyNest(role)
+            blocks = [
+                [A00.copy(), self._matrix_build_diag(diags[1], sub=sub)],
+                [self._matrix_build_diag(diags[2], sub=sub), A11.copy()],
+            ]
+            nest = {"blocks": blocks, "csr": csr}
+            nest["mat"] = petsc4py.PETSc.Mat().createNest(mats=blocks, comm=MPIcomm)
+            vecs = [blocks[0][0].createVecs("left"), blocks[1][1].createVecs("left")]
+            nest["rhs"] = petsc4py.PETSc.Vec().createNest(vecs, comm=MPIcomm)
+            nest["rhs"].setUp()
+            nest["sol"] = nest["rhs"].duplicate()
+            vecs[0].destroy()
+            vecs[1].destroy()
+            self.nests[role] = nest
+        dvecs[0].axpy(1.0, blocks[0][0].getDiagonal())
+        blocks[0][0].setDiagonal(dvecs[0])
+        nest["mat"].assemblyBegin()
+        nest["mat"].assemblyEnd()
+        for k in range(3):
+            dvecs[k].destroy()
+
+        # Right hand side vectors
+        rvecs = nest["rhs"].getNestSubVecs()
+        for k in range(2):
+            if sub is not None:
+                rvecs[k].setArray(rhs[k].getArray()[sub["pos"]])
+            else:
+                rhs[k].copy(rvecs[k])
+        tb = process_time() - t0
+
+        # Get persistent solver and precondition conditions
+        ksp = self._getNestKSP(role, nest["mat"], subpcs)
+        self.solvers[role]["time"][0] += tb
+
+        t0 = process_time()
+        ksp.solve(nest["rhs"], nest["sol"])
+        self._solverTime(role, t0)
+        r = ksp.getConvergedReason()
+        if r < 0:
+            KSPReasons = self._make_reasons(petsc4py.PETSc.KSP.ConvergedReason())
+            if MPIrank == 0:
+                print(
+                    "LinearSolver (%s) failed to converge after iterations" % role,
+                    ksp.getIterationNumber(),
+                    flush=True,
+                )
+                print("with reason: ", KSPReasons[r], flush=True)
+        else:
+            if MPIrank == 0 and self.verbose:
+                print(
+                    "LinearSolver (%s) converge after %d iterations"
+                    % (role, ksp.getIterationNumber()),
+                    flush=True,
+                )
+
+        # Update the solution
+        hSub = nest["sol"].getNestSubVecs()[0]
+        if sub is not None:
+            self._landScatter(hSub, self.hOld, self.newH)
+        else:
+            hSub.copy(self.newH)
+
+        return
+
+    def _destroyNest(self, role):
+        """
+        Destroys the persistent nested system associated to a given solver `role`.
+
+        :arg role: string defining the solver role
+        """
+
+        nest = self.nests.pop(role)
+        nest["mat"].destroy()
+        nest["rhs"].destroy()
+        nest["sol"].destroy()
+        for k in range(2):
+            nest["blocks"][k][0].destroy()
+            nest["blocks"][k][1].destroy()
+
+        return
+
+    def _solverTime(self, role, t0):
+        """
+        Records the solution time of a given solver `role`.
+
+        :arg role: string defining the solver role
+        :arg t0: starting time of the solve
+        """
+
+        if role not in self.solvers:
+            self.solvers[role] = {
+                "solver": None,
+                "op": None,
+                "is": None,
+                "time": np.zeros(3),
+            }
+        self.solvers[role]["time"][1] += process_time() - t0
+        self.solvers[role]["time"][2] += 1
+
+        return
+
+    def solverSummary(self):
+        """
+        Reports for each solver role the number of calls, the cumulative setup time (operator and preconditioner) and the cumulative solve time.
+        """
+
+        if MPIrank == 0 and self.verbose:
+            for role in self.solvers:
+                stime = self.solvers[role]["time"]
+                print(
+                    "Solver %s: %d calls | setup %0.02f seconds | solve %0.02f seconds"
+                    % (role, stime[2], stime[0], stime[1]),
+                    flush=True,
+                )
+
+        return
+
+    def _destroySolvers(self):
+        """
+        Destroys the persistent PETSc solvers, associated operators, nested systems and active set mappings.
+        """
+
+        for role in self.solvers:
+            solver = self.solvers[role]
+            if solver["solver"] is not None:
+                solver["solver"].destroy()
+            if solver["op"] is not None:
+                solver["op"].destroy()
+            if solver["is"] is not None:
+                for k in range(2):
+                    solver["is"][0][k].destroy()
+                    solver["is"][1][k].destroy()
+        self.solvers = {}
+        for role in list(self.nests):
+            self._destroyNest(role)
+        if self.landSet is not None:
+            self.landSet["lgmap"][0].destroy()
+            self.landSet["lgmap"][1].destroy()
+            self.landSet = None
+
+        return
+
+    def _solve_KSP2(self, matrix, vector1, vector2, role="flow"):
         """
         Solution of Krylov subspace iterative method (PETSc *scalable linear equations solvers* - **KSP**) implemented using the Flexible Generalized Minimal Residual method (`fgmres`) with Additive Schwarz preconditioning (`asm`).
 
@@ -126,17 +769,21 @@ class FAMesh(object):
         :arg matrix: PETSc sparse matrix used by the KSP solver composed of diagonal terms set to unity (identity matrix) and off-diagonal terms (weights between 0 and 1). The weights are calculated based on the number of downslope neighbours (based on the chosen number of flow direction directions) and are proportional to the slope.
         :arg vector1: PETSc vector corresponding to the local volume of water available for runoff during a given time step (*e.g.* voronoi area times local precipitation rate)
         :arg vector2: PETSc vector corresponding to the unknown flow discharge values
+        :arg role: string defining the solver role
 
         :return: vector2 PETSc vector of the new flow discharge values
         """
-        ksp = petsc4py.PETSc.KSP().create(petsc4py.PETSc.COMM_WORLD)
+
+        role = role + "-fgmres"
+        if matrix.getType() == petsc4py.PETSc.Mat.Type.PYTHON:
+            pctype = "jacobi"
+        else:
+            pctype = "asm"
+        ksp = self._getKSP(role, matrix, "fgmres", pctype, rtol=1.0e-6, divtol=1.e20)
         ksp.setInitialGuessNonzero(True)
-        ksp.setOperators(matrix, matrix)
-        ksp.setType("fgmres")
-        pc = ksp.getPC()
-        pc.setType("asm")
-        ksp.setTolerances(rtol=1.0e-6, divtol=1.e20)
+        t0 = process_time()
         ksp.solve(vector1, vector2)
+        self._solverTime(role, t0)
         r = ksp.getConvergedReason()
         if r < 0:
             KSPReasons = self._make_reasons(petsc4py.PETSc.KSP.ConvergedReason())
@@ -148,16 +795,11 @@ class FAMesh(object):
                 )
                 print("with reason: ", KSPReasons[r], flush=True)
             vector2.set(0.0)
-            pc.destroy()
-            ksp.destroy()
             # raise RuntimeError("LinearSolver failed to converge!")
-        else:
-            pc.destroy()
-            ksp.destroy()
 
         return vector2
 
-    def _solve_KSP(self, guess, matrix, vector1, vector2):
+    def _solve_KSP(self, guess, matrix, vector1, vector2, role="flow", reuse=False):
         """
         PETSc *scalable linear equations solvers* (**KSP**) component provides Krylov subspace iterative method and a preconditioner. Here, flow accumulation solution is obtained using PETSc Richardson solver (`richardson`) with block Jacobian preconditioning (`bjacobi`).
 
@@ -167,33 +809,203 @@ class FAMesh(object):
 
         Using such iterative method allows for an initial guess to be provided. When this initial guess is close to the solution, the number of iterations required for convergence dramatically decreases. Here the flow discharge solution from previous time step can be passed as an initial `guess` to the solver as discharge often exhibits little change between successive time intervals.
 
+        The KSP solvers are persistent and retrieved from the solvers registry based on their `role` (see `_getKSP`).
+
+        For matrix-free operators (shell matrices), the solution is obtained with the Generalized Minimal Residual method (`gmres`) and point Jacobi preconditioning.
+
         :arg guess: Boolean specifying if the iterative KSP solver initial guess is nonzero (when provided it corresponds to the previous flow discharge values)
         :arg matrix: PETSc sparse matrix used by the KSP solver composed of diagonal terms set to unity (identity matrix) and off-diagonal terms (weights between 0 and 1). The weights are calculated based on the number of downslope neighbours (based on the chosen number of flow direction directions) and are proportional to the slope.
         :arg vector1: PETSc vector corresponding to the local volume of water available for runoff during a given time step (*e.g.* voronoi area times local precipitation rate)
         :arg vector2: PETSc vector corresponding to the unknown flow discharge values
+        :arg role: string defining the solver role
+        :arg reuse: boolean to reuse the preconditioner from previous calls
 
         :return: vector2 PETSc vector of the new flow discharge values
         """
 
-        ksp = petsc4py.PETSc.KSP().create(petsc4py.PETSc.COMM_WORLD)
-        if guess:
-            ksp.setInitialGuessNonzero(guess)
-        ksp.setOperators(matrix, matrix)
-        ksp.setType("richardson")
-        pc = ksp.getPC()
-        pc.setType("bjacobi")
-        ksp.setTolerances(rtol=self.rtol)
-        ksp.solve(vector1, vector2)
-        r = ksp.getConvergedReason()
-        if r < 0:
-            pc.destroy()
-            ksp.destroy()
-            vector2 = self._solve_KSP2(matrix, vector1, vector2)
+        return self._solve_KSPs(guess, matrix, [vector1], [vector2], role, reuse)[0]
+
+    def _solve_KSPs(self, guess, matrix, vectors1, vectors2, role="flow", reuse=False):
+        """
+        Solves a linear system for several right hand sides sharing the same operator (see `_solve_KSP`).
+
+        .. note::
+
+            The operator and its preconditioner are set up only once and the persistent KSP solver is then applied to each right hand side, the previous solutions being used as initial guesses when `guess` is set.
+
+        :arg guess: Boolean specifying if the iterative KSP solver initial guess is nonzero
+        :arg matrix: PETSc sparse matrix used by the KSP solver
+        :arg vectors1: list of PETSc vectors corresponding to the right hand sides
+        :arg vectors2: list of PETSc vectors corresponding to the unknowns
+        :arg role: string defining the solver role
+        :arg reuse: boolean to reuse the preconditioner from previous calls
+
+        :return: vectors2 list of PETSc vectors of the solutions
+        """
+
+        if matrix.getType() == petsc4py.PETSc.Mat.Type.PYTHON:
+            # Matrix-free operators rely on point Jacobi preconditioning
+            role = role + "-shell"
+            ksp = self._getKSP(role, matrix, "gmres", "jacobi", rtol=self.rtol)
         else:
-            pc.destroy()
-            ksp.destroy()
+            ksp = self._getKSP(
+                role, matrix, "richardson", "bjacobi", reuse=reuse, rtol=self.rtol
+            )
+        ksp.setInitialGuessNonzero(guess)
+        for k in range(len(vectors1)):
+            t0 = process_time()
+            ksp.solve(vectors1[k], vectors2[k])
+            self._solverTime(role, t0)
+            r = ksp.getConvergedReason()
+            if r < 0:
+                vectors2[k] = self._solve_KSP2(matrix, vectors1[k], vectors2[k], role)
+
+        return vectors2
+
+    def _topoAccumulation(self, rcv, wght, vectors1, vectors2):
+        """
+        Computes the accumulation of several source terms along the receivers graph without relying on iterative KSP solvers.
 
-        return vector2
+        .. note::
+
+            The receivers graph being acyclic, the accumulation on each partition is obtained by a single topological sweep (donors before receivers) performed by the fortran `flowaccumulation` function, which accumulates all the source terms during the same sweep. The flux leaving the partition (*i.e.* reaching ghost nodes, which have no receivers during the sweep) is then sent to the partitions owning these nodes where it is added to the local source term. The process is repeated until the values exchanged at the partitions interfaces converge.
+
+        :arg rcv: local receivers indices
+        :arg wght: local receivers weights
+        :arg vectors1: list of PETSc vectors corresponding to the source terms (*e.g.* voronoi area times local precipitation rate)
+        :arg vectors2: list of PETSc vectors corresponding to the unknown accumulated values
+
+        :return: vectors2 list of PETSc vectors of the accumulated values or None if the receivers graph contains cycles
+        """
+
+        nsrc = len(vectors1)
+        src = np.zeros((self.lpoints, nsrc), dtype=np.float64)
+        for k in range(nsrc):
+            self.dm.globalToLocal(vectors1[k], self.topoL)
+            src[:, k] = self.topoL.getArray()
+        src[self.ghostIDs, :] = 0.0
+        inflow = np.zeros((self.lpoints, nsrc), dtype=np.float64)
+
+        # Ghost nodes are routed by their owning partitions only
+        wght = wght.copy()
+        wght[self.ghostIDs, :] = 0.0
+
+        check = np.zeros(3, dtype=np.float64)
+        for it in range(self.topoIter):
+            acc, ncycle = flowaccumulation(rcv.shape[1], rcv, wght, (src + inflow).T)
+            acc = acc.T
+
+            # Send the flux reaching ghost nodes to the owning partitions
+            newflow = np.zeros((self.lpoints, nsrc), dtype=np.float64)
+            outflow = np.zeros(self.lpoints, dtype=np.float64)
+            for k in range(nsrc):
+                outflow[self.ghostIDs] = acc[self.ghostIDs, k]
+                self.topoL.setArray(outflow)
+                self.topoG.set(0.0)
+                self.dm.localToGlobal(
+                    self.topoL, self.topoG, addv=petsc4py.PETSc.InsertMode.ADD
+                )
+                self.dm.globalToLocal(self.topoG, self.topoL)
+                newflow[:, k] = self.topoL.getArray()
+            newflow[self.ghostIDs, :] = 0.0
+
+            # Check convergence of the interface values
+            check[0] = np.abs(newflow - inflow).max()
+            check[1] = np.abs(newflow).max()
+            check[2] = ncycle
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, check, op=MPI.MAX)
+            inflow = newflow
+            if check[2] > 0:
+                return None
+            if check[0] <= self.rtol * max(check[1], 1.0):
+                break
+
+        if check[0] > self.rtol * max(check[1], 1.0):
+            return None
+
+        for k in range(nsrc):
+            self.topoL.setArray(acc[:, k])
+            self.dm.localToGlobal(self.topoL, vectors2[k])
+
+        if self.memclear:
+            del src, inflow, acc, outflow, newflow
+            gc.collect()
+
+        return vectors2
+
+    def _solve_flow(
+        self,
+        guess,
+        matrix,
+        vector1,
+        vector2,
+        rcv=None,
+        wght=None,
+        role="flow",
+        reuse=False,
+    ):
+        """
+        Computes downstream accumulation (water, ice or sediment) for a single source term (see `_solve_flows`).
+
+        :arg guess: Boolean specifying if the iterative KSP solver initial guess is nonzero
+        :arg matrix: PETSc flow matrix associated to the receivers graph
+        :arg vector1: PETSc vector corresponding to the source term
+        :arg vector2: PETSc vector corresponding to the unknown accumulated values
+        :arg rcv: local receivers indices (defaults to the current receivers)
+        :arg wght: local receivers weights (defaults to the current weights)
+        :arg role: string defining the solver role
+        :arg reuse: boolean to reuse the preconditioner from previous calls
+
+        :return: vector2 PETSc vector of the accumulated values
+        """
+
+        return self._solve_flows(
+            guess, matrix, [vector1], [vector2], rcv, wght, role, reuse
+        )[0]
+
+    def _solve_flows(
+        self,
+        guess,
+        matrix,
+        vectors1,
+        vectors2,
+        rcv=None,
+        wght=None,
+        role="flow",
+        reuse=False,
+    ):
+        """
+        Computes downstream accumulation of several source terms (water, ice or sediment classes) routed over the same receivers graph either with the topological engine (`_topoAccumulation`) when requested in the input file or with the iterative KSP solvers (`_solve_KSPs`).
+
+        .. note::
+
+            The source terms are accumulated together: the topological engine performs a single sweep for all of them and the KSP solvers share the same operator and preconditioner setup. When the topological engine fails (cycles in the receivers graph or no convergence at the partitions interfaces), the solution falls back to the KSP solvers.
+
+        :arg guess: Boolean specifying if the iterative KSP solver initial guess is nonzero
+        :arg matrix: PETSc flow matrix associated to the receivers graph
+        :arg vectors1: list of PETSc vectors corresponding to the source terms
+        :arg vectors2: list of PETSc vectors corresponding to the unknown accumulated values
+        :arg rcv: local receivers indices (defaults to the current receivers)
+        :arg wght: local receivers weights (defaults to the current weights)
+        :arg role: string defining the solver role
+        :arg reuse: boolean to reuse the preconditioner from previous calls
+
+        :return: vectors2 list of PETSc vectors of the accumulated values
+        """
+
+        if self.topoFlow:
+            if rcv is None:
+                rcv = self.rcvID
+                wght = self.wghtVal
+            t0 = process_time()
+            sol = self._topoAccumulation(rcv, wght, vectors1, vectors2)
+            self._solverTime(role + "-topo", t0)
+            if sol is not None:
+                return sol
+
+        return self._solve_KSPs(
+            guess, matrix, vectors1, vectors2, role=role, reuse=reuse
+        )
 
     def matrixFlow(self, flowdir, dep=None):
         """
@@ -201,7 +1013,7 @@ class FAMesh(object):
 
         .. note::
 
-            The matrix is built incrementally looping through the number of flow direction paths defined by the user. It proceeds by assembling a local Compressed Sparse Row (**CSR**) matrix to a global PETSc matrix.
+            The matrix is built in a single pass from the receivers indices and weights of all the flow direction paths defined by the user. It proceeds by assembling a local Compressed Sparse Row (**CSR**) matrix of the transposed flow matrix to a global PETSc matrix (see `_matrix_build_csr`).
 
             When setting up the flow matrix in PETSc, we preallocate the non-zero entries of the matrix before starting filling in the values. Using PETSc sparse matrix storage scheme has the advantage that matrix-vector multiplication is extremely fast.
 
@@ -211,37 +1023,80 @@ class FAMesh(object):
         :arg dep: deposition flux coefficient in case where the sediment transport/deposition term is considered.
         """
 
-        self.fMat = self.iMat.copy()
-        indptr = np.arange(0, self.lpoints + 1, dtype=petsc4py.PETSc.IntType)
-        nodes = indptr[:-1]
         if dep is None:
-            wght = self.wghtVal
+            wght = self.wghtVal[:, :flowdir]
         else:
-            wght = np.multiply(self.wghtVal, dep.reshape((len(dep), 1)))
-        rcv = self.rcvID
-
-        for k in range(0, flowdir):
-            # Flow direction matrix for a specific direction
-            tmpMat = self._matrix_build()
-            data = -wght[:, k].copy()
-            data[rcv[:, k].astype(petsc4py.PETSc.IntType) == nodes] = 0.0
-            tmpMat.assemblyBegin()
-            tmpMat.setValuesLocalCSR(
-                indptr,
-                rcv[:, k].astype(petsc4py.PETSc.IntType),
-                data,
-            )
-            tmpMat.assemblyEnd()
-            # Add the weights from each direction
-            self.fMat.axpy(1.0, tmpMat)
-            tmpMat.destroy()
+            wght = np.multiply(self.wghtVal[:, :flowdir], dep.reshape((len(dep), 1)))
+
+        # Store flow accumulation matrix
+        self.fMat = self._matrix_build_op(
+            self.rcvID[:, :flowdir],
+            -wght,
+            diag=np.ones(self.lpoints),
+            transpose=True,
+        )
 
         if self.memclear:
-            del data, indptr, nodes
+            del wght
             gc.collect()
 
-        # Store flow accumulation matrix
-        self.fMat.transpose()
+        return
+
+    def _getReceivers(self, h):
+        """
+        Returns the multiple flow directions receivers, distances and weights for a given elevation. The results of the fortran `mfdreceivers` subroutine are memoized against the elevation values (and flow parameters) so that they are not recomputed when the surface has not changed since a previous call.
+
+        .. note::
+
+            The cache is checked by comparing the elevation arrays content, so it does not rely on the different functions modifying the elevation to invalidate it. Only the last `rcvCacheSize` surfaces are kept and the cache is disabled when `memclear` is set.
+
+        :arg h: elevation numpy array
+
+        :return: donRcvs, distRcv, wghtVal (receivers indices, distances and weights)
+        """
+
+        key = (self.flowDir, self.flowExp, self.sealevel)
+        for k, entry in enumerate(self.rcvCache):
+            if entry[0] == key and np.array_equal(entry[1], h):
+                self.cacheStats["receivers"][0] += 1
+                self.rcvCache.insert(0, self.rcvCache.pop(k))
+                self.rcvKey = entry[3]
+                return tuple(val.copy() for val in entry[2])
+
+        self.cacheStats["receivers"][1] += 1
+        self.rcvVersion += 1
+        self.rcvKey = self.rcvVersion
+        rcvs = mfdreceivers(self.flowDir, self.flowExp, h, self.sealevel)
+        if not self.memclear and self.rcvCacheSize > 0:
+            self.rcvCache.insert(
+                0,
+                (key, h.copy(), tuple(val.copy() for val in rcvs), self.rcvVersion),
+            )
+            del self.rcvCache[self.rcvCacheSize:]
+
+        return rcvs
+
+    def cacheSummary(self):
+        """
+        Reports the number of cache hits and misses for the depressions filling and the flow receivers computation since the last call.
+
+        .. note::
+
+            The depressions filling is a collective operation counted identically on each processor while the flow receivers are cached on each processor independently. The receivers counts are thus summed over the processors.
+        """
+
+        for name in self.cacheStats:
+            stats = self.cacheStats[name].copy()
+            if name == "receivers":
+                MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, stats, op=MPI.SUM)
+            else:
+                MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, stats, op=MPI.MAX)
+            if MPIrank == 0 and self.verbose:
+                print(
+                    "Cache %s: %d hits | %d misses" % (name, stats[0], stats[1]),
+                    flush=True,
+                )
+            self.cacheStats[name][:] = 0
 
         return
 
@@ -261,9 +1116,7 @@ class FAMesh(object):
         self.seaID = np.where(self.lFill <= self.sealevel)[0]
 
         # Define multiple flow directions for unfilled elevation
-        self.donRcvs, self.distRcv, self.wghtVal = mfdreceivers(
-            self.flowDir, self.flowExp, h, self.sealevel
-        )
+        self.donRcvs, self.distRcv, self.wghtVal = self._getReceivers(h)
 
         self.rcvID = self.donRcvs.copy()
         self.rcvID[self.ghostIDs, :] = -1
@@ -301,29 +1154,41 @@ class FAMesh(object):
 
         self.lsink = lsink == 1
 
+        # Flow matrix unchanged when built from the same receivers and
+        # depressions state as the previous one
+        key = (self.rcvKey, self.fillVersion, down)
+        same = np.zeros(1, dtype=int)
+        same[0] = int(key == self.flowKey)
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, same, op=MPI.MIN)
+        self.fMatSame = same[0] == 1
+        self.flowKey = key
+
         self.matrixFlow(self.flowDir)
 
         return
 
-    def _distributeDownstream(self, pitVol, FA, hl, step, ice=False):
+    def _distributeDownstream(self, pitVol, FA, hl, ice=False):
         """
         In cases where rivers flow in depressions, they might fill the sink completely and overspill or remain within the depression, forming a lake. This function computes the excess of water (if any) able to flow dowstream.
 
+        .. note::
+
+            The volumes entering each depression are routed over the depressions graph (see `_pitGraph` and `_routePits`), so that overflowing water is transferred from one depression to the next one without solving the flow routing system at each transfer. The excess water is then distributed downstream over the mesh in a single solve, with sources located at the spillover nodes of the filled depressions.
+
+            In depressions that are not filled, the water level is interpolated from the depression volume-level table (`filled_vol`, `filled_lvl`) using the volume stored during this call, which includes the volumes routed from upstream depressions.
+
         .. important::
 
-            The excess water is then added to the downstream flow accumulation (`FA`) and used to estimate rivers' erosion.
+            The excess water is then added to the downstream flow accumulation (`FA`) and used to estimate rivers' erosion. The returned `pitVol` is the capacity left in each depression (0 for filled depressions), so that a following call (water after ice) can only store water in the remaining volume.
 
         :arg pitVol: volume of depressions
-        :arg FA: excess flow accumulation array
+        :arg FA: flow accumulation array
         :arg hl: current elevation array
-        :arg step: downstream distribution step
         :arg ice: boolean indicating where the ice flow is considered or not.
 
-        :return: pitVol, excess, nFA (updated volume in each depression, boolean set to True is excess flow remains to be distributed and new flow accumulation values)
+        :return: pitVol (remaining capacity in each depression)
         """
 
-        excess = False
-
         # Remove points belonging to other processors
         FA = np.multiply(FA, self.inIDs)
 
@@ -338,59 +1203,49 @@ class FAMesh(object):
         # Combine incoming volume globally
         MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, inV, op=MPI.SUM)
 
-        # Get excess volume to distribute downstream
-        eV = inV - pitVol
-        if (eV > 0.0).any():
-            eIDs = eV > 0.0
-            pitVol[eIDs] = 0.0
-            spillIDs = self.pitInfo[eIDs, 0]
-            localSpill = np.where(self.pitInfo[eIDs, 1] == MPIrank)[0]
-            localPts = spillIDs[localSpill]
-            nFA = np.zeros(self.lpoints, dtype=np.float64)
-            nFA[localPts] = eV[eIDs][localSpill]
-            ids = np.in1d(self.pitIDs, np.where(eV > 0.0)[0])
-            self.waterFilled[ids] = self.lFill[ids]
-
-        # Update unfilled depressions volumes and assign water level in depressions
-        if (eV < 0.0).any():
-            eIDs = np.where(eV < 0.0)[0]
-            pitVol[eIDs] += eV[eIDs]
-            nid = np.absolute(self.filled_vol[eIDs] - pitVol[eIDs][:, None]).argmin(
-                axis=1
-            )
-            fill_lvl = self.filled_lvl[eIDs, nid]
-            for k in range(len(eIDs)):
-                ids = (self.waterFilled <= fill_lvl[k]) & (self.pitIDs == eIDs[k])
-                self.waterFilled[ids] = fill_lvl[k]
-
-        # In case there is still remaining water flux to distribute downstream
-        if (eV > 1.0e-3).any():
-            if step == 100:
-                self.fMat.destroy()
-                self._buildFlowDirection(self.lFill)
-            else:
-                self.fMat.destroy()
-                self._buildFlowDirection(self.waterFilled)
-            self.tmpL.setArray(nFA / self.dt)
+        # Route incoming volumes over the depressions graph
+        spill, src, nVol = self._routePits(inV, pitVol)
+        full = spill > 0.0
+
+        # Filled depressions
+        pits = self.pitIDs > -1
+        ids = pits.copy()
+        ids[pits] = full[self.pitIDs[pits]]
+        self.waterFilled[ids] = self.lFill[ids]
+
+        # Assign water level in unfilled depressions
+        stored = pitVol - nVol
+        nid = np.absolute(self.filled_vol - stored[:, None]).argmin(axis=1)
+        fill_lvl = self.filled_lvl[np.arange(len(nid)), nid]
+        fill_lvl[full] = -1.0e8
+        lvl = np.full(self.lpoints, -1.0e8, dtype=np.float64)
+        lvl[pits] = fill_lvl[self.pitIDs[pits]]
+        ids = pits & (self.waterFilled <= lvl)
+        self.waterFilled[ids] = lvl[ids]
+
+        # In case there is remaining water flux to distribute downstream
+        if (spill > 1.0e-3).any() and src.sum() > self.maxarea[0] * self.dt:
+            self.fMat.destroy()
+            self._buildFlowDirection(self.waterFilled)
+            self.tmpL.setArray(self._spillSources(src) / self.dt)
             self.dm.localToGlobal(self.tmpL, self.tmp)
-            if self.tmp.sum() > self.maxarea[0]:
-                excess = True
-                self._solve_KSP(True, self.fMat, self.tmp, self.tmp1)
-                self.dm.globalToLocal(self.tmp1, self.tmpL)
-                nFA = self.tmpL.getArray().copy() * self.dt
-                FA = nFA.copy()
-                FA[hl < self.waterFilled] = 0.0
-                self.tmpL.setArray(FA / self.dt)
-                if ice:
-                    self.iceFAL.axpy(1.0, self.tmpL)
-                else:
-                    self.FAL.axpy(1.0, self.tmpL)
+            self._solve_flow(True, self.fMat, self.tmp, self.tmp1, reuse=self.fMatSame)
+            self.dm.globalToLocal(self.tmp1, self.tmpL)
+            nFA = self.tmpL.getArray().copy()
+            nFA[hl < self.waterFilled] = 0.0
+            nFA[nFA < 0.0] = 0.0
+            self.tmpL.setArray(nFA)
+            if ice:
+                self.iceFAL.axpy(1.0, self.tmpL)
             else:
-                nFA = None
-        else:
-            nFA = None
+                self.FAL.axpy(1.0, self.tmpL)
+
+        if self.memclear:
+            del grp, uID, vol, inV, spill, src, full, pits, ids
+            del stored, nid, fill_lvl, lvl
+            gc.collect()
 
-        return excess, pitVol, nFA
+        return nVol
 
     def flowAccumulation(self):
         """
@@ -405,7 +1260,7 @@ class FAMesh(object):
         It calls the following *private functions*:
 
         1. _buildFlowDirection
-        2. _solve_KSP
+        2. _solve_flows
         3. _distributeDownstream
 
         """
@@ -423,7 +1278,15 @@ class FAMesh(object):
         self.wghtVali = self.wghtVal.copy()
         self.rcvIDi = self.rcvID.copy()
         self.distRcvi = self.distRcv.copy()
-        self.fMati = self.fMat.copy()
+        if self.matFree:
+            self.fMati = self._matrix_build_shell(
+                self.rcvIDi,
+                -self.wghtVali,
+                diag=np.ones(self.lpoints),
+                transpose=True,
+            )
+        else:
+            self.fMati = self.fMat.copy()
         self.lsinki = self.lsink.copy()
 
         # Get amount of water or ice
@@ -437,47 +1300,48 @@ class FAMesh(object):
             iceA = np.multiply(rainA, tmp)
             rainA = np.multiply(rainA, 1. - tmp)
 
-        #  Solve flow/ice accumulation
+        #  Solve flow/ice accumulation together
         self.bL.setArray(rainA)
         self.dm.localToGlobal(self.bL, self.bG)
-        self._solve_KSP(True, self.fMat, self.bG, self.FAG)
-        self.dm.globalToLocal(self.FAG, self.FAL)
         if self.iceOn:
             self.tmpL.setArray(iceA)
             self.dm.localToGlobal(self.tmpL, self.tmp)
-            self._solve_KSP(True, self.fMat, self.tmp, self.iceFAG)
+            self._solve_flows(
+                True,
+                self.fMat,
+                [self.bG, self.tmp],
+                [self.FAG, self.iceFAG],
+                reuse=self.fMatSame,
+            )
             self.dm.globalToLocal(self.iceFAG, self.iceFAL)
+        else:
+            self._solve_flow(True, self.fMat, self.bG, self.FAG, reuse=self.fMatSame)
+        self.dm.globalToLocal(self.FAG, self.FAL)
 
         # Volume of water flowing downstream
         self.waterFilled = hl.copy()
         if (pitVol > 0.0).any():
+            # Build depressions graph
+            self._pitGraph(hl, self.rcvID, self.wghtVal, self.lsink)
             if self.iceOn:
-                iFA = self.iceFAL.getArray().copy() * self.dt
-                excess = True
-                step = 0
-                while excess:
-                    t1 = process_time()
-                    excess, pitVol, iFA = self._distributeDownstream(pitVol, iFA, hl, step, ice=True)
-                    if MPIrank == 0 and self.verbose:
-                        print(
-                            "Downstream ice flow computation step %d (%0.02f seconds)"
-                            % (step, process_time() - t1),
-                            flush=True,
-                        )
-                    step += 1
-            FA = self.FAL.getArray().copy() * self.dt
-            excess = True
-            step = 0
-            while excess:
                 t1 = process_time()
-                excess, pitVol, FA = self._distributeDownstream(pitVol, FA, hl, step)
+                iFA = self.iceFAL.getArray().copy() * self.dt
+                pitVol = self._distributeDownstream(pitVol, iFA, hl, ice=True)
                 if MPIrank == 0 and self.verbose:
                     print(
-                        "Downstream flow computation step %d (%0.02f seconds)"
-                        % (step, process_time() - t1),
+                        "Downstream ice flow computation (%0.02f seconds)"
+                        % (process_time() - t1),
                         flush=True,
                     )
-                step += 1
+            t1 = process_time()
+            FA = self.FAL.getArray().copy() * self.dt
+            pitVol = self._distributeDownstream(pitVol, FA, hl)
+            if MPIrank == 0 and self.verbose:
+                print(
+                    "Downstream flow computation (%0.02f seconds)"
+                    % (process_time() - t1),
+                    flush=True,
+                )
 
             # Get overall water flowing donwstream accounting for filled depressions
             FA = self.FAL.getArray().copy()
@@ -529,7 +1393,7 @@ class FAMesh(object):
 
         return
 
-    def _eroMats(self, hOldArray):
+    def _eroMats(self, hOldArray, land=None):
         """
         Builds the erosion matrices used to solve implicitly the stream power equations for the river and ice processes.
 
@@ -556,11 +1420,9 @@ class FAMesh(object):
             PA += GA
 
         # Initialise matrices...
-        eMat = self.iMat.copy()
         wght = self.wghtVali.copy()
-        indptr = np.arange(0, self.lpoints + 1, dtype=petsc4py.PETSc.IntType)
-        nodes = indptr[:-1]
         wght[self.seaID, :] = 0.0
+        data = np.zeros((self.lpoints, self.flowDir), dtype=np.float64)
 
         # Define erosion coefficients
         for k in range(0, self.flowDir):
@@ -570,58 +1432,48 @@ class FAMesh(object):
             limiter = np.divide(dh, dh + 1.0e-2, out=np.zeros_like(dh), where=dh != 0)
 
             # Bedrock erosion processes SPL computation (maximum bedrock incision)
-            data = np.divide(
+            data[:, k] = np.divide(
                 Kbr * limiter,
                 self.distRcvi[:, k],
                 out=np.zeros_like(PA),
                 where=self.distRcvi[:, k] != 0,
             )
-            tmpMat = self._matrix_build()
-            data = np.multiply(data, -wght[:, k])
-            data[self.rcvIDi[:, k].astype(petsc4py.PETSc.IntType) == nodes] = 0.0
-            tmpMat.assemblyBegin()
-            tmpMat.setValuesLocalCSR(
-                indptr,
-                self.rcvIDi[:, k].astype(petsc4py.PETSc.IntType),
-                data,
-            )
-            tmpMat.assemblyEnd()
-            eMat.axpy(1.0, tmpMat)
-            tmpMat.destroy()
-            tmpMat = self._matrix_build_diag(data)
-            eMat.axpy(-1.0, tmpMat)
-            tmpMat.destroy()
 
             if self.iceOn:
-                data = np.divide(
+                data[:, k] += np.divide(
                     Kbi * limiter,
                     self.distRcvi[:, k],
                     out=np.zeros_like(PA),
                     where=self.distRcvi[:, k] != 0,
                 )
-                tmpMat = self._matrix_build()
-                data = np.multiply(data, -wght[:, k])
-                data[self.rcvIDi[:, k].astype(petsc4py.PETSc.IntType) == nodes] = 0.0
-                tmpMat.assemblyBegin()
-                tmpMat.setValuesLocalCSR(
-                    indptr,
-                    self.rcvIDi[:, k].astype(petsc4py.PETSc.IntType),
-                    data,
-                )
-                tmpMat.assemblyEnd()
-                eMat.axpy(1.0, tmpMat)
-                tmpMat.destroy()
-                tmpMat = self._matrix_build_diag(data)
-                eMat.axpy(-1.0, tmpMat)
-                tmpMat.destroy()
+
+        data = np.multiply(data, -wght)
+        nodes = np.arange(0, self.lpoints, dtype=petsc4py.PETSc.IntType)
+        data[self.rcvIDi.astype(petsc4py.PETSc.IntType) == nodes[:, None]] = 0.0
+
+        # Assemble river and glacial erosion matrix in a single pass
+        if land is not None:
+            eMat = self._matrix_build_csr(
+                self.rcvIDi,
+                data,
+                diag=1.0 - np.sum(data, axis=1),
+                sub=land,
+            )
+        else:
+            eMat = self._matrix_build_op(
+                self.rcvIDi,
+                data,
+                diag=1.0 - np.sum(data, axis=1),
+                assembled=self.fDepa > 0,
+            )
 
         if self.memclear:
-            del dh, limiter, wght, data
+            del dh, limiter, wght, data, nodes
             gc.collect()
 
         return eMat, PA
 
-    def _coupledEDSystem(self, eMat):
+    def _coupledEDSystem(self, eMat, land=None):
         r"""
         Setup matrix for the coupled linear system in which the SPL model takes into account sediment deposition.
 
@@ -651,94 +1503,47 @@ class FAMesh(object):
 
             \mathrm{Q_{s_i}} = \mathrm{Q_{t_i}} - \mathrm{(\eta_i^{t} - \eta_i^{t+\Delta t}) \frac{\Delta t}{\Omega_i}}
 
-        This system of coupled equations is solved implicitly using PETSc by assembling the matrix and vectors using the nested submatrix and subvectors and by using the ``fieldsplit`` preconditioner combining two separate preconditioners for the collections of variables.
+        This system of coupled equations is solved implicitly using PETSc by assembling the matrix and vectors using the nested submatrix and subvectors and by using the ``fieldsplit`` preconditioner combining two separate preconditioners for the collections of variables. The nested system is kept alive across time steps (see `_coupledSolve`).
+
+        When an active set is provided, the coupled system is only solved for the land nodes and their receivers, the elevation of the other nodes remaining unchanged.
 
         :arg eMat: erosion matrix (from the simple SPL model)
+        :arg land: active set dictionary (optional, see `_landSet`)
         """
 
-        # Define submatrices
-        A00 = self._matrix_build_diag(-self.fDep)
-        A01 = self._matrix_build_diag(-self.fDep * self.dt / self.larea)
-        A10 = self._matrix_build_diag(self.larea / self.dt)
-
-        # Assemble the matrix for the coupled system
-        A00.axpy(1.0, eMat)
-        mats = [[A00, A01], [A10, self.fMati]]
-        sysMat = petsc4py.PETSc.Mat().createNest(mats=mats, comm=MPIcomm)
-        sysMat.assemblyBegin()
-        sysMat.assemblyEnd()
-
-        # Clean up
-        A00.destroy()
-        A01.destroy()
-        A10.destroy()
-        eMat.destroy()
-        mats[0][0].destroy()
-        mats[0][1].destroy()
-        mats[1][0].destroy()
-        mats[1][1].destroy()
-
-        # Create nested vectors
+        # Sediment flux block
+        if land is not None:
+            A11 = self._matrix_build_csr(
+                self.rcvIDi,
+                -self.wghtVali,
+                diag=np.ones(self.lpoints),
+                transpose=True,
+                sub=land,
+            )
+        elif self.matFree:
+            A11 = self._matrix_build_csr(
+                self.rcvIDi,
+                -self.wghtVali,
+                diag=np.ones(self.lpoints),
+                transpose=True,
+            )
+        else:
+            A11 = self.fMati
+
+        # Right hand side vectors
         self.tmpL.setArray(1. - self.fDep)
         self.dm.localToGlobal(self.tmpL, self.tmp)
         self.tmp.pointwiseMult(self.tmp, self.hOld)
         self.tmp1.pointwiseMult(self.hOld, self.areaGlobal)
         self.tmp1.scale(1. / self.dt)
-        rhs_vec = petsc4py.PETSc.Vec().createNest([self.tmp, self.tmp1], comm=MPIcomm)
-        rhs_vec.setUp()
-        hq_vec = rhs_vec.duplicate()
-
-        # Define solver and precondition conditions
-        ksp = petsc4py.PETSc.KSP().create(petsc4py.PETSc.COMM_WORLD)
-        ksp.setType(petsc4py.PETSc.KSP.Type.TFQMR)
-        ksp.setOperators(sysMat)
-        ksp.setTolerances(rtol=self.rtol)
-
-        pc = ksp.getPC()
-        pc.setType("fieldsplit")
-        nested_IS = sysMat.getNestISs()
-        pc.setFieldSplitIS(('h', nested_IS[0][0]), ('q', nested_IS[0][1]))
-
-        subksps = pc.getFieldSplitSubKSP()
-        subksps[0].setType("preonly")
-        subksps[0].getPC().setType("gasm")
-        subksps[1].setType("preonly")
-        subksps[1].getPC().setType("gasm")
-
-        ksp.solve(rhs_vec, hq_vec)
-        r = ksp.getConvergedReason()
-        if r < 0:
-            KSPReasons = self._make_reasons(petsc4py.PETSc.KSP.ConvergedReason())
-            if MPIrank == 0:
-                print(
-                    "LinearSolver failed to converge after iterations",
-                    ksp.getIterationNumber(),
-                    flush=True,
-                )
-                print("with reason: ", KSPReasons[r], flush=True)
-        else:
-            if MPIrank == 0 and self.verbose:
-                print(
-                    "LinearSolver converge after %d iterations"
-                    % ksp.getIterationNumber(),
-                    flush=True,
-                )
 
-        # Update the solution
-        self.newH = hq_vec.getSubVector(nested_IS[0][0])
-
-        # Clean up
-        subksps[0].destroy()
-        subksps[1].destroy()
-        nested_IS[0][0].destroy()
-        nested_IS[1][0].destroy()
-        nested_IS[0][1].destroy()
-        nested_IS[1][1].destroy()
-        pc.destroy()
-        ksp.destroy()
-        sysMat.destroy()
-        hq_vec.destroy()
-        rhs_vec.destroy()
+        # Solve the coupled system
+        diags = [-self.fDep, -self.fDep * self.dt / self.larea, self.larea / self.dt]
+        self._coupledSolve(
+            "spl-coupled", eMat, A11, diags, [self.tmp, self.tmp1], ("gasm", "gasm"), land
+        )
+        if A11 is not self.fMati:
+            A11.destroy()
 
         return
 
@@ -762,7 +1567,7 @@ class FAMesh(object):
 
             In goSPL, the coefficient `n` is fixed and the only variables that the user can tune are the coefficients `m`, `d` and the erodibility :math:`\kappa`.
 
-        The erosion rate is solved by an implicit time integration method, the matrix system is based on the receiver distributions and is assembled from local Compressed Sparse Row (**CSR**) matrices into a global PETSc matrix. The PETSc *scalable linear equations solvers* (**KSP**) is used with both an iterative method and a preconditioner and erosion rate solution is obtained using PETSc Richardson solver (`richardson`) with block Jacobian preconditioning (`bjacobi`).
+        The erosion rate is solved by an implicit time integration method, the matrix system is based on the receiver distributions and is assembled from local Compressed Sparse Row (**CSR**) matrices into a global PETSc matrix. As marine nodes are not eroded, the system is restricted to the land nodes and their receivers (see `_landSet`) and the solution is scattered back on the global vectors. The PETSc *scalable linear equations solvers* (**KSP**) is used with both an iterative method and a preconditioner and erosion rate solution is obtained using PETSc Richardson solver (`richardson`) with block Jacobian preconditioning (`bjacobi`).
 
         An alternative method to the detachment-limited approach proposed above consists in accounting for the role played by sediment in modulating erosion and deposition rates. It follows the model of `Yuan et al, 2019 <https://agupubs.onlinelibrary.wiley.com/doi/full/10.1029/2018JF004867>`_, whereby the deposition flux depends on a deposition coefficient :math:`G` and is proportional to the ratio between cell area :math:`\mathrm{\Omega}` and water discharge :math:`\mathrm{Q}=\bar{P}A`.
         """
@@ -773,12 +1578,21 @@ class FAMesh(object):
         self.oldH = hOldArray.copy()
         if self.flexOn:
             self.hLocal.copy(result=self.hOldFlex)
-        eMat, PA = self._eroMats(hOldArray)
-        
+        land = self._landSet()
+        eMat, PA = self._eroMats(hOldArray, land)
+
         # Solve SPL erosion implicitly for fluvial and glacial erosion
         if self.fDepa == 0:
             t1 = process_time()
-            self._solve_KSP(True, eMat, self.hOld, self.stepED)
+            if land is not None:
+                hSub = self._landVector(self.hOld)
+                stepSub = self._landVector(self.stepED)
+                self._solve_KSP(True, eMat, hSub, stepSub, role="spl")
+                self._landScatter(stepSub, self.hOld, self.stepED)
+                hSub.destroy()
+                stepSub.destroy()
+            else:
+                self._solve_KSP(True, eMat, self.hOld, self.stepED, role="spl")
             self.tmp.waxpy(-1.0, self.hOld, self.stepED)
             eMat.destroy()
             if MPIrank == 0 and self.verbose:
@@ -795,7 +1609,7 @@ class FAMesh(object):
             self.fDep[self.fDep > 0.99] = 0.99
             if self.flatModel:
                 self.fDep[self.idBorders] = 0.
-            self._coupledEDSystem(eMat)
+            self._coupledEDSystem(eMat, land)
             eMat.destroy()
             if MPIrank == 0 and self.verbose:
                 print(
@@ -0,0 +1,108 @@
+import sys
+import petsc4py
+import numpy as np
+
+petsc4py.init(sys.argv)
+
+
+class ShellOperator(object):
+    """
+    This class defines the context of a PETSc shell (`python`) matrix used to apply the downstream routing operators without assembling them.
+
+    .. note::
+
+        The operator is defined from the same arrays as the ones used to assemble the routing matrices (see `FAMesh._matrix_build_csr`): for each local node the indices of its receivers (or neighbours), the associated coefficients and an optional diagonal. Only the entries of the rows owned by the local partition are stored and the matrix-vector products are performed with local vectors and halo exchanges through the DMPlex.
+
+    The diagonal of the operator is provided to PETSc so that the shell matrix can be used with a point Jacobi preconditioner.
+
+    :arg dm: PETSc DMPlex
+    :arg rows: local indices of the source nodes
+    :arg cols: local indices of the receivers (or neighbours) nodes
+    :arg data: coefficients of the off-diagonal entries
+    :arg diag: diagonal data array (null on ghost nodes)
+    :arg transpose: boolean to apply the transposed operator
+    """
+
+    def __init__(self, dm, rows, cols, data, diag, transpose):
+
+        self.dm = dm
+        self.rows = rows
+        self.cols = cols
+        self.data = data
+        self.diag = diag
+        self.transpose = transpose
+        self.xl = dm.createLocalVector()
+        self.yl = dm.createLocalVector()
+
+        return
+
+    def _apply(self, x, y, transpose):
+        """
+        Performs the matrix-vector product `y = A x` or `y = A^T x`.
+
+        :arg x: PETSc global vector
+        :arg y: PETSc global vector storing the product
+        :arg transpose: boolean to apply the transposed operator
+        """
+
+        self.dm.globalToLocal(x, self.xl)
+        xa = self.xl.getArray(readonly=True)
+        npts = len(xa)
+
+        if transpose:
+            # Contributions are scattered to the receivers (possibly ghosts)
+            ya = self.diag * xa + np.bincount(
+                self.cols, weights=self.data * xa[self.rows], minlength=npts
+            )
+            self.yl.setArray(ya)
+            y.set(0.0)
+            self.dm.localToGlobal(
+                self.yl, y, addv=petsc4py.PETSc.InsertMode.ADD
+            )
+        else:
+            # Contributions are gathered from the receivers on owned rows
+            ya = self.diag * xa + np.bincount(
+                self.rows, weights=self.data * xa[self.cols], minlength=npts
+            )
+            self.yl.setArray(ya)
+            self.dm.localToGlobal(self.yl, y)
+
+        return
+
+    def mult(self, mat, x, y):
+        """
+        Matrix-vector product used by PETSc.
+        """
+
+        self._apply(x, y, self.transpose)
+
+        return
+
+    def multTranspose(self, mat, x, y):
+        """
+        Transposed matrix-vector product used by PETSc.
+        """
+
+        self._apply(x, y, not self.transpose)
+
+        return
+
+    def getDiagonal(self, mat, d):
+        """
+        Returns the operator diagonal (used by the Jacobi preconditioner).
+        """
+
+        self.yl.setArray(self.diag)
+        self.dm.localToGlobal(self.yl, d)
+
+        return
+
+    def destroy(self, mat):
+        """
+        Destroys the local work vectors when the shell matrix is destroyed.
+        """
+
+        self.xl.destroy()
+        self.yl.destroy()
+
+        return
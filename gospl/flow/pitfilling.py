@@ -17,13 +17,14 @@ if "READTHEDOCS" not in os.environ:
     from gospl._fortran import nghb_dir
     from gospl._fortran import fill_rcvs
     from gospl._fortran import getpitvol
-    from gospl._fortran import pits_cons
+    from gospl._fortran import pits_routing
     from gospl._fortran import fill_depressions
+    from gospl._fortran import flat_dist
     from gospl._fortran import graph_nodes
     from gospl._fortran import combine_edges
     from gospl._fortran import label_pits
     from gospl._fortran import spill_pts
-    from gospl._fortran import sort_ids
+    from gospl._fortran import pits_union
 
 petsc4py.init(sys.argv)
 MPIrank = petsc4py.PETSc.COMM_WORLD.Get_rank()
@@ -69,41 +70,12 @@ class PITFill(object):
         self.outEdges = np.zeros(self.lpoints, dtype=int)
         self.outEdges[self.ghostIDs] = 1
 
-        return
-
-    def _buildPitDataframe(self, label1, label2):
-        """
-        Definition of a Pandas data frame used to find a unique pit ID between processors.
-
-        :arg label1: depression ID in a given processors
-        :arg label2: same depression ID in a neighbouring mesh
-
-        :return: df (sorted dataframe of pit ID between processors)
-        """
-
-        data = {
-            "p1": label1,
-            "p2": label2,
-        }
-        df = pd.DataFrame(data, columns=["p1", "p2"])
-        df = df.drop_duplicates().sort_values(["p2", "p1"], ascending=(False, False))
-
-        return df
+        # Depressions state from the previous filling (incremental mode)
+        self.fillState = {}
+        self.fillVersion = 0
+        self.fillStamp = 0
 
-    def _sortingPits(self, df):
-        """
-        Sorts depressions number before combining them to ensure no depression index is
-        changed in an unsorted way.
-
-        :arg df: pandas dataframe containing depression numbers which have to be combined.
-
-        :return: df sorted pandas dataframe containing depression numbers.
-        """
-
-        df["p2"] = sort_ids(df["p1"].values.astype(int), df["p2"].values.astype(int))
-        df = df.drop_duplicates().sort_values(["p2", "p1"], ascending=(False, False))
-
-        return df
+        return
 
     def _offsetGlobal(self, lgth):
         """
@@ -158,6 +130,10 @@ class PITFill(object):
         """
         This function transfers local depression IDs along local borders and combines them with a unique identifier.
 
+        .. note::
+
+            Only the pairs of labels found on the ghost nodes are gathered globally. Depressions connected across partitions are then merged with a disjoint-set (union-find) structure where each set is represented by its smallest label, and the relabelling is performed in a single pass with the resulting lookup table.
+
         :arg pitIDs: local depression index.
 
         :return: number of depressions.
@@ -180,45 +156,44 @@ class PITFill(object):
         self.dm.globalToLocal(self.tmp, self.tmpL)
         label = self.tmpL.getArray().copy().astype(int)
 
-        ids = label < pitIDs
-        df = self._buildPitDataframe(label[ids], pitIDs[ids])
-        ids = label > pitIDs
-        df2 = self._buildPitDataframe(pitIDs[ids], label[ids])
-        df = pd.concat([df, df2], ignore_index=True)
-        df = df.drop_duplicates().sort_values(["p2", "p1"], ascending=(False, False))
-        df = df[(df["p1"] >= 0) & (df["p2"] >= 0)]
+        # Only ghost nodes carry labels from neighbouring partitions
+        lab = label[self.ghostIDs]
+        pit = pitIDs[self.ghostIDs]
+        ids = (lab != pit) & (lab >= 0) & (pit >= 0)
+        pairs = np.column_stack(
+            (np.minimum(lab[ids], pit[ids]), np.maximum(lab[ids], pit[ids]))
+        )
+        pairs = np.unique(pairs, axis=0).astype(np.int32)
         if MPIrank == 0 and self.verbose:
             print(
-                "Build pit dataframe (%0.02f seconds)" % (process_time() - t0)
+                "Build pit boundary pairs (%0.02f seconds)" % (process_time() - t0)
             )
         t0 = process_time()
 
-        # Send depression IDs globally
-        offset, _ = self._offsetGlobal(len(df))
-        combIds = -np.ones((np.amax(offset), 2), dtype=int)
-        if len(df) > 0:
-            combIds[offset[MPIrank] : offset[MPIrank + 1], :] = df.values
-        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, combIds, op=MPI.MAX)
-        df = self._buildPitDataframe(combIds[:, 0], combIds[:, 1])
-        df = df[(df["p1"] >= 0) & (df["p2"] >= 0)]
+        # Gather boundary pairs globally
+        counts = np.array(MPI.COMM_WORLD.allgather(2 * len(pairs)), dtype=int)
+        combIds = np.empty(counts.sum(), dtype=np.int32)
+        MPI.COMM_WORLD.Allgatherv(
+            pairs.ravel(), [combIds, counts, np.cumsum(counts) - counts, MPI.INT]
+        )
+        combIds = combIds.reshape(-1, 2)
         if MPIrank == 0 and self.verbose:
             print(
-                "Combine pit dataframe (%0.02f seconds)" % (process_time() - t0)
+                "Combine pit pairs (%0.02f seconds)" % (process_time() - t0)
             )
         t0 = process_time()
 
-        # Sorting label transfer between processors
-        if len(df) > 1:
-            sorting = True
-            while sorting:
-                df2 = self._sortingPits(df)
-                sorting = not df.equals(df2)
-                df = df2.copy()
-        for k in range(len(df)):
-            label[label == df["p2"].iloc[k]] = df["p1"].iloc[k]
+        # Merge labels connected across partitions (union-find)
+        nlab = np.zeros(1, dtype=int)
+        nlab[0] = max(np.max(label), np.max(pitIDs)) + 1
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, nlab, op=MPI.MAX)
+        if len(combIds) > 0:
+            root = pits_union(combIds[:, 0], combIds[:, 1], nlab[0])
+            ids = label >= 0
+            label[ids] = root[label[ids]]
         if MPIrank == 0 and self.verbose:
             print(
-                "Sorting pits (%0.02f seconds)" % (process_time() - t0)
+                "Merge pits (%0.02f seconds)" % (process_time() - t0)
             )
         t0 = process_time()
 
@@ -231,24 +206,21 @@ class PITFill(object):
         self.pitIDs = self.tmpL.getArray().astype(int)
 
         # Lets make consecutive indices
-        pitnbs = np.zeros(1, dtype=int)
-        pitnbs[0] = np.max(self.pitIDs) + 1
-        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, pitnbs, op=MPI.MAX)
         fillIDs = self.pitIDs >= 0
-        valpit = -np.ones(pitnbs[0], dtype=int)
-        unique, idx_groups = npi.group_by(
-            self.pitIDs[fillIDs], np.arange(len(self.pitIDs[fillIDs]))
-        )
-        valpit[unique] = 1
+        valpit = -np.ones(nlab[0], dtype=int)
+        valpit[np.unique(self.pitIDs[fillIDs])] = 1
         MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, valpit, op=MPI.MAX)
         pitNb = np.where(valpit > 0)[0]
+        valpit[pitNb] = np.arange(1, len(pitNb) + 1)
+        self.pitIDs[fillIDs] = valpit[self.pitIDs[fillIDs]]
         if MPIrank == 0 and self.verbose:
             print(
                 "Define consecutive pit ids (%0.02f seconds)" % (process_time() - t0)
             )
-        t0 = process_time()
 
-        self.pitIDs = pits_cons(self.pitIDs, pitNb)
+        if self.memclear:
+            del lab, pit, pairs, counts, combIds, label, valpit
+            gc.collect()
 
         return pitNb
 
@@ -325,19 +297,127 @@ class PITFill(object):
 
         return
 
-    def _performFilling(self, hl, level, sed):
+    def _pitGraph(self, hl, rcv, wght, lsink):
         """
-        This functions implements the linearly-scaling parallel priority-flood depression-filling algorithm from `Barnes (2016) <https://arxiv.org/pdf/1606.06204.pdf>`_ but adapted to unstructured meshes.
+        Builds the depressions graph used to route overflowing volumes from one depression to the next one (fill-spill-merge approach).
 
-        :arg hl: local elevation.
-        :arg level: minimal elevation above which the algorithm is performed.
-        :arg sed: boolean specifying if the pits are filled with water or sediments.
+        .. note::
+
+            Each mesh node is first associated to the depression containing the sink reached when following its steepest receivers (pointer jumping over the receivers array). As paths might cross several partitions, the labels of ghost nodes are exchanged until all paths are resolved. The downstream depression of a given depression is then the one reached from the lowest neighbour of its spillover node which does not belong to it.
+
+        :arg hl: local elevation
+        :arg rcv: local receivers indices on the unfilled surface
+        :arg wght: local receivers weights on the unfilled surface
+        :arg lsink: boolean array of local sinks on the unfilled surface
         """
 
-        t0 = process_time()
+        # Find the terminal node of each steepest descent path
+        nodes = np.arange(self.lpoints)
+        nxt = rcv[:, 0].astype(int)
+        term = (wght[:, 0] <= 0.0) | (nxt < 0)
+        term[self.ghostIDs] = True
+        nxt[term] = nodes[term]
+        for k in range(64):
+            jump = nxt[nxt]
+            if np.array_equal(jump, nxt):
+                break
+            nxt = jump
+
+        # Depression associated to each terminal node
+        tlabel = -np.ones(self.lpoints, dtype=int)
+        tlabel[lsink] = self.pitIDs[lsink]
+        tlabel[self.ghostIDs] = -2
+        unknown = np.zeros(2, dtype=int)
+        while True:
+            label = tlabel[nxt]
+            unknown[1] = unknown[0]
+            unknown[0] = np.count_nonzero(label[self.glIDs] == -2)
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, unknown[:1], op=MPI.SUM)
+            # Transfer labels along local borders
+            self.tmpL.setArray(label)
+            self.dm.localToGlobal(self.tmpL, self.tmp)
+            self.dm.globalToLocal(self.tmp, self.tmpL)
+            label = self.tmpL.getArray().astype(int)
+            if unknown[0] == 0 or unknown[0] == unknown[1]:
+                break
+            tlabel[self.ghostIDs] = label[self.ghostIDs]
+        label[label == -2] = -1
+
+        # Downstream depression from the spillover nodes
+        npits = len(self.pitInfo)
+        self.pitRcv = -2 * np.ones(npits, dtype=int)
+        pits = np.where(
+            (self.pitInfo[:, 1] == MPIrank) & (self.pitInfo[:, 0] >= 0)
+        )[0]
+        if len(pits) > 0:
+            ngbs = self.FVmesh_ngbID[self.pitInfo[pits, 0], :]
+            valid = (ngbs >= 0) & (self.pitIDs[ngbs] != pits[:, None])
+            hngb = np.where(valid, hl[ngbs], np.inf)
+            pos = np.argmin(hngb, axis=1)
+            ngb = ngbs[np.arange(len(pits)), pos]
+            valid = valid[np.arange(len(pits)), pos]
+            self.pitRcv[pits[valid]] = label[ngb[valid]]
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, self.pitRcv, op=MPI.MAX)
+        self.pitRcv[self.pitRcv < 0] = -1
+        self.pitRcv[self.pitRcv == np.arange(npits)] = -1
+
+        if self.memclear:
+            del nodes, nxt, term, jump, tlabel, label, pits
+            gc.collect()
+
+        return
+
+    def _routePits(self, inV, pitVol):
+        """
+        Routes the volumes entering each depression over the depressions graph (see `_pitGraph`).
+
+        :arg inV: volume entering each depression
+        :arg pitVol: available volume in each depression
+
+        :return: spill, src, nVol (overflowing volume of each depression, volume to release at each spillover node accounting for the volumes coming from upstream depressions and updated available volume in each depression)
+        """
+
+        spill, upin = pits_routing(self.pitRcv, inV, pitVol)
+        full = spill > 0.0
+        nVol = pitVol - inV - upin
+        nVol[full] = 0.0
+        nVol[nVol < 0.0] = 0.0
+        src = np.zeros(len(spill), dtype=np.float64)
+        src[full] = spill[full] - upin[full]
+
+        return spill, src, nVol
+
+    def _spillSources(self, src):
+        """
+        Defines the local source term associated to the volumes released at the depressions spillover nodes.
+
+        :arg src: volume to release at each depression spillover node
+
+        :return: local source array
+        """
+
+        nsrc = np.zeros(self.lpoints, dtype=np.float64)
+        ids = np.where((self.pitInfo[:, 1] == MPIrank) & (src != 0.0))[0]
+        np.add.at(nsrc, self.pitInfo[ids, 0], src[ids])
+
+        return nsrc
+
+    def _priorityFlood(self, hl, borders):
+        """
+        This functions implements the linearly-scaling parallel priority-flood depression-filling algorithm from `Barnes (2016) <https://arxiv.org/pdf/1606.06204.pdf>`_ but adapted to unstructured meshes.
+
+        .. note::
+
+            Only the compact spillover graph of each processor is gathered on the master processor, which solves the priority-flood on the watersheds graph. Each processor then only receives the filled elevations of the watersheds it holds.
+
+        :arg hl: local elevation shifted so that the algorithm is performed above 0.
+        :arg borders: local edges of the partition (partition boundaries and domain borders acting as outlets).
+
+        :return: lFill (local filled elevation)
+        """
 
         # Get local meshes edges and communication nodes
-        ledges = edge_tile(0.0, self.borders, hl)
+        ledges = edge_tile(0.0, borders, hl)
         out = np.where(ledges >= 0)[0]
         localEdges = np.empty((len(out), 2), dtype=int)
         localEdges[:, 0] = np.arange(self.lpoints)[out].astype(int)
@@ -347,9 +427,6 @@ class PITFill(object):
         inIDs[out] = 0
         outEdges = self.outEdges.copy()
         outEdges[out] = 0
-        out = np.where((ledges == 0) & (ledges == 2))[0]
-        gBounds = np.zeros(self.lpoints, dtype=int)
-        gBounds[out] = 1
 
         # Local pit filling
         lFill, label, gnb = fill_tile(localEdges, hl, inIDs)
@@ -395,41 +472,62 @@ class PITFill(object):
             lgrph = len(cgraph)
 
         # Add processor number to the graph
-        offset, sum = self._offsetGlobal(lgrph)
-        graph = -np.ones((sum, 5), dtype=float)
+        graph = np.empty((lgrph, 5), dtype=np.float64)
         if lgrph > 0:
-            graph[offset[MPIrank] : offset[MPIrank] + lgrph, :4] = cgraph
-            graph[offset[MPIrank] : offset[MPIrank] + lgrph, 4] = MPIrank
-
-        # Build global spillover graph on master
+            graph[:, :4] = cgraph
+            graph[:, 4] = MPIrank
+
+        # Gather compact spillover graphs and local watershed labels on master
+        ulabel, linv = np.unique(label, return_inverse=True)
+        gcounts = np.array(MPI.COMM_WORLD.allgather(graph.size), dtype=int)
+        lcounts = np.array(MPI.COMM_WORLD.allgather(len(ulabel)), dtype=int)
+        gdispls = np.cumsum(gcounts) - gcounts
+        ldispls = np.cumsum(lcounts) - lcounts
+        mgraph = None
+        mlabel = None
+        melev = None
         if MPIrank == 0:
-            mgraph = -np.ones((sum, 5), dtype=float)
-        else:
-            mgraph = None
-        MPI.COMM_WORLD.Reduce(graph, mgraph, op=MPI.MAX, root=0)
+            mgraph = np.empty(gcounts.sum(), dtype=np.float64)
+            mlabel = np.empty(lcounts.sum(), dtype=np.int64)
+        MPI.COMM_WORLD.Gatherv(
+            graph.ravel(), [mgraph, gcounts, gdispls, MPI.DOUBLE], root=0
+        )
+        MPI.COMM_WORLD.Gatherv(
+            ulabel.astype(np.int64), [mlabel, lcounts, ldispls, MPI.INT64_T], root=0
+        )
+
+        # Build global spillover graph on master and get the filled elevation of
+        # each watershed requested by the processors
         if MPIrank == 0:
-            ggraph = self._fillFromEdges(mgraph)
-        else:
-            ggraph = None
-
-        # Send filled graph dataset to each processors
-        graph = MPI.COMM_WORLD.bcast(ggraph, root=0)
-
-        # Drain pit on local boundaries and towards mesh edges
-        keep = graph[:, 2].astype(int) == MPIrank
-        proc = -np.ones(len(graph))
-        proc[keep] = graph[keep, 1]
-        keep = proc > -1
-        proc[keep] = gBounds[proc[keep].astype(int)]
-        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, proc, op=MPI.MAX)
-        ids = np.where(proc == 1)[0]
-        ids2 = np.where(graph[ids, 0] == graph[graph[ids, 3].astype(int), 0])[0]
-        graph[ids[ids2], 3] = 0.0
-        graph[graph[:, 0] < -1.0e8, 0] = -1.0e8
-        graph[graph[:, 0] > 1.0e7, 0] = -1.0e8
+            melev = -1.0e8 * np.ones(len(mlabel), dtype=np.float64)
+            if len(mgraph) > 0:
+                ggraph = self._fillFromEdges(mgraph.reshape(-1, 5))
+                gelev = ggraph[:, 0]
+                gelev[gelev < -1.0e8] = -1.0e8
+                gelev[gelev > 1.0e7] = -1.0e8
+                ids = (mlabel >= 0) & (mlabel < len(gelev))
+                melev[ids] = gelev[mlabel[ids]]
+
+        # Send filled levels of the local watersheds to each processors
+        lelev = np.empty(len(ulabel), dtype=np.float64)
+        MPI.COMM_WORLD.Scatterv([melev, lcounts, ldispls, MPI.DOUBLE], lelev, root=0)
 
         # Define global solution by combining depressions/flat together
-        lFill = fill_depressions(0.0, hl, lFill, label.astype(int), graph[:, 0])
+        lFill = fill_depressions(0.0, hl, lFill, linv, lelev)
+
+        return lFill
+
+    def _performFilling(self, hl, level, sed):
+        """
+        This functions fills the depressions of the local elevation with the parallel priority-flood algorithm (`_priorityFlood`) and defines the filled surface used by the flow and sediment routing.
+
+        :arg hl: local elevation.
+        :arg level: minimal elevation above which the algorithm is performed.
+        :arg sed: boolean specifying if the pits are filled with water or sediments.
+        """
+
+        t0 = process_time()
+        lFill = self._priorityFlood(hl, self.borders)
 
         # Define filling in land and enclosed seas only
         if not sed:
@@ -445,6 +543,94 @@ class PITFill(object):
 
         return
 
+    def _epsFill(self, elev, lvl):
+        """
+        This function performs a distributed epsilon-filling of the elevation above a given level. Depressions are first filled with the parallel priority-flood algorithm (`_priorityFlood`) and the resulting flat surfaces are then given a minimal gradient toward their lower nodes (one floating point increment per edge), ensuring that each node above the level has a strictly downstream path to it.
+
+        .. note::
+
+            The flat surfaces gradient is obtained with the fortran `flat_dist` sweep performed on each partition, only the values of the ghost nodes being exchanged between sweeps. Unlike for depression filling, the domain borders are not considered as outlets.
+
+        :arg elev: local elevation.
+        :arg lvl: level below which the elevation is left unchanged.
+
+        :return: fillz (local epsilon-filled elevation)
+        """
+
+        # Only partition boundaries are used as edges
+        edges = -np.ones((self.lpoints, 2), dtype=int)
+        edges[self.idLBounds, 0] = self.idLBounds
+        edges[self.idLBounds, 1] = 0
+
+        # Shift back all nodes above the level so that filled flats and their
+        # spillover nodes are rounded identically
+        hs = elev - lvl
+        lFill = self._priorityFlood(hs, edges)
+        fillz = elev.copy()
+        ids = lFill >= 0.0
+        fillz[ids] = lFill[ids] + lvl
+
+        # Number of edges to the lower nodes of flat surfaces
+        dist = np.full(self.lpoints, 1.0e8, dtype=np.float64)
+        seed = np.ones(self.lpoints, dtype=np.int32)
+        change = np.ones(1, dtype=int)
+        while change[0] > 0:
+            dist = flat_dist(lvl, fillz, dist, seed)
+            self.tmpL.setArray(dist)
+            self.dm.localToGlobal(self.tmpL, self.tmp)
+            self.dm.globalToLocal(self.tmp, self.tmpL)
+            ndist = dist.copy()
+            ndist[self.ghostIDs] = self.tmpL.getArray()[self.ghostIDs]
+
+            # Restart from the ghost nodes with a shorter distance
+            seed = (ndist < dist).astype(np.int32)
+            change[0] = np.count_nonzero(seed)
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, change, op=MPI.SUM)
+            dist = ndist
+
+        ids = (fillz >= lvl) & (dist > 0) & (dist < 1.0e8)
+        fillz[ids] += dist[ids] * np.spacing(np.absolute(fillz[ids]))
+        fillz = self._checkDownstream(fillz, lvl)
+
+        if self.memclear:
+            del edges, hs, lFill, dist, ndist, seed, ids
+            gc.collect()
+
+        return fillz
+
+    def _checkDownstream(self, fillz, lvl, maxit=100):
+        """
+        This function checks that every node above a given level has a strictly lower neighbour after the epsilon-filling. Nodes where the floating point increments have been rounded away are raised by one floating point increment until the condition is met.
+
+        :arg fillz: local epsilon-filled elevation.
+        :arg lvl: level below which the elevation is left unchanged.
+        :arg maxit: maximum number of corrections.
+
+        :return: fillz (local epsilon-filled elevation)
+        """
+
+        ngbID = self.FVmesh_ngbID
+        valid = ngbID >= 0
+        nids = np.where(valid, ngbID, 0)
+        check = self.inIDs == 1
+        bad = np.ones(1, dtype=int)
+        for _ in range(maxit + 1):
+            lower = np.any(valid & (fillz[nids] < fillz[:, None]), axis=1)
+            ids = check & (fillz > lvl) & ~lower
+            bad[0] = np.count_nonzero(ids)
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, bad, op=MPI.SUM)
+            if bad[0] == 0:
+                return fillz
+            fillz[ids] = np.nextafter(fillz[ids], np.inf)
+            self.tmpL.setArray(fillz)
+            self.dm.localToGlobal(self.tmpL, self.tmp)
+            self.dm.globalToLocal(self.tmp, self.tmpL)
+            fillz = self.tmpL.getArray().copy()
+
+        raise RuntimeError(
+            "Epsilon-filling left %d nodes without a lower neighbour." % bad[0]
+        )
+
     def _pitInformation(self, hl, level, sed=False):
         """
         This function extracts depression informations available to all processors. It stores the following things:
@@ -536,14 +722,165 @@ class PITFill(object):
 
         return
 
+    def _fillLevels(self, hl):
+        """
+        Defines for each water depression a set of filling levels (`filled_lvl`) and the volumes of water stored below them (`filled_vol`), which are used to interpolate the water level in unfilled depressions.
+
+        :arg hl: local elevation.
+        """
+
+        ids = self.pitParams[:, 0] > 0.0
+        dh = np.zeros((len(self.pitInfo), 6), dtype=np.float64)
+        dh[ids, 0] = self.pitParams[ids, 1] - self.pitParams[ids, 2]
+        dh[ids, 1:] = np.expand_dims(self.pitParams[ids, 2] / 5.0, axis=1)
+        self.filled_lvl = np.cumsum(dh, axis=1)[:, 1:]
+
+        h = hl.copy()
+        h[h < self.sealevel] = self.sealevel
+        self.filled_vol = np.zeros((len(self.pitInfo), 5), dtype=np.float64)
+        self.filled_vol[:, :-1] = getpitvol(
+            self.filled_lvl[:, :-1], h, self.pitIDs, self.inIDs
+        )
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, self.filled_vol, op=MPI.SUM)
+        self.filled_vol[:, -1] = self.pitParams[:, 0]
+
+        return
+
+    def _storeFillState(self, hl, level, sed):
+        """
+        Stores the depressions state obtained from a complete filling so that it can be reused when the elevation has not changed or by the incremental mode (see `_reuseFillState`).
+
+        :arg hl: local elevation.
+        :arg level: minimal elevation above which the algorithm is performed.
+        :arg sed: boolean specifying if the pits are filled with water or sediments.
+        """
+
+        state = {
+            "h": hl.copy(),
+            "hl": hl.copy(),
+            "level": level,
+            "sealevel": self.sealevel,
+            "lFill": self.lFill.copy(),
+            "pitIDs": self.pitIDs.copy(),
+            "pitInfo": self.pitInfo.copy(),
+            "lspillIDs": self.lspillIDs.copy(),
+            "flatDirs": self.flatDirs.copy(),
+            "pitParams": self.pitParams.copy(),
+            "version": self.fillVersion,
+        }
+        if not sed:
+            state["filled_lvl"] = self.filled_lvl.copy()
+            state["filled_vol"] = self.filled_vol.copy()
+        self.fillState[sed] = state
+
+        return
+
+    def _reuseFillState(self, hl, level, sed):
+        """
+        Checks if the depressions state from the previous filling is still valid for the current elevation and restores it if this is the case.
+
+        .. note::
+
+            The previous state is always reused when the elevation has not changed since the last call. In addition, when a user-defined tolerance (`filltol`) is set, the previous state is reused when the elevation of the depressions and of the nodes surrounding them has not changed by more than this tolerance since the last complete filling. Outside depressions, the filled surface is then the new elevation and each land node needs to have a strictly lower neighbour, which ensures that no new depression has been created. The depressions labels and spillover elevations are then kept while their volumes and filling levels are computed again for the new elevation. Otherwise, a complete filling is performed.
+
+        :arg hl: local elevation.
+        :arg level: minimal elevation above which the algorithm is performed.
+        :arg sed: boolean specifying if the pits are filled with water or sediments.
+
+        :return: reuse (boolean set to True when the previous state has been restored)
+        """
+
+        state = self.fillState.get(sed)
+        if state is None:
+            return False
+
+        # Elevation unchanged since the previous call
+        valid = np.zeros(1, dtype=int)
+        if self.sealevel == state["sealevel"] and np.array_equal(hl, state["h"]):
+            valid[0] = 1
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, valid, op=MPI.MIN)
+        pits = None
+        if valid[0] == 1:
+            lFill = state["lFill"].copy()
+        elif self.fillTol is None:
+            return False
+        else:
+            if (
+                abs(level - state["level"]) <= self.fillTol
+                and self.sealevel == state["sealevel"]
+            ):
+                pits = state["pitIDs"] > -1
+                dh = np.absolute(hl - state["hl"])
+
+                # Nodes surrounding the depressions
+                ngbs = self.FVmesh_ngbID
+                valid_ngb = ngbs >= 0
+                ring = np.zeros(self.lpoints, dtype=bool)
+                ring[ngbs[valid_ngb & pits[:, None]]] = True
+                ring[pits] = False
+
+                # Filled surface outside depressions and local descent check
+                lFill = hl.copy()
+                lFill[pits] = state["lFill"][pits]
+                hngb = np.where(valid_ngb, lFill[ngbs], np.inf)
+                land = (~pits) & (lFill > level) & (self.inIDs == 1)
+                land[self.idBorders] = False
+                if not sed:
+                    land[lFill <= self.sealevel] = False
+
+                if (
+                    (dh[pits] <= self.fillTol).all()
+                    and (dh[ring] <= self.fillTol).all()
+                    and (hl[pits] <= state["lFill"][pits]).all()
+                    and (hngb[land].min(axis=1) < lFill[land]).all()
+                ):
+                    valid[0] = 1
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, valid, op=MPI.MIN)
+            if valid[0] == 0:
+                return False
+
+        # Restore previous depressions state
+        self.lFill = lFill
+        self.pitIDs = state["pitIDs"].copy()
+        self.pitInfo = state["pitInfo"].copy()
+        self.lspillIDs = state["lspillIDs"].copy()
+        self.flatDirs = state["flatDirs"].copy()
+        self.pitParams = state["pitParams"].copy()
+        if not sed:
+            self.filled_lvl = state["filled_lvl"].copy()
+            self.filled_vol = state["filled_vol"].copy()
+        if pits is not None:
+            # Depressions volumes and filling levels of the current elevation
+            h = hl.copy()
+            if not sed:
+                h[h < self.sealevel] = self.sealevel
+            self._getPitParams(h, len(self.pitInfo))
+            if not sed:
+                self._fillLevels(hl)
+
+            # The reference elevation (hl) is the one of the last complete
+            # filling so that the tolerance applies to the cumulative changes
+            state["lFill"][~pits] = lFill[~pits]
+            self.fillStamp += 1
+            self.fillVersion = self.fillStamp
+            state["version"] = self.fillVersion
+        else:
+            self.fillVersion = state["version"]
+        state["h"] = hl.copy()
+        self.cacheStats["fill"][0] += 1
+
+        return True
+
     def fillElevation(self, sed=False):
         """
         This functions is the main entry point to perform pit filling.
 
         It relies on the following private functions:
 
+        - _reuseFillState
         - _performFilling
         - _pitInformation
+        - _storeFillState
 
         :arg sed: boolean specifying if the pits are filled with water or sediments.
         """
@@ -556,25 +893,27 @@ class PITFill(object):
             minh += 1.0e-3
         level = max(minh, self.sealevel + self.oFill)
 
+        # Reuse previous depressions state if the elevation changes allow it
+        if self._reuseFillState(hl, level, sed):
+            if MPIrank == 0 and self.verbose:
+                print(
+                    "Reuse depressions state (%0.02f seconds)"
+                    % (process_time() - tfill)
+                )
+            return
+        self.cacheStats["fill"][1] += 1
+        self.fillStamp += 1
+        self.fillVersion = self.fillStamp
+
         self._performFilling(hl - level, level, sed)
         self.lFill += level
         self._pitInformation(hl, level, sed)
 
         # Define specific filling levels for unfilled water depressions
         if not sed:
-            ids = self.pitParams[:, 0] > 0.0
-            dh = np.zeros((len(self.pitInfo), 6), dtype=np.float64)
-            dh[ids, 0] = self.pitParams[ids, 1] - self.pitParams[ids, 2]
-            dh[ids, 1:] = np.expand_dims(self.pitParams[ids, 2] / 5.0, axis=1)
-            self.filled_lvl = np.cumsum(dh, axis=1)[:, 1:]
-
-            self.filled_vol = np.zeros((len(self.pitInfo), 5), dtype=np.float64)
-            hl[hl < self.sealevel] = self.sealevel
-            self.filled_vol[:, :-1] = getpitvol(
-                self.filled_lvl[:, :-1], hl, self.pitIDs, self.inIDs
-            )
-            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, self.filled_vol, op=MPI.SUM)
-            self.filled_vol[:, -1] = self.pitParams[:, 0]
+            self._fillLevels(hl)
+
+        self._storeFillState(self.hLocal.getArray(), level, sed)
 
         if MPIrank == 0 and self.verbose:
             print(
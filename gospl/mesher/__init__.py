@@ -1,6 +1,5 @@
 """
 Definition of the unstructured mesh properties and plate motions.
 """
-from .meshfunc import VoroBuild
 from .unstructuredmesh import UnstMesh
 from .tectonics import Tectonics
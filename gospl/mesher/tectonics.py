@@ -143,44 +143,20 @@ class Tectonics(object):
                 rCoeffs[self.idBorders, 1:] = 0.0
                 rCoeffs[self.idBorders, 0] = 1.0
 
-        advMat_left = self._matrix_build_diag(lCoeffs[:, 0])
+        advMat_left = self._matrix_build_csr(
+            self.FVmesh_ngbID[:, : self.maxnb],
+            lCoeffs[:, 1 : self.maxnb + 1],
+            diag=lCoeffs[:, 0],
+        )
         if iioe:
-            advMat_right = self._matrix_build_diag(rCoeffs[:, 0])
+            advMat_right = self._matrix_build_csr(
+                self.FVmesh_ngbID[:, : self.maxnb],
+                rCoeffs[:, 1 : self.maxnb + 1],
+                diag=rCoeffs[:, 0],
+            )
         else:
             advMat_right = None
 
-        indptr = np.arange(0, self.lpoints + 1, dtype=petsc4py.PETSc.IntType)
-
-        for k in range(0, self.maxnb):
-            tmpMat = self._matrix_build()
-            indices = self.FVmesh_ngbID[:, k].copy()
-            data = lCoeffs[:, k + 1]
-            ids = np.nonzero(data == 0.0)
-            indices[ids] = ids
-            tmpMat.assemblyBegin()
-            tmpMat.setValuesLocalCSR(
-                indptr,
-                indices.astype(petsc4py.PETSc.IntType),
-                data,
-            )
-            tmpMat.assemblyEnd()
-            advMat_left.axpy(1.0, tmpMat)
-            tmpMat.destroy()
-            if iioe:
-                tmpMat = self._matrix_build()
-                indices = self.FVmesh_ngbID[:, k].copy()
-                data = rCoeffs[:, k + 1]
-                ids = np.nonzero(data == 0.0)
-                indices[ids] = ids
-                tmpMat.assemblyBegin()
-                tmpMat.setValuesLocalCSR(
-                    indptr,
-                    indices.astype(petsc4py.PETSc.IntType),
-                    data,
-                )
-                tmpMat.assemblyEnd()
-                advMat_right.axpy(1.0, tmpMat)
-                tmpMat.destroy()
         if iioe:
             return advMat_left, advMat_right
         else:
@@ -204,7 +180,7 @@ class Tectonics(object):
             lCoeffs, rCoeffs = adveciioe2(self.lpoints, self.dt, nbOut, vL, vmin, vmax)
             advMat_left2, advMat_right2 = self._buildAdvecMat(True, lCoeffs, rCoeffs)
             advMat_right2.mult(self.hGlobal, self.tmp1)
-            self._solve_KSP(True, advMat_left2, self.tmp1, self.tmp)
+            self._solve_KSP(True, advMat_left2, self.tmp1, self.tmp, role="advection")
             advMat_left2.destroy()
             advMat_right2.destroy()
 
@@ -254,7 +230,7 @@ class Tectonics(object):
         if iioe:
             # Inflow-Implicit/Outflow-Explicit Scheme 1
             advMat_right.mult(self.hGlobal, self.tmp1)
-            self._solve_KSP(True, advMat_left, self.tmp1, self.tmp)
+            self._solve_KSP(True, advMat_left, self.tmp1, self.tmp, role="advection")
             # Inflow-Implicit/Outflow-Explicit Scheme 2
             if self.advscheme == 3:
                 self.dm.globalToLocal(self.tmp, self.tmpL)
@@ -262,7 +238,7 @@ class Tectonics(object):
                 self._advectorIIOE2(hL, newh, hmin, hmax, nbOut)
         else:
             # Upwind scheme with potentially excessive diffusion solved implicitly
-            self._solve_KSP(True, advMat_left, self.hGlobal, self.tmp)
+            self._solve_KSP(True, advMat_left, self.hGlobal, self.tmp, role="advection")
 
         # Update elevations
         self.tmp.copy(result=self.hGlobal)
@@ -283,7 +259,7 @@ class Tectonics(object):
                 edmin, edmax = getrange(self.lpoints, edL)
             # Inflow-Implicit/Outflow-Explicit Scheme 1
             advMat_right.mult(self.cumED, self.tmp1)
-            self._solve_KSP(True, advMat_left, self.tmp1, self.tmp)
+            self._solve_KSP(True, advMat_left, self.tmp1, self.tmp, role="advection")
             # Inflow-Implicit/Outflow-Explicit Scheme 2
             if self.advscheme == 3:
                 self.dm.globalToLocal(self.tmp, self.tmpL)
@@ -291,7 +267,7 @@ class Tectonics(object):
                 self._advectorIIOE2(edL, newed, edmin, edmax, nbOut)
         else:
             # Upwind scheme with potentially excessive diffusion solved implicitly
-            self._solve_KSP(True, advMat_left, self.cumED, self.tmp)
+            self._solve_KSP(True, advMat_left, self.cumED, self.tmp, role="advection")
 
         # Update erosion deposition
         self.tmp.copy(result=self.cumED)
@@ -313,7 +289,7 @@ class Tectonics(object):
                     fimin, fimax = getrange(self.lpoints, self.localFlex)
                 # Inflow-Implicit/Outflow-Explicit Scheme 1
                 advMat_right.mult(self.fiso, self.tmp1)
-                self._solve_KSP(True, advMat_left, self.tmp1, self.tmp)
+                self._solve_KSP(True, advMat_left, self.tmp1, self.tmp, role="advection")
                 # Inflow-Implicit/Outflow-Explicit Scheme 2
                 if self.advscheme == 3:
                     self.dm.globalToLocal(self.tmp, self.tmpL)
@@ -323,7 +299,7 @@ class Tectonics(object):
                 self.tmpL.setArray(self.localFlex)
                 self.dm.localToGlobal(self.tmpL, self.fiso)
                 # Upwind scheme with potentially excessive diffusion solved implicitly
-                self._solve_KSP(True, advMat_left, self.fiso, self.tmp)
+                self._solve_KSP(True, advMat_left, self.fiso, self.tmp, role="advection")
 
             # Update flexural isostasy
             self.tmp.copy(result=self.fiso)
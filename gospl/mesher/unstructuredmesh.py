@@ -1,24 +1,24 @@
 import os
 import gc
 import sys
-import vtk
+import hashlib
 
-import warnings
+import h5py
 import petsc4py
 import numpy as np
 import pandas as pd
 
 from mpi4py import MPI
-from scipy import spatial
 from time import process_time
 
-from vtk.util import numpy_support  # type: ignore
 
 if "READTHEDOCS" not in os.environ:
-    from gospl._fortran import globalngbhs
-    from gospl._fortran import definetin
+    from gospl._fortran import definefv
+    from gospl._fortran import getfvmesh
+    from gospl._fortran import setfvmesh
     from gospl._fortran import fitedges
     from gospl._fortran import updatearea
+    from gospl._fortran import setthreads
 
 petsc4py.init(sys.argv)
 MPIrank = petsc4py.PETSc.COMM_WORLD.Get_rank()
@@ -59,6 +59,10 @@ class UnstMesh(object):
         self.memclear = False
         self.southPts = None
 
+        # Number of OpenMP threads used by the fortran kernels on each rank
+        if self.ompThreads is not None:
+            setthreads(self.ompThreads)
+
         # Let us define the mesh variables and build PETSc DMPLEX.
         self._buildMesh()
 
@@ -70,7 +74,7 @@ class UnstMesh(object):
 
         .. note::
 
-            As far as I am aware, PETSc DMPlex requires to be initialised on one processor before load balancing.
+            The DMPlex is initialised on one processor before load balancing. For large meshes, the parallel loading path (`_meshfrom_hdf5`) avoids building the entire topology on the first processor.
 
         :arg dim: topological dimension of the mesh
         :arg cells: vertices of each cell
@@ -100,6 +104,266 @@ class UnstMesh(object):
             )
         return
 
+    def _meshfrom_hdf5(self, loadData):
+        """
+        Creates a DMPlex in parallel from the mesh cells and vertices.
+
+        .. note::
+
+            The mesh cells and coordinates are stored once in a HDF5 file following the PETSc XDMF layout (``/viz/topology/cells`` and ``/geometry/vertices``) next to the input mesh file. This file is reused by subsequent runs as long as it is more recent than the input mesh. Each processor then reads a contiguous slice of the cells and vertices and the DMPlex is built with the PETSc parallel cell list constructor. The resulting naive partition is redistributed afterwards (see `_buildMesh`).
+
+        :arg loadData: input mesh dataset (**.npz** file)
+        """
+
+        h5file = self.meshFile[:-4] + "_plex.h5"
+        self.plexFile = h5file
+
+        # Store the mesh topology and geometry in a HDF5 file
+        convert = 0
+        if MPIrank == 0:
+            if not os.path.exists(h5file) or os.path.getmtime(
+                h5file
+            ) < os.path.getmtime(self.meshFile):
+                convert = 1
+                with h5py.File(h5file, "w") as f:
+                    f.create_dataset(
+                        "geometry/vertices",
+                        data=np.asarray(self.mCoords, dtype=np.float64),
+                    )
+                    cells = f.create_dataset(
+                        "viz/topology/cells",
+                        data=np.asarray(loadData["c"], dtype=np.int32),
+                    )
+                    cells.attrs["cell_dim"] = np.int32(2)
+        convert = MPIcomm.bcast(convert, root=0)
+        if MPIrank == 0 and self.verbose and convert == 1:
+            print("Store mesh topology in {}".format(h5file), flush=True)
+
+        # Parallel loading of the DMPlex
+        petsc4py.PETSc.Options().setValue("dm_plex_create_from_hdf5_xdmf", True)
+        self.dm = petsc4py.PETSc.DMPlex().createFromFile(
+            h5file, interpolate=True, comm=petsc4py.PETSc.COMM_WORLD
+        )
+        petsc4py.PETSc.Options().delValue("dm_plex_create_from_hdf5_xdmf")
+
+        return
+
+    def _vertexIndices(self):
+        """
+        Returns the index in the input mesh of each vertex of the DMPlex prior to its distribution.
+
+        .. note::
+
+            When the DMPlex is created on the first processor, its vertices follow the input mesh ordering. When it is loaded in parallel (`_meshfrom_hdf5`), each processor holds a contiguous slice of the cells (split as the PETSc default layout) and the PETSc parallel cell list constructor numbers the local vertices following the sorted input indices of the vertices of these cells.
+
+        :return: vertices indices of the local DMPlex (as float)
+        """
+
+        vStart, vEnd = self.dm.getDepthStratum(0)
+        if self.plexFile is None:
+            return np.arange(vEnd - vStart, dtype=np.float64)
+
+        with h5py.File(self.plexFile, "r") as f:
+            cells = f["viz/topology/cells"]
+            ncells = cells.shape[0]
+            nloc = ncells // MPIsize + int(MPIrank < ncells % MPIsize)
+            start = MPIcomm.exscan(nloc)
+            if start is None:
+                start = 0
+            ids = np.unique(cells[start:start + nloc, :])
+        if len(ids) != vEnd - vStart:
+            raise RuntimeError(
+                "Unexpected vertices numbering in the parallel DMPlex construction."
+            )
+
+        return ids.astype(np.float64)
+
+    def _checkVertexIndices(self):
+        """
+        Checks that the input mesh indices of the local vertices (`locIDs`) obtained after the DMPlex distribution point to the coordinates of these vertices.
+
+        .. note::
+
+            This validates the numbering assumed in `_vertexIndices`, and in particular the one of the parallel DMPlex construction. The coordinates are copied from the input mesh without any operation and are thus compared exactly, so that neighbouring vertices cannot be mistaken for each other.
+        """
+
+        wrong = np.zeros(1, dtype=np.int64)
+        if len(self.locIDs) != self.lpoints:
+            wrong[0] = 1
+        elif self.lpoints > 0:
+            if self.locIDs.min() < 0 or self.locIDs.max() >= self.mpoints:
+                wrong[0] = 1
+            elif not np.array_equal(self.lcoords, self.mCoords[self.locIDs]):
+                wrong[0] = 1
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, wrong, op=MPI.MAX)
+        if wrong[0] > 0:
+            raise RuntimeError(
+                "The local vertices do not match the input mesh coordinates."
+            )
+
+        return
+
+    def _meshCacheFile(self):
+        """
+        Defines the mesh preparation cache file of the current processor.
+
+        .. note::
+
+            The cache is keyed by the hash of the input mesh file, the number of processors and the overlap used in the DMPlex distribution. Each processor stores its own local mesh definition in a separate uncompressed **.npz** file (``<meshcache>/<key>/rank<i>.npz``).
+
+        :return: cache file name of the processor
+        """
+
+        key = None
+        if MPIrank == 0:
+            sha = hashlib.sha1()
+            with open(self.meshFile, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            key = "{}_np{}_ov{}".format(sha.hexdigest()[:16], MPIsize, self.overlap)
+            os.makedirs(os.path.join(self.meshCache, key), exist_ok=True)
+        key = MPIcomm.bcast(key, root=0)
+
+        return os.path.join(self.meshCache, key, "rank{}.npz".format(MPIrank))
+
+    def _loadMeshCache(self):
+        """
+        Loads the local mesh definition of the processor from the mesh preparation cache.
+
+        .. important::
+
+            The cached definition is only used when the input mesh indices of the distributed DMPlex vertices match the stored ones on every processor (the DMPlex partition might change with the PETSc or ParMETIS versions). Otherwise, the mesh structure is rebuilt and the cache is updated.
+
+        The cache provides the local cells, the boundary nodes, the finite volume neighbours and areas, and the fortran mesh parameters normally obtained with `_meshStructure`.
+
+        :return: True if the cache has been loaded on all processors
+        """
+
+        # Unreadable (e.g. truncated) cache files are considered invalid
+        valid = np.zeros(1, dtype=np.int64)
+        cache = None
+        if os.path.exists(self.meshCacheFile):
+            try:
+                with np.load(self.meshCacheFile) as data:
+                    cache = {key: data[key] for key in data.files}
+                if np.array_equal(cache["locIDs"], self.locIDs):
+                    valid[0] = 1
+            except Exception:
+                cache = None
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, valid, op=MPI.MIN)
+        if valid[0] == 0:
+            return False
+
+        self.lcells = cache["lcells"]
+        self.idBorders = cache["idBorders"]
+        self.idLBounds = cache["idLBounds"]
+        self.FVmesh_ngbID = cache["ngbID"]
+        self.larea = cache["larea"]
+        setfvmesh(
+            self.lcoords,
+            self.FVmesh_ngbID,
+            cache["FVnNb"],
+            cache["FVnIDfNb"],
+            cache["FVeLgt"],
+            cache["FVvDist"],
+            cache["FVarea"],
+            cache["faceVec"],
+            cache["midFace"],
+        )
+        del cache
+
+        self.maxarea = np.zeros(1, dtype=np.float64)
+        self.maxarea[0] = self.larea.max()
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, self.maxarea, op=MPI.MIN)
+
+        return True
+
+    def _saveMeshCache(self):
+        """
+        Stores the local mesh definition of the processor in the mesh preparation cache (see `_loadMeshCache`).
+        """
+
+        fvnnb, fvnidfnb, fvelgt, fvvdist, fvarea, facevec, midface = getfvmesh(
+            self.lpoints
+        )
+        # Written in a temporary file first so that an interrupted run does
+        # not leave a partial cache file
+        tmpFile = self.meshCacheFile + ".tmp"
+        with open(tmpFile, "wb") as f:
+            np.savez(
+                f,
+                locIDs=self.locIDs,
+                lcells=self.lcells,
+                idBorders=self.idBorders,
+                idLBounds=self.idLBounds,
+                ngbID=self.FVmesh_ngbID,
+                larea=self.larea,
+                FVnNb=fvnnb,
+                FVnIDfNb=fvnidfnb,
+                FVeLgt=fvelgt,
+                FVvDist=fvvdist,
+                FVarea=fvarea,
+                faceVec=facevec,
+                midFace=midface,
+            )
+        os.replace(tmpFile, self.meshCacheFile)
+
+        return
+
+    def _stratumCones(self, pStart, pEnd, size):
+        """
+        Returns the cones of a DMPlex stratum extracted from the plex cone arrays.
+
+        .. note::
+
+            All points of a stratum share the same cone size and are stored contiguously in the DMPlex cone section.
+
+        :arg pStart: first point of the stratum
+        :arg pEnd: upper bound of the stratum points
+        :arg size: cone size of the stratum points
+
+        :return: cones, orientations (arrays of shape (pEnd-pStart, size))
+        """
+
+        offset = self.dm.getConeSection().getOffset(pStart)
+        nb = (pEnd - pStart) * size
+        cones = self.dm.getCones()[offset:offset + nb].reshape(-1, size)
+        orient = self.dm.getConeOrientations()[offset:offset + nb].reshape(-1, size)
+
+        return cones, orient
+
+    def _localCells(self):
+        """
+        Defines the vertices of each cell of the local DMPlex.
+
+        .. note::
+
+            The vertices are obtained for all cells at once from the cone arrays of the DMPlex and follow the ordering of the cell transitive closure: the first two vertices are the ones of the first edge of the cell (accounting for its orientation) and the last one is the remaining vertex of the second edge.
+        """
+
+        cStart, cEnd = self.dm.getHeightStratum(0)
+        eStart, eEnd = self.dm.getDepthStratum(1)
+        vStart, vEnd = self.dm.getDepthStratum(0)
+
+        cellEdges, cellOrient = self._stratumCones(cStart, cEnd, 3)
+        edgeVertices = self._stratumCones(eStart, eEnd, 2)[0] - vStart
+
+        # Oriented vertices of the first edge of each cell
+        e0 = edgeVertices[cellEdges[:, 0] - eStart]
+        e0 = np.where(cellOrient[:, 0:1] < 0, e0[:, ::-1], e0)
+        # Remaining vertex from the second edge
+        e1 = edgeVertices[cellEdges[:, 1] - eStart]
+        shared = np.logical_or(e1[:, 0] == e0[:, 0], e1[:, 0] == e0[:, 1])
+
+        self.lcells = np.zeros((cEnd - cStart, 3), dtype=petsc4py.PETSc.IntType)
+        self.lcells[:, :2] = e0
+        self.lcells[:, 2] = np.where(shared, e1[:, 1], e1[:, 0])
+
+        del cellEdges, cellOrient, edgeVertices, e0, e1, shared
+        gc.collect()
+
+        return
+
     def _meshStructure(self):
         """
         Defines the mesh structure and the associated voronoi parameter used in the Finite Volume method.
@@ -107,7 +371,7 @@ class UnstMesh(object):
         .. important::
             The mesh structure is built locally on a single partition of the global mesh.
 
-        Once the voronoi definitions have been obtained a call to the fortran subroutine `definetin` is performed to order each node and the dual mesh components, it records:
+        The finite volume geometry is obtained in a single pass with the fortran subroutine `definefv`, which extracts the triangulation edges, computes the triangles circumcenters and control volumes, and orders each node and the dual mesh components (`definetin`). It records:
 
         - all cells surrounding a given vertice,
         - all edges connected to a given vertice,
@@ -116,34 +380,19 @@ class UnstMesh(object):
 
         """
 
-        # Create mesh structure and voronoi parameters used for
-        # Centroidal Voronoi Tessellation and Spherical Centroidal Voronoi
-        # Tessellation
+        # Finite volume discretisation (voronoi points are set on the sphere
+        # for global models)
         t0 = process_time()
-        Tmesh = self.initVoronoi(self.lcoords, self.lcells)
-        larea = np.abs(self.control_volumes)
-        larea[np.isnan(larea)] = 1.0
-
-        # Voronoi and simplices declaration
-        self.create_edges()
-        cc = self.cell_circumcenters
-        if not self.flatModel:
-            # Ensure voronoi points are properly set on the sphere
-            radius = np.linalg.norm(self.lcoords[0])
-            cc = cc * (radius / np.linalg.norm(cc, axis=1)).reshape((len(cc), 1))
-
-        edges_nodes = self.edges["nodes"]
-        cells_nodes = self.cells["nodes"]
-        cells_edges = self.cells["edges"]
-
-        # Finite volume discretisation
-        self.FVmesh_ngbID, self.larea = definetin(
-            self.lcoords,
-            cells_nodes,
-            cells_edges,
-            edges_nodes,
-            cc.T,
+        self.FVmesh_ngbID, self.larea, larea, ierr = definefv(
+            self.lcoords, self.lcells, int(not self.flatModel)
         )
+        ierr = MPI.COMM_WORLD.allreduce(ierr, op=MPI.MAX)
+        if ierr > 0:
+            raise RuntimeError(
+                "The finite volume discretisation requires vertices with at most 12 neighbours."
+            )
+        larea = np.abs(larea)
+        larea[np.isnan(larea)] = 1.0
         self.larea[np.isnan(self.larea)] = 1.0
         issues = np.zeros(1)
         issues[0] = np.max(np.abs(larea - self.larea))
@@ -167,7 +416,7 @@ class UnstMesh(object):
         self.maxarea[0] = self.larea.max()
         MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, self.maxarea, op=MPI.MIN)
 
-        del Tmesh, edges_nodes, cells_nodes, cells_edges, cc, larea
+        del larea
         gc.collect()
 
         if MPIrank == 0 and self.verbose:
@@ -190,79 +439,16 @@ class UnstMesh(object):
 
         return
 
-    def _generateVTKmesh(self, points, cells):
-        """
-        A global VTK mesh is generated to compute the distance between mesh vertices and coastlines position.
-
-        The distance to the coastline for every marine vertices is used to define a maximum shelf slope during deposition. The coastline contours are efficiently obtained from VTK contouring function. This function is performed on a VTK mesh which is built in this function.
-        """
-
-        self.vtkMesh = vtk.vtkUnstructuredGrid()
-
-        # Define mesh vertices
-        vtk_points = vtk.vtkPoints()
-        vtk_array = numpy_support.numpy_to_vtk(points, deep=True)
-        vtk_points.SetData(vtk_array)
-        self.vtkMesh.SetPoints(vtk_points)
-
-        # Define mesh cells
-        cell_types = []
-        cell_offsets = []
-        cell_connectivity = []
-        len_array = 0
-        numcells, num_local_nodes = cells.shape
-        cell_types.append(np.empty(numcells, dtype=np.ubyte))
-        cell_types[-1].fill(vtk.VTK_TRIANGLE)
-        cell_offsets.append(
-            np.arange(
-                len_array,
-                len_array + numcells * (num_local_nodes + 1),
-                num_local_nodes + 1,
-                dtype=np.int64,
-            )
-        )
-        cell_connectivity.append(
-            np.c_[
-                num_local_nodes * np.ones(numcells, dtype=cells.dtype), cells
-            ].flatten()
-        )
-        len_array += len(cell_connectivity[-1])
-        cell_types = np.concatenate(cell_types)
-        cell_offsets = np.concatenate(cell_offsets)
-        cell_connectivity = np.concatenate(cell_connectivity)
-
-        # Connectivity
-        connectivity = numpy_support.numpy_to_vtkIdTypeArray(
-            cell_connectivity.astype(np.int64), deep=1
-        )
-        cell_array = vtk.vtkCellArray()
-        cell_array.SetCells(len(cell_types), connectivity)
-
-        self.vtkMesh.SetCells(
-            numpy_support.numpy_to_vtk(
-                cell_types, deep=1, array_type=vtk.vtkUnsignedCharArray().GetDataType()
-            ),
-            numpy_support.numpy_to_vtk(
-                cell_offsets, deep=1, array_type=vtk.vtkIdTypeArray().GetDataType()
-            ),
-            cell_array,
-        )
-
-        # Cleaning function parameters here...
-        del vtk_points, vtk_array, connectivity, numcells, num_local_nodes
-        del cell_array, cell_connectivity, cell_offsets, cell_types
-        gc.collect()
-
-        return
-
     def _buildMesh(self):
         """
         This function is at the core of the `UnstMesh` class. It encapsulates both spherical mesh construction (triangulation and voronoi representation for the Finite Volume discretisation), PETSc DMPlex distribution and several PETSc vectors allocation.
 
         The function relies on several private functions from the class:
 
-        - _generateVTKmesh
-        - _meshfrom_cell_list
+        - _meshfrom_cell_list or _meshfrom_hdf5
+        - _vertexIndices and _checkVertexIndices
+        - _loadMeshCache and _saveMeshCache
+        - _localCells and _stratumCones
         - _meshStructure
         - _readErosionDeposition
         - _xyz2lonlat
@@ -270,7 +456,9 @@ class UnstMesh(object):
 
         .. note::
 
-            It is worth mentionning that partitioning and field distribution from global to local PETSc DMPlex takes a lot of time for large mesh and there might be some quicker way in PETSc to perform this step that I am unaware of...
+            It is worth mentionning that partitioning and field distribution from global to local PETSc DMPlex takes a lot of time for large mesh. When the ``parmesh`` option is set, the DMPlex is loaded in parallel (`_meshfrom_hdf5`) and only repartitioned afterwards, so that no processor holds the entire mesh topology.
+
+            When the ``meshcache`` option is set, the local mesh definition obtained after the DMPlex distribution (cells, boundaries and finite volume discretisation) is stored on disk and reloaded by subsequent runs using the same mesh, number of processors and overlap.
 
         """
 
@@ -280,13 +468,6 @@ class UnstMesh(object):
         self.mCoords = loadData[self.infoCoords]
         self.mpoints = len(self.mCoords)
         gZ = loadData[self.infoElev]
-        mCells = loadData[self.infoCells].astype(int)
-
-        # Get global mesh vertex neighbors
-        if MPIrank == 0:
-            globalngbhs(self.mpoints, mCells)
-        mCells = None
-        self.vtkMesh = None
         self.flatModel = False
         if MPIrank == 0 and self.verbose:
             print(
@@ -296,7 +477,11 @@ class UnstMesh(object):
 
         # Create DMPlex
         t0 = process_time()
-        self._meshfrom_cell_list(2, loadData["c"], self.mCoords)
+        self.plexFile = None
+        if self.parMesh and MPIsize > 1:
+            self._meshfrom_hdf5(loadData)
+        else:
+            self._meshfrom_cell_list(2, loadData["c"], self.mCoords)
         del loadData
         gc.collect()
         if MPIrank == 0 and self.verbose:
@@ -309,7 +494,10 @@ class UnstMesh(object):
         origSect.setFieldName(0, "points")
         origSect.setUp()
         self.dm.setDefaultSection(origSect)
-        origVec = self.dm.createGlobalVector()
+
+        # Store the input mesh index of each vertex
+        origLoc = self.dm.createLocalVector()
+        origLoc.setArray(self._vertexIndices())
         if MPIrank == 0 and self.verbose:
             print(
                 "Define one DoF on the nodes (%0.02f seconds)" % (process_time() - t0),
@@ -323,13 +511,17 @@ class UnstMesh(object):
             partitioner.setType(partitioner.Type.PARMETIS)
             partitioner.setFromOptions()
             sf = self.dm.distribute(overlap=self.overlap)
-            newSect, newVec = self.dm.distributeField(sf, origSect, origVec)
+            newSect, newVec = self.dm.distributeField(sf, origSect, origLoc)
             self.dm.setDefaultSection(newSect)
+            # Input mesh indices are migrated with the distribution star forest
+            self.locIDs = np.rint(newVec.getArray()).astype(int)
             newSect.destroy()
             newVec.destroy()
             sf.destroy()
+        else:
+            self.locIDs = np.rint(origLoc.getArray()).astype(int)
         MPIcomm.Barrier()
-        origVec.destroy()
+        origLoc.destroy()
         origSect.destroy()
         if MPIrank == 0 and self.verbose:
             print(
@@ -343,40 +535,29 @@ class UnstMesh(object):
         self.gpoints = self.gcoords.shape[0]
         self.lpoints = self.lcoords.shape[0]
 
-        cStart, cEnd = self.dm.getHeightStratum(0)
-        self.lcells = np.zeros((cEnd - cStart, 3), dtype=petsc4py.PETSc.IntType)
-        point_closure = None
-        for c in range(cStart, cEnd):
-            point_closure = self.dm.getTransitiveClosure(c)[0]
-            self.lcells[c, :] = point_closure[-3:] - cEnd
-        if point_closure is not None:
-            del point_closure
-        gc.collect()
-        if MPIrank == 0 and self.verbose:
-            print(
-                "Defining local DMPlex (%0.02f seconds)" % (process_time() - t0),
-                flush=True,
-            )
+        self._checkVertexIndices()
 
-        # Build local VTK mesh
-        if self.clinSlp > 0.0:
-            t0 = process_time()
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore")
-                self._generateVTKmesh(self.lcoords, self.lcells)
-            if MPIrank == 0 and self.verbose:
+        # Reload the local mesh definition from a previous run if any
+        cached = False
+        if self.meshCache is not None:
+            self.meshCacheFile = self._meshCacheFile()
+            cached = self._loadMeshCache()
+            if MPIrank == 0 and self.verbose and cached:
                 print(
-                    "Generate VTK mesh (%0.02f seconds)" % (process_time() - t0),
+                    "Load mesh cache (%0.02f seconds)" % (process_time() - t0),
                     flush=True,
                 )
 
-        # From mesh values to local and global ones...
-        t0 = process_time()
-        tree = spatial.cKDTree(self.mCoords, leafsize=10)
-        distances, self.locIDs = tree.query(self.lcoords, k=1)
-        distances, self.glbIDs = tree.query(self.gcoords, k=1)
+        if not cached:
+            self._localCells()
+            if MPIrank == 0 and self.verbose:
+                print(
+                    "Defining local DMPlex (%0.02f seconds)" % (process_time() - t0),
+                    flush=True,
+                )
 
         # Local/Global mapping
+        t0 = process_time()
         self.lgmap_row = self.dm.getLGMap()
         l2g = self.lgmap_row.indices.copy()
         offproc = l2g < 0
@@ -393,11 +574,15 @@ class UnstMesh(object):
         self.glIDs = np.where(self.inIDs == 1)[0]
         # ghostIDs are the shadow nodes indices on each partition
         self.ghostIDs = np.where(self.inIDs == 0)[0]
+        # Input mesh indices of the local and global vertices
+        self.glbIDs = self.locIDs[self.glIDs]
 
         # Local mesh boundary points in 2D model
-        localBound = self._get_boundary()
-        idLocal = np.where(vIS.indices >= 0)[0]
-        self.idBorders = np.where(np.isin(idLocal, localBound))[0]
+        if not cached:
+            localBound = self._get_boundary()
+            idLocal = np.where(vIS.indices >= 0)[0]
+            self.idBorders = np.where(np.isin(idLocal, localBound))[0]
+            del idLocal, localBound
         nib = np.zeros(1, dtype=np.int64)
         nib[0] = len(self.idBorders)
         MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, nib, op=MPI.MAX)
@@ -416,7 +601,6 @@ class UnstMesh(object):
             self.eastPts = np.where(self.lcoords[:, 0] == xmax)[0]
             self.westPts = np.where(self.lcoords[:, 0] == xmin)[0]
 
-        del idLocal
         vIS.destroy()
 
         # Local/Global vectors
@@ -433,15 +617,27 @@ class UnstMesh(object):
                 flush=True,
             )
 
-        # Create mesh structure
-        self._meshStructure()
-
-        # Get local mesh borders not included in the shadow regions for parallel pit filling
-        masknodes = ~np.isin(self.lcells, self.ghostIDs)
-        tmp2 = np.sum(masknodes.astype(int), axis=1)
-        out = np.where(np.logical_and(tmp2 > 0, tmp2 < 3))[0]
-        ptscells = self.lcells[out, :].flatten()
-        self.idLBounds = np.setdiff1d(ptscells, self.ghostIDs)
+        if not cached:
+            # Create mesh structure
+            self._meshStructure()
+
+            # Get local mesh borders not included in the shadow regions for parallel pit filling
+            masknodes = ~np.isin(self.lcells, self.ghostIDs)
+            tmp2 = np.sum(masknodes.astype(int), axis=1)
+            out = np.where(np.logical_and(tmp2 > 0, tmp2 < 3))[0]
+            ptscells = self.lcells[out, :].flatten()
+            self.idLBounds = np.setdiff1d(ptscells, self.ghostIDs)
+            del masknodes, tmp2, out, ptscells
+
+            # Store the local mesh definition for subsequent runs
+            if self.meshCache is not None:
+                t0 = process_time()
+                self._saveMeshCache()
+                if MPIrank == 0 and self.verbose:
+                    print(
+                        "Store mesh cache (%0.02f seconds)" % (process_time() - t0),
+                        flush=True,
+                    )
 
         # Define cumulative erosion deposition arrays
         self._readErosionDeposition()
@@ -462,8 +658,7 @@ class UnstMesh(object):
         self.teNb = -1
         self.sedfactNb = -1
 
-        del tree, distances, tmp2
-        del l2g, offproc, gZ, out, ptscells
+        del l2g, offproc, gZ
         gc.collect()
 
         # Map longitude/latitude coordinates
@@ -478,12 +673,15 @@ class UnstMesh(object):
     def _set_DMPlex_boundary_points(self, label):
         """
         In case of a flat mesh (non global), this function finds the points that join the edges that have been marked as "boundary" faces in the DAG then sets them as boundaries.
+
+        .. note::
+
+            The vertices of the boundary edges are extracted at once from the DMPlex cone arrays and added to the label with a single index set.
         """
 
         self.dm.createLabel(label)
         self.dm.markBoundaryFaces(label)
 
-        # pStart, pEnd = self.dm.getDepthStratum(0)  # points
         eStart, eEnd = self.dm.getDepthStratum(1)  # edges
         edgeIS = self.dm.getStratumIS(label, 1)
 
@@ -491,13 +689,18 @@ class UnstMesh(object):
             edge_mask = np.logical_and(edgeIS.indices >= eStart, edgeIS.indices < eEnd)
             boundary_edges = edgeIS.indices[edge_mask]
 
-            # Query the DAG  (directed acyclic graph) for points that join an edge
-            for edge in boundary_edges:
-                vertices = self.dm.getCone(edge)
+            # Query the DAG (directed acyclic graph) for points that join an edge
+            if len(boundary_edges) > 0:
+                edgeVertices = self._stratumCones(eStart, eEnd, 2)[0]
+                vertices = np.unique(edgeVertices[boundary_edges - eStart])
                 # mark the boundary points
-                for vertex in vertices:
-                    self.dm.setLabelValue(label, vertex, 1)
-            del vertices
+                vertexIS = petsc4py.PETSc.IS().createGeneral(
+                    vertices.astype(petsc4py.PETSc.IntType),
+                    comm=petsc4py.PETSc.COMM_SELF,
+                )
+                self.dm.getLabel(label).insertIS(vertexIS, 1)
+                vertexIS.destroy()
+                del edgeVertices, vertices
 
         edgeIS.destroy()
 
@@ -743,6 +946,9 @@ class UnstMesh(object):
         if self.iceOn:
             self.iceFAG.destroy()
             self.iceFAL.destroy()
+        if self.topoFlow:
+            self.topoL.destroy()
+            self.topoG.destroy()
 
         self.iMat.destroy()
         self.lgmap_col.destroy()
@@ -750,6 +956,8 @@ class UnstMesh(object):
         self.dm.destroy()
         self.zMat.destroy()
         self.mat.destroy()
+        if self.smthMat is not None:
+            self.smthMat.destroy()
 
         del self.lcoords, self.lcells, self.inIDs
 
@@ -11,7 +11,6 @@ if "READTHEDOCS" not in os.environ:
     from .sed import STRAMesh as _STRAMesh
     from .tools import ReadYaml as _ReadYaml
     from .mesher import UnstMesh as _UnstMesh
-    from .mesher import VoroBuild as _VoroBuild
     from .tools import GridProcess as _GridProcess
     from .mesher import Tectonics as _Tectonics
     from .tools import WriteMesh as _WriteMesh
@@ -22,10 +21,6 @@ else:
         def __init__(self, filename):
             print("Fake print statement for readthedocs", filename)
 
-    class _VoroBuild(object):
-        def __init__(self):
-            pass
-
     class _UnstMesh(object):
         def __init__(self):
             pass
@@ -69,7 +64,6 @@ class Model(
     _ReadYaml,
     _WriteMesh,
     _UnstMesh,
-    _VoroBuild,
     _GridProcess,
     _Tectonics,
     _FAMesh,
@@ -108,9 +102,6 @@ class Model(
         # Stratigraphy initialisation
         _STRAMesh.__init__(self)
 
-        # Define voronoi mesh
-        _VoroBuild.__init__(self)
-
         # Define unstructured mesh
         _UnstMesh.__init__(self)
 
@@ -176,6 +167,8 @@ class Model(
             _Tectonics.updatePaleoZ(self)
             _WriteMesh.visModel(self)
             if self.tNow == self.tEnd:
+                # Report solvers setup and solve times
+                _FAMesh.solverSummary(self)
                 return
 
             # Create new stratal layer
@@ -219,6 +212,9 @@ class Model(
             # Advance time
             self.tNow += self.dt
 
+            # Report cached computations for the step
+            _FAMesh.cacheSummary(self)
+
             if MPIrank == 0:
                 print(
                     "--- Computational Step (%0.02f seconds) | Time Step: %d years"
@@ -235,6 +231,7 @@ class Model(
         Safely quit model.
         """
 
+        _FAMesh._destroySolvers(self)
         _UnstMesh.destroy_DMPlex(self)
 
         return
@@ -1,15 +1,13 @@
 import os
 import gc
 import sys
-import vtk
 import warnings
 import petsc4py
 import numpy as np
-from scipy import spatial
+import numpy_indexed as npi
 
 from mpi4py import MPI
 from time import process_time
-from vtk.util import numpy_support  # type: ignore
 
 if "READTHEDOCS" not in os.environ:
     from gospl._fortran import mfdreceivers
@@ -18,7 +16,9 @@ if "READTHEDOCS" not in os.environ:
     from gospl._fortran import mfdrcvrs
     from gospl._fortran import jacobiancoeff
     from gospl._fortran import fctcoeff
-    from gospl._fortran import epsfill
+    from gospl._fortran import coastdist
+    from gospl._fortran import distocean
+    from gospl._fortran import sethillslopecoeff
 
 petsc4py.init(sys.argv)
 MPIrank = petsc4py.PETSc.COMM_WORLD.Get_rank()
@@ -42,99 +42,408 @@ class SEAMesh(object):
         """
 
         self.coastDist = None
+        self.coastState = None
 
         self.dlim = False
         self.Dlimit = 5.
         self.dexp = 0.05
         self.minDiff = 1.e-4
-        self.mat = self.dm.createMatrix()
-        self.mat.setOption(self.mat.Option.NEW_NONZERO_LOCATIONS, True)
 
         self.zMat = self._matrix_build_diag(np.zeros(self.lpoints))
         self.dh = self.hGlobal.duplicate()
         self.h = self.hGlobal.duplicate()
         self.hl = self.hLocal.duplicate()
+        self.hw = self.hGlobal.duplicate()
+        self.jacCSR = None
+        self.subVec = None
+        self.marineRings = 5
+        self.marineKey = None
+        self.smthKey = None
+        self.smthMat = None
+        self.smthKSP = None
 
         return
 
-    def _globalCoastsTree(self, coastXYZ, k_neighbors=1):
+    def _coastSeeds(self, data):
         """
-        This function takes all local coastline points and computes locally the distance of all marine points to the coastline.
+        Finds the coastline points along the mesh edges connecting marine and land nodes. For each marine node bordering land, the closest of these points (linearly interpolated at sea level along the edge) is used as a seed for the distance computation.
 
-        :arg coastXYZ: local coastline coordinates
-        :arg k_neighbors: number of nodes to use when querying the kd-tree
-        """
-
-        label_offset = np.zeros(MPIsize + 1, dtype=int)
-        label_offset[MPIrank + 1] = len(coastXYZ)
-        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, label_offset, op=MPI.MAX)
-        offset = np.cumsum(label_offset)[:-1]
-        totpts = np.sum(label_offset)
+        :arg data: local elevation numpy array
 
-        coastpts = np.zeros(((totpts) * 3,), dtype=np.float64)
-        MPI.COMM_WORLD.Allgatherv(
-            [coastXYZ, MPI.DOUBLE],
-            [coastpts, label_offset[1:] * 3, offset * 3, MPI.DOUBLE],
-        )
+        :return: seedD, seedX (distance to the closest coastline point for seed nodes, infinite otherwise, and the point coordinates)
+        """
 
-        # Get coastlines points globally
-        tree = spatial.cKDTree(coastpts.reshape((totpts, 3)), leafsize=10)
-        self.coastDist[self.seaID], _ = tree.query(
-            self.lcoords[self.seaID, :], k=k_neighbors
-        )
+        ngbs = self.FVmesh_ngbID
+        hn = np.where(ngbs >= 0, data[ngbs], -np.inf)
+        coast = (data < self.sealevel)[:, None] & (hn >= self.sealevel)
+        ids = np.where(coast.any(axis=1))[0]
+        coast = coast[ids]
+
+        # Coastline points along marine to land edges
+        hi = data[ids, None]
+        frac = np.where(coast, (self.sealevel - hi) / np.where(coast, hn[ids] - hi, 1.0), 0.0)
+        xi = self.lcoords[ids, None, :]
+        pts = xi + frac[:, :, None] * (self.lcoords[ngbs[ids]] - xi)
+        dist = np.where(coast, np.linalg.norm(pts - xi, axis=2), np.inf)
+        pos = np.argmin(dist, axis=1)
+        seedD = np.full(self.lpoints, np.inf, dtype=np.float64)
+        seedX = np.zeros((self.lpoints, 3), dtype=np.float64)
+        seedD[ids] = dist[np.arange(len(ids)), pos]
+        seedX[ids, :] = pts[np.arange(len(ids)), pos, :]
 
         if self.memclear:
-            del tree, coastpts, offset, totpts, label_offset
+            del ngbs, hn, coast, ids, hi, frac, xi, pts, dist, pos
             gc.collect()
 
-        return
+        return self._exchangeCoast(seedD, seedX)
+
+    def _exchangeCoast(self, dist, sxyz):
+        """
+        Transfers the distances and closest coastline points coordinates of the partitions owned nodes to their ghosts.
+
+        :arg dist: local distance array
+        :arg sxyz: local closest coastline points coordinates
+
+        :return: dist, sxyz (updated arrays)
+        """
+
+        dist = dist.copy()
+        sxyz = sxyz.copy()
+        vals = np.where(np.isinf(dist), -1.0, dist)
+        self.tmpL.setArray(vals)
+        self.dm.localToGlobal(self.tmpL, self.tmp)
+        self.dm.globalToLocal(self.tmp, self.tmpL)
+        vals = self.tmpL.getArray()
+        dist[self.ghostIDs] = vals[self.ghostIDs]
+        dist[dist < 0] = np.inf
+        for k in range(3):
+            self.tmpL.setArray(sxyz[:, k])
+            self.dm.localToGlobal(self.tmpL, self.tmp)
+            self.dm.globalToLocal(self.tmp, self.tmpL)
+            sxyz[self.ghostIDs, k] = self.tmpL.getArray()[self.ghostIDs]
 
-    def _distanceCoasts(self, data, k_neighbors=1):
+        return dist, sxyz
+
+    def _coastSweep(self, data, dist, sxyz, seed, maxd):
+        """
+        Propagates the closest coastline points over the marine nodes with the fortran `coastdist` multi-source Dijkstra sweep. Each partition performs the sweep locally and only the values of the ghost nodes are exchanged between sweeps until the solution does not change anymore.
+
+        :arg data: local elevation numpy array
+        :arg dist: initial local distance array
+        :arg sxyz: initial closest coastline points coordinates
+        :arg seed: local nodes from which the sweep starts
+        :arg maxd: maximum distance considered
+
+        :return: dist, sxyz (distance to the coastline and closest coastline points coordinates)
+        """
+
+        change = np.ones(1, dtype=int)
+        while change[0] > 0:
+            dist, sxyz = coastdist(
+                data, self.sealevel, dist, sxyz, seed.astype(np.int32), maxd
+            )
+            ndist, sxyz = self._exchangeCoast(dist, sxyz)
+
+            # Restart from the ghost nodes with a shorter distance
+            seed = ndist < dist
+            change[0] = np.count_nonzero(seed)
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, change, op=MPI.SUM)
+            dist = ndist
+
+        return dist, sxyz
+
+    def _distanceCoasts(self, data):
         """
         This function computes for every marine vertices the distance to the closest coastline. It calls the private functions:
 
-        - _globalCoastsTree
+        - _coastSeeds
+        - _coastSweep
 
         .. important::
 
-            The calculation takes advantage of the `vtkContourFilter` function from VTK library which is performed on the **global** VTK mesh. Once the coastlines have been extracted, the distances are obtained by querying a kd-tree (initialised with the coastal nodes) for marine vertices contained within each partition.
+            The coastline points are obtained along the mesh edges crossing the sea level and the distances are computed directly on the mesh graph with a multi-source Dijkstra sweep propagating the closest coastline point of each marine node. Only the values on the partitions borders are exchanged and the sweep is limited to the distance above which the coastal distance does not influence marine deposition (`offshore` and shelf slope).
+
+        When only a few coastline points have changed since the previous call, the distances are updated incrementally: marine nodes attached to coastline points which have moved are reset and the sweep restarts from the changed coastline points and from the nodes surrounding the reset region.
 
         :arg data: local elevation numpy array
-        :arg k_neighbors: number of nodes to use when querying the kd-tree
         """
 
         t0 = process_time()
 
-        self.coastDist = np.zeros(self.lpoints)
-        pointData = self.vtkMesh.GetPointData()
-        array = numpy_support.numpy_to_vtk(data, deep=1)
-        array.SetName("elev")
-        pointData.AddArray(array)
-        self.vtkMesh.SetFieldData(pointData)
-
-        cf = vtk.vtkContourFilter()
-        cf.SetInputData(self.vtkMesh)
-        cf.SetValue(0, self.sealevel)
-        cf.SetInputArrayToProcess(0, 0, 0, 0, "elev")
-        cf.GenerateTrianglesOff()
-        cf.Update()
-        if cf.GetOutput().GetPoints() is not None:
-            coastXYZ = numpy_support.vtk_to_numpy(cf.GetOutput().GetPoints().GetData())
+        # Maximum distance influencing the marine deposition
+        marine = data < self.sealevel
+        maxd = np.zeros(1, dtype=np.float64)
+        if marine.any():
+            maxd[0] = (self.sealevel - data[marine]).max() / self.clinSlp
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, maxd, op=MPI.MAX)
+        maxd = max(maxd[0], self.offshore)
+
+        seedD, seedX = self._coastSeeds(data)
+        state = self.coastState
+        incremental = (
+            state is not None
+            and state["maxd"] >= maxd
+            and state["sealevel"] == self.sealevel
+        )
+        if incremental:
+            maxd = state["maxd"]
+
+            # Coastline points which have changed
+            changed = (seedD != state["seedD"]) | (marine != state["marine"])
+            changed |= (seedX != state["seedX"]).any(axis=1)
+            oldX = state["seedX"][changed & np.isfinite(state["seedD"])]
+            nchanged = np.zeros(2, dtype=int)
+            nchanged[0] = np.count_nonzero(changed[self.inIDs == 1])
+            nchanged[1] = np.count_nonzero(marine[self.inIDs == 1])
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, nchanged, op=MPI.SUM)
+            incremental = nchanged[0] <= 0.1 * nchanged[1]
+
+        if incremental:
+            # Reset nodes attached to removed coastline points
+            oldX = np.vstack(MPI.COMM_WORLD.allgather(oldX))
+            dist = state["dist"].copy()
+            sxyz = state["sxyz"].copy()
+            reset = marine & ~state["marine"]
+            if len(oldX) > 0:
+                reset |= npi.in_(sxyz, oldX) & np.isfinite(dist)
+            dist[reset] = np.inf
+            dist[~marine] = np.inf
+
+            # Restart from new coastline points and reset region borders
+            ngbs = self.FVmesh_ngbID
+            front = np.zeros(self.lpoints, dtype=bool)
+            front[ngbs[(ngbs >= 0) & reset[:, None]]] = True
+            seed = (front & ~reset & marine & np.isfinite(dist)) | (
+                np.isfinite(seedD) & (seedD < dist)
+            )
+            upd = np.isfinite(seedD) & (seedD < dist)
+            dist[upd] = seedD[upd]
+            sxyz[upd] = seedX[upd]
         else:
-            coastXYZ = np.zeros((0, 3), dtype=np.float64)
+            dist = seedD.copy()
+            sxyz = seedX.copy()
+            seed = np.isfinite(seedD)
+
+        dist, sxyz = self._coastSweep(data, dist, sxyz, seed, maxd)
+        self.coastState = {
+            "maxd": maxd,
+            "sealevel": self.sealevel,
+            "marine": marine,
+            "seedD": seedD,
+            "seedX": seedX,
+            "dist": dist.copy(),
+            "sxyz": sxyz.copy(),
+        }
+
+        # Marine nodes beyond the maximum distance are not influenced by the coast
+        self.coastDist = np.zeros(self.lpoints)
+        dist[np.isinf(dist)] = maxd + 1.0
+        self.coastDist[self.seaID] = np.where(marine, dist, 0.0)[self.seaID]
 
-        # Get coastlines points globally
-        self._globalCoastsTree(coastXYZ, k_neighbors)
+        if MPIrank == 0 and self.verbose:
+            print(
+                "Construct Distance to Coast (%0.02f seconds)" % (process_time() - t0),
+                flush=True,
+            )
+
+        return
+
+    def _smoothOperator(self):
+        """
+        Returns the operator used to smooth the surface on which marine flow directions are computed.
+
+        The operator corresponds to an implicit diffusion step with hard-coded coefficients (1e5 on land and 5e6 in the marine environment). When the smoothing is truncated (`smthIt` > 0), the operator is restricted to the land and the `offshore` band, nodes located further offshore being kept fixed.
+
+        .. note::
+
+            The operator is assembled once and is only rebuilt when the time step, the marine nodes or the offshore band change.
+
+        :return: PETSc matrix
+        """
+
+        band = self.coastDist <= self.offshore
+        if self.smthIt <= 0:
+            band[:] = True
+        sea = np.zeros(self.lpoints, dtype=bool)
+        sea[self.seaID] = True
+        same = np.zeros(1, dtype=np.int64)
+        if self.smthKey is not None:
+            same[0] = int(
+                self.smthKey[0] == self.dt
+                and np.array_equal(self.smthKey[1], sea)
+                and np.array_equal(self.smthKey[2], band)
+            )
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, same, op=MPI.MIN)
+        if same[0] == 1:
+            return self.smthMat
+
+        # Hard-coded coefficients here, used to generate a smooth surface
+        # for computing marine flow directions...
+        Cd = np.full(self.lpoints, 1.e5, dtype=np.float64)
+        Cd[self.seaID] = 5.e6
+        diffCoeffs = sethillslopecoeff(self.lpoints, Cd * self.dt)
+        diffCoeffs[~band, 1:] = 0.0
+        diffCoeffs[~band, 0] = 1.0
+        if self.smthMat is not None:
+            self.smthMat.destroy()
+        self.smthMat = self._matrix_build_csr(
+            self.FVmesh_ngbID[:, : self.maxnb],
+            diffCoeffs[:, 1 : self.maxnb + 1],
+            diag=diffCoeffs[:, 0],
+        )
+
+        # Gershgorin bounds of the Jacobi preconditioned operator
+        diag = diffCoeffs[self.glIDs, 0]
+        ratio = np.zeros(1, dtype=np.float64)
+        if (diag > 0).any():
+            ratio[0] = np.max(1.0 - 1.0 / diag[diag > 0])
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, ratio, op=MPI.MAX)
+        self.smthEig = (max(1.0 - ratio[0], 1.0e-12), 1.0 + ratio[0])
+        self.smthKey = [self.dt, sea, band]
+        self.smthKSP = None
 
         if self.memclear:
-            del array, pointData, cf, coastXYZ
+            del Cd, diffCoeffs, diag
             gc.collect()
 
+        return self.smthMat
+
+    def _smoothSolver(self):
+        """
+        Returns the persistent solver performing the truncated smoothing (`smooth` role). It uses Chebyshev iterations preconditioned by point Jacobi, the eigenvalue bounds of the preconditioned operator being given by the Gershgorin circles of its rows.
+
+        .. note::
+
+            The solver options can be changed from the command line with the ``smooth_`` prefix.
+
+        :return: ksp PETSc KSP solver
+        """
+
+        matrix = self._smoothOperator()
+        if self.smthKSP is not None:
+            return self.smthKSP
+
+        opts = petsc4py.PETSc.Options("smooth_")
+        opts["ksp_chebyshev_eigenvalues"] = "%0.12e,%0.12e" % self.smthEig
+        if self.smthTol <= 0.0:
+            opts["ksp_norm_type"] = "none"
+        self.smthKSP = self._getKSP(
+            "smooth",
+            matrix,
+            "chebyshev",
+            "jacobi",
+            prefix="smooth_",
+            rtol=self.smthTol,
+            max_it=max(self.smthIt, 1),
+        )
+
+        return self.smthKSP
+
+    def _smoothOcean(self):
+        """
+        Smooths the elevation used to define marine flow directions by solving the diffusion system defined in `_smoothOperator`.
+
+        .. note::
+
+            When `smthIt` is set in the input file, the solution is replaced by at most `smthIt` Chebyshev iterations performed from the current elevation, the iterations stopping earlier when the relative residual is below `smthTol` (see `_smoothSolver`). This is faster but the resulting flow directions differ from the ones of the complete solution.
+
+        :return: smoothed local elevation numpy array
+        """
+
+        t0 = process_time()
+        self.hGlobal.copy(result=self.tmp)
+        full = self.smthIt <= 0
+        its = 0
+        if not full:
+            ksp = self._smoothSolver()
+            ksp.setInitialGuessNonzero(True)
+            ts0 = process_time()
+            ksp.solve(self.hGlobal, self.tmp)
+            self._solverTime("smooth", ts0)
+            its = ksp.getIterationNumber()
+            r = ksp.getConvergedReason()
+            full = r < 0 and r != petsc4py.PETSc.KSP.ConvergedReason.DIVERGED_ITS
+        if full:
+            # Complete solution of the diffusion system
+            self._solve_KSP(
+                True, self._smoothOperator(), self.hGlobal, self.tmp, role="smooth-full"
+            )
+        self.dm.globalToLocal(self.tmp, self.tmpL)
+
         if MPIrank == 0 and self.verbose:
-            print(
-                "Construct Distance to Coast (%0.02f seconds)" % (process_time() - t0),
-                flush=True,
+            if full:
+                print(
+                    "Smooth marine surface (%0.02f seconds)" % (process_time() - t0),
+                    flush=True,
+                )
+            else:
+                print(
+                    "Smooth marine surface in %d iterations (%0.02f seconds)"
+                    % (its, process_time() - t0),
+                    flush=True,
+                )
+
+        return self.tmpL.getArray().copy()
+
+    def smoothBenchmark(self, sweeps=(5, 10, 20, 50, 100)):
+        """
+        Benchmarks the smoothing of the surface used for marine flow directions. For each number of Chebyshev iterations, the cost of the smoothing is compared to the complete solution of the diffusion system and the quality of the resulting flow directions is measured by the proportion of marine nodes of the `offshore` band having the same steepest receiver as with the complete solution.
+
+        .. note::
+
+            This function requires the distance to the coastline and is meant to be called after a time step including marine deposition. The report is printed on the master processor.
+
+        :arg sweeps: numbers of Chebyshev iterations to evaluate
+        """
+
+        if self.coastDist is None or self.flatModel:
+            return
+
+        ksp = self._smoothSolver()
+        band = (self.coastDist <= self.offshore)[self.glIDs]
+        band &= np.isin(self.glIDs, self.seaID)
+        nband = MPI.COMM_WORLD.allreduce(np.count_nonzero(band))
+
+        # Reference solution
+        ref = self.hGlobal.duplicate()
+        self.hGlobal.copy(result=ref)
+        t0 = process_time()
+        self._solve_KSP(True, self._smoothOperator(), self.hGlobal, ref, role="smooth-full")
+        tref = MPI.COMM_WORLD.allreduce(process_time() - t0, op=MPI.MAX)
+        self.dm.globalToLocal(ref, self.tmpL)
+        rcvRef = mfdrcvrs(12, self.flowExp, self.tmpL.getArray().copy(), -1.0e6)[0]
+        rcvRef = rcvRef[self.glIDs, 0][band]
+        if MPIrank == 0:
+            print("Marine smoothing benchmark on %d nodes" % nband, flush=True)
+            print("  full solution: %0.04f seconds" % tref, flush=True)
+
+        ksp.setNormType(petsc4py.PETSc.KSP.NormType.NONE)
+        for nit in sweeps:
+            ksp.setTolerances(max_it=nit)
+            self.hGlobal.copy(result=self.tmp)
+            t0 = process_time()
+            ksp.solve(self.hGlobal, self.tmp)
+            tsmth = MPI.COMM_WORLD.allreduce(process_time() - t0, op=MPI.MAX)
+            self.tmp.axpy(-1.0, ref)
+            err = self.tmp.norm(petsc4py.PETSc.NormType.INFINITY)
+            self.tmp.axpy(1.0, ref)
+            self.dm.globalToLocal(self.tmp, self.tmpL)
+            rcv = mfdrcvrs(12, self.flowExp, self.tmpL.getArray().copy(), -1.0e6)[0]
+            match = MPI.COMM_WORLD.allreduce(
+                np.count_nonzero(rcv[self.glIDs, 0][band] == rcvRef)
             )
+            if MPIrank == 0:
+                print(
+                    "  %4d iterations: %0.04f seconds | max elevation difference %0.03f m | same receivers %0.02f %%"
+                    % (nit, tsmth, err, 100.0 * match / max(nband, 1)),
+                    flush=True,
+                )
+
+        # Restore the solver settings
+        ksp.setTolerances(rtol=self.smthTol, max_it=max(self.smthIt, 1))
+        if self.smthTol > 0.0:
+            ksp.setNormType(petsc4py.PETSc.KSP.NormType.DEFAULT)
+        ref.destroy()
 
         return
 
@@ -146,29 +455,23 @@ class SEAMesh(object):
         - the distances to the receivers based on mesh resolution.
         - the associated weights calculated based on the number of receivers and proportional to the slope.
 
-        From these downstream directions, a local ocean downstream matrix is computed.
+        From these downstream directions, the routing order of the partition nodes (from the highest to the lowest filled elevation) is defined.
         """
 
         # Define multiple flow directions for filled + eps elevations
         hl = self.hLocal.getArray().copy()
         if not self.flatModel:
             # Only consider filleps in the first kms offshore
-            hsmth = self._hillSlope(smooth=2)
+            hsmth = self._smoothOcean()
             hsmth[self.coastDist > self.offshore] = -1.e6
         else:
             hsmth = hl.copy()
 
-        fillz = np.zeros(self.mpoints, dtype=np.float64) - 1.0e8
-        fillz[self.locIDs] = hsmth
-        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, fillz, op=MPI.MAX)
-        if MPIrank == 0:
-            minh = np.min(fillz) + 0.1
-            if not self.flatModel:
-                minh = min(minh, self.oFill)
-            fillz = epsfill(minh, fillz)
-        # Send elevation + eps globally
-        fillEPS = MPI.COMM_WORLD.bcast(fillz, root=0)
-        fillz = fillEPS[self.locIDs]
+        # Distributed filling with a minimal gradient over flat surfaces
+        minh = MPI.COMM_WORLD.allreduce(np.min(hsmth), op=MPI.MIN) + 0.1
+        if not self.flatModel:
+            minh = min(minh, self.oFill)
+        fillz = self._epsFill(hsmth, minh)
         if not self.flatModel:
             fillz[self.coastDist > self.offshore] = hl[self.coastDist > self.offshore]
         rcv, _, wght = mfdrcvrs(12, self.flowExp, fillz, -1.0e6)
@@ -178,49 +481,62 @@ class SEAMesh(object):
             rcv[self.idBorders, :] = np.tile(self.idBorders, (12, 1)).T
             wght[self.idBorders, :] = 0.0
 
-        # Define downstream matrix based on filled + dir elevations
-        self.dMat1 = self.zMat.copy()
+        # Downstream routing order over the partition nodes (borders are sinks)
+        route = self.inIDs == 1
+        route[self.idBorders] = False
+        order = np.argsort(fillz, kind="stable")[::-1]
+        self.oRcv = rcv
+        self.oWght = wght
+        self.oOrder = order[route[order]].astype(np.int32)
+
         if not self.flatModel and self.Gmar > 0.:
-            self.dMat2 = self.iMat.copy()
-        indptr = np.arange(0, self.lpoints + 1, dtype=petsc4py.PETSc.IntType)
-        nodes = indptr[:-1]
-
-        for k in range(0, 12):
-            # Flow direction matrix for a specific direction
-            tmpMat = self._matrix_build()
-            data = wght[:, k].copy()
-            data[rcv[:, k].astype(petsc4py.PETSc.IntType) == nodes] = 0.0
-            tmpMat.assemblyBegin()
-            tmpMat.setValuesLocalCSR(
-                indptr,
-                rcv[:, k].astype(petsc4py.PETSc.IntType),
-                data,
+            self.dMat2 = self._matrix_build_csr(
+                rcv, -wght, diag=np.ones(self.lpoints), transpose=True
             )
-            tmpMat.assemblyEnd()
-            # Add the weights from each direction
-            self.dMat1.axpy(1.0, tmpMat)
-            if not self.flatModel and self.Gmar > 0.:
-                self.dMat2.axpy(-1.0, tmpMat)
-            tmpMat.destroy()
 
         if self.memclear:
-            del data, indptr, nodes
-            del hl, fillz, fillEPS, rcv, wght
+            del hl, hsmth, fillz, route, order
             gc.collect()
 
-        # Store flow direction matrix
-        self.dMat1.transpose()
-        if not self.flatModel and self.Gmar > 0.:
-            self.dMat2.transpose()
-
         return
 
+    def _marineCoeffs(self, x, deriv=False):
+        """
+        Updates the elevation of the active marine nodes from the sub-problem solution and computes the nonlinear diffusion coefficients on the local mesh.
+
+        :arg x: PETSc.Vec: The current solution vector of the active sub-problem.
+        :arg deriv: boolean to also return the coefficients derivatives.
+
+        :return: hl, Cd, Cp (local elevation, diffusion coefficients and their derivatives)
+        """
+
+        with self.hw as hw, x as xa:
+            hw[self.subPos] = xa
+        self.dm.globalToLocal(self.hw, self.hl)
+
+        hl = self.hl.getArray().copy()
+        dh = hl - self.hLocal.getArray()
+        dh[dh < 0.1] = 0.0
+        if self.dlim:
+            Cd = self.minDiff + np.multiply(self.Cd, dh / (dh + self.Dlimit))
+        else:
+            Cd = self.minDiff + np.multiply(self.Cd, (1.0 - np.exp(-self.dexp * dh)))
+
+        Cp = None
+        if deriv:
+            if self.dlim:
+                Cp = np.multiply(self.Cd, self.Dlimit / (dh + self.Dlimit)**2)
+            else:
+                Cp = np.multiply(self.Cd, self.dexp * np.exp(-self.dexp * dh))
+
+        return hl, Cd, Cp
+
     def _evalFunction(self, ts, t, x, xdot, f):
         """
         The nonlinear system at each time step is solved iteratively using PETSc time stepping and SNES solution and is based on a Nonlinear Generalized Minimum Residual method (``NGMRES``) .
 
         Here we define the function for the nonlinear solve.
-        Evaluate the residual function on a DMPlex for an implicit time-stepping method.
+        Evaluate the residual function on the active marine nodes for an implicit time-stepping method.
 
         Parameters:
         -----------
@@ -231,26 +547,106 @@ class SEAMesh(object):
         f : PETSc.Vec: The residual vector to be filled.
         """
 
-        self.dm.globalToLocal(x, self.hl)
-        with self.hl as hl, self.hLocal as zb, xdot as hdot:
-            dh = hl - zb
-            dh[dh < 0.1] = 0.0
-            if self.dlim:
-                Cd = self.minDiff + np.multiply(self.Cd, dh / (dh + self.Dlimit))
-            else:
-                Cd = self.minDiff + np.multiply(self.Cd, (1.0 - np.exp(-self.dexp * dh)))
-            nlvec = fctcoeff(hl, Cd)
-            f.setArray(hdot + nlvec[self.glIDs])
+        hl, Cd, _ = self._marineCoeffs(x)
+        nlvec = fctcoeff(hl, Cd)
+
+        # Residual on the active nodes
+        with f as fa, xdot as hdot:
+            fa[:] = hdot + nlvec[self.subNodes]
+
+        return
+
+    def _jacobianPattern(self):
+        """
+        Defines the structure of the marine diffusion Jacobian on the local rows: the diagonal term first followed by the neighbours terms.
+
+        .. note::
+
+            The structure only depends on the mesh and is computed once. It stores the local column indices of each row and the mask of the valid entries in the coefficients returned by the fortran `jacobiancoeff` subroutine.
+        """
+
+        ngbs = self.FVmesh_ngbID
+        cols = np.hstack((np.arange(self.lpoints)[:, None], ngbs))
+        mask = np.hstack((np.ones((self.lpoints, 1), dtype=bool), ngbs >= 0))
+
+        self.jacCSR = (cols.astype(petsc4py.PETSc.IntType), mask)
 
         return
 
+    def _activeMarine(self, active):
+        """
+        Defines the active marine sub-problem used for the nonlinear diffusion: the owned active nodes ordering, the index of each local node in the sub-problem and the CSR structure of the sub-problem Jacobian.
+
+        .. note::
+
+            Only the active rows and columns are kept in the Jacobian. The remaining nodes are not unknowns of the sub-problem and keep their elevation during the solve.
+
+        :arg active: boolean array of local active nodes (consistent across partitions)
+
+        :return: sub-problem matrix
+        """
+
+        # Active owned nodes ordered as in the global vectors
+        self.subPos = np.where(active[self.glIDs])[0].astype(petsc4py.PETSc.IntType)
+        self.subNodes = self.glIDs[self.subPos]
+        nloc = len(self.subPos)
+        offset = MPI.COMM_WORLD.exscan(nloc)
+        if offset is None:
+            offset = 0
+        self.subSize = MPI.COMM_WORLD.allreduce(nloc, op=MPI.SUM)
+
+        # Sub-problem index of each local node (-1 for inactive nodes)
+        subIdx = -np.ones(self.tmp.getLocalSize(), dtype=np.float64)
+        subIdx[self.subPos] = offset + np.arange(nloc)
+        self.tmp.setArray(subIdx)
+        self.dm.globalToLocal(self.tmp, self.tmpL)
+        subIdx = self.tmpL.getArray().astype(petsc4py.PETSc.IntType)
+
+        # CSR structure of the active rows restricted to the active columns
+        if self.jacCSR is None:
+            self._jacobianPattern()
+        cols, mask = self.jacCSR
+        cols = cols[self.subNodes]
+        smask = mask[self.subNodes] & (subIdx[cols] >= 0)
+        rnnz = smask.sum(axis=1)
+        indptr = np.zeros(nloc + 1, dtype=petsc4py.PETSc.IntType)
+        indptr[1:] = np.cumsum(rnnz)
+        indices = cols[smask]
+        rows = np.repeat(np.arange(nloc), rnnz)
+        ondiag = self.inIDs[indices] == 1
+        prealloc = (
+            np.bincount(rows[ondiag], minlength=nloc).astype(petsc4py.PETSc.IntType),
+            np.bincount(rows[~ondiag], minlength=nloc).astype(petsc4py.PETSc.IntType),
+        )
+        self.subCSR = (indptr, indices, smask)
+
+        # Sub-problem matrix
+        rowmap = petsc4py.PETSc.LGMap().create(
+            (offset + np.arange(nloc)).astype(petsc4py.PETSc.IntType), comm=MPIcomm
+        )
+        colmap = petsc4py.PETSc.LGMap().create(subIdx, comm=MPIcomm)
+        matrix = petsc4py.PETSc.Mat().create(comm=MPIcomm)
+        matrix.setType("aij")
+        matrix.setSizes(((nloc, self.subSize), (nloc, self.subSize)))
+        matrix.setLGMap(rowmap, colmap)
+        matrix.setFromOptions()
+        matrix.setPreallocationNNZ(prealloc)
+        rowmap.destroy()
+        colmap.destroy()
+
+        if self.memclear:
+            del subIdx, cols, smask, rnnz, rows, ondiag, prealloc
+            gc.collect()
+
+        return matrix
+
     def _evalJacobian(self, ts, t, x, xdot, a, A, B):
         """
         The nonlinear system at each time step is solved iteratively using PETSc time stepping and SNES solution and is based on a Nonlinear Generalized Minimum Residual method (``NGMRES``) .
 
         Here we define the Jacobian for the nonlinear solve.
 
-        Evaluate the Jacobian matrix J and the preconditioner matrix P on a DMPlex.
+        Evaluate the Jacobian matrix J and the preconditioner matrix P on the active marine nodes.
 
         Parameters:
         -----------
@@ -264,41 +660,47 @@ class SEAMesh(object):
 
         """
 
-        self.dm.globalToLocal(x, self.hl)
-
-        with self.hl as hl, self.hLocal as zb:
-            dh = hl - zb
-            dh[dh < 0.1] = 0.0
-            if self.dlim:
-                Cd = self.minDiff + np.multiply(self.Cd, dh / (dh + self.Dlimit))
-            else:
-                Cd = self.minDiff + np.multiply(self.Cd, (1.0 - np.exp(-self.dexp * dh)))
-
-            # Coefficient derivatives
-            if self.dlim:
-                Cp = np.multiply(self.Cd, self.Dlimit / (dh + self.Dlimit)**2)
-            else:
-                Cp = np.multiply(self.Cd, self.dexp * np.exp(-self.dexp * dh))
-            nlC = jacobiancoeff(hl, Cd, Cp)
+        hl, Cd, Cp = self._marineCoeffs(x, deriv=True)
+        nlC = jacobiancoeff(hl, Cd, Cp)
 
-            for row in range(self.lpoints):
-                B.setValuesLocal(row, row, a + nlC[row, 0])
-                cols = self.FVmesh_ngbID[row, :]
-                B.setValuesLocal(row, cols, nlC[row, 1:])
-            B.assemble()
+        # Fill the Jacobian in a single CSR insertion
+        indptr, indices, smask = self.subCSR
+        nlC = nlC[self.subNodes, : smask.shape[1]]
+        nlC[:, 0] += a
+        B.setValuesLocalCSR(indptr, indices, nlC[smask])
+        B.assemble()
 
-            if A != B:
-                A.assemble()
+        if A != B:
+            A.assemble()
 
         return True
 
     def _evalSolution(self, t, x):
 
         assert t == 0.0, "only for t=0.0"
-        x.setArray(self.h.getArray())
+        x.setArray(self.h.getArray()[self.subPos])
 
         return
 
+    def _marineBuffer(self, active):
+        """
+        Extends the active marine nodes with the ring of their neighbours.
+
+        :arg active: boolean array of local active nodes
+
+        :return: extended boolean array of local active nodes (consistent across partitions)
+        """
+
+        ngbs = self.FVmesh_ngbID
+        ext = active.copy()
+        ext[ngbs[(ngbs >= 0) & active[:, None]]] = True
+        self.tmpL.setArray(ext.astype(np.float64))
+        self.tmp.set(0.0)
+        self.dm.localToGlobal(self.tmpL, self.tmp, addv=petsc4py.PETSc.InsertMode.ADD)
+        self.dm.globalToLocal(self.tmp, self.tmpL)
+
+        return self.tmpL.getArray() > 0
+
     def _diffuseOcean(self, dh):
         r"""
         For sediment reaching the marine realm, this function computes the related marine deposition diffusion. The approach is based on a nonlinear diffusion.
@@ -315,6 +717,11 @@ class SEAMesh(object):
 
             PETSc SNES and time stepping TS approaches are used to solve the nonlinear equation above over the considered time step.
 
+        The nonlinear equation is only solved on an active sub-problem made of the nodes receiving marine sediments and a buffer of neighbouring nodes. The buffer is extended by one ring and the solve repeated when the diffused sediments reach its outer ring (above 1 mm). If sediments still reach the outer ring after `marineRings` extensions, the equation is solved on the entire domain.
+
+        .. important::
+
+            On the active sub-problem, the inactive neighbours of the buffer act as fixed elevation boundaries and the minimum diffusion coefficient (`minDiff`) is not applied outside of the active nodes. These nodes are only left unchanged when no sediment reaches them, the complete domain being used otherwise.
 
         :arg dh: numpy array of incoming marine depositional thicknesses
 
@@ -323,9 +730,6 @@ class SEAMesh(object):
 
         t0 = process_time()
 
-        x = self.tmp1.duplicate()
-        f = self.tmp1.duplicate()
-
         # Get diffusion coefficients based on sediment type
         sedK = np.zeros(self.lpoints)
         sedK[self.seaID] = self.nlK
@@ -336,18 +740,132 @@ class SEAMesh(object):
         self.hl.axpy(1.0, self.hLocal)
         self.dm.localToGlobal(self.hl, self.h)
 
-        # Time stepping definition
+        # Active marine nodes and one-ring buffer
+        inner = dh > 0.0
+        active = self._marineBuffer(inner)
+        nActive = 0
+        ring = 0
+        full = False
+        while True:
+            self.h.copy(result=self.hw)
+            nActive = MPI.COMM_WORLD.allreduce(np.count_nonzero(active[self.glIDs]))
+            if nActive == 0:
+                break
+
+            # Time stepping definition on the active sub-problem
+            self._marineTS(active)
+            ts = self.solvers["marine-diffusion"]["solver"]
+            x = self.subVec.duplicate()
+            ts.setTime(0.0)
+            ts.setStepNumber(0)
+            ts.setTimeStep(self.dt / 1000.0)
+            ts.setMaxTime(self.dt)
+            ts.setMaxSteps(self.tsStep)
+            tstart = ts.getTime()
+            self._evalSolution(tstart, x)
+
+            # Solve nonlinear equation
+            ts0 = process_time()
+            ts.solve(x)
+            self._solverTime("marine-diffusion", ts0)
+            with self.hw as hw, x as xa:
+                hw[self.subPos] = xa
+            x.destroy()
+
+            # Check if sediments reached the outer ring of the buffer
+            if full:
+                break
+            self.dh.waxpy(-1.0, self.h, self.hw)
+            self.dm.globalToLocal(self.dh, self.tmpL)
+            outer = active & ~inner
+            reach = np.zeros(1, dtype=int)
+            reach[0] = (np.absolute(self.tmpL.getArray()[outer]) > 1.0e-3).any()
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, reach, op=MPI.MAX)
+            if reach[0] == 0:
+                break
+            ring += 1
+            if ring < self.marineRings:
+                inner = active.copy()
+                active = self._marineBuffer(active)
+            else:
+                # Solve the nonlinear diffusion on the entire domain
+                full = True
+                active = np.ones(self.lpoints, dtype=bool)
+                if MPIrank == 0 and self.verbose:
+                    print(
+                        "Marine sediments reach the outer buffer ring after %d extensions, solve on the entire domain"
+                        % ring,
+                        flush=True,
+                    )
+
+        if MPIrank == 0 and self.verbose:
+            print(
+                "Nonlinear diffusion solution (%0.02f seconds)" % (process_time() - t0),
+                flush=True,
+            )
+            if nActive > 0:
+                print(
+                    "active nodes %d, steps %d (%d rejected, %d SNES fails), nonlinear its %d, linear its %d"
+                    % (
+                        nActive,
+                        ts.getStepNumber(),
+                        ts.getStepRejections(),
+                        ts.getSNESFailures(),
+                        ts.getSNESIterations(),
+                        ts.getKSPIterations(),
+                    )
+                )
+
+        # Get diffused sediment thicknesses
+        self.dh.waxpy(-1.0, self.hGlobal, self.hw)
+        self.dm.globalToLocal(self.dh, self.tmpL)
+        ndepo = self.tmpL.getArray().copy()
+        self.tmpL.setArray(ndepo)
+        self.dm.localToGlobal(self.tmpL, self.tmp)
+
+        if self.memclear:
+            del ndepo, sedK, active, inner
+            gc.collect()
+
+        return
+
+    def _marineTS(self, active):
+        """
+        Sets the persistent time stepping solver on the active marine sub-problem.
+
+        .. note::
+
+            The sub-problem operator, residual vector and solver are kept as long as the active nodes are unchanged on all partitions. Otherwise, they are rebuilt while the timing statistics of the solver role are kept.
+
+        :arg active: boolean array of local active nodes (consistent across partitions)
+        """
+
+        subPos = np.where(active[self.glIDs])[0]
+        same = np.zeros(1, dtype=np.int64)
+        if self.marineKey is not None and "marine-diffusion" in self.solvers:
+            same[0] = int(np.array_equal(self.marineKey, subPos))
+        MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, same, op=MPI.MIN)
+        if same[0] == 1:
+            return
+
+        if "marine-diffusion" in self.solvers:
+            solver = self.solvers["marine-diffusion"]
+            solver["solver"].destroy()
+            solver["op"].destroy()
+            self.subVec.destroy()
+            stime = solver["time"]
+        else:
+            stime = np.zeros(3)
+
+        mat = self._activeMarine(active)
+        self.subVec = mat.createVecLeft()
+
         ts = petsc4py.PETSc.TS().create(comm=petsc4py.PETSc.COMM_WORLD)
         # arkimex: IMEX Runge-Kutta schemes | rosw: Rosenbrock W-schemes
         ts.setType("rosw")
 
-        ts.setIFunction(self._evalFunction, self.tmp1)
-        ts.setIJacobian(self._evalJacobian, self.mat)
-
-        ts.setTime(0.0)
-        ts.setTimeStep(self.dt / 1000.0)
-        ts.setMaxTime(self.dt)
-        ts.setMaxSteps(self.tsStep)
+        ts.setIFunction(self._evalFunction, self.subVec)
+        ts.setIJacobian(self._evalJacobian, mat)
         ts.setExactFinalTime(petsc4py.PETSc.TS.ExactFinalTime.MATCHSTEP)
 
         # Allow an unlimited number of failures
@@ -364,47 +882,13 @@ class SEAMesh(object):
         pc.setType("gasm")
 
         ts.setFromOptions()
-        tstart = ts.getTime()
-        self._evalSolution(tstart, x)
-
-        # Solve nonlinear equation
-        ts.solve(x)
-        # te = ts.getTime()
-        if MPIrank == 0 and self.verbose:
-            print(
-                "Nonlinear diffusion solution (%0.02f seconds)" % (process_time() - t0),
-                flush=True,
-            )
-            print(
-                "steps %d (%d rejected, %d SNES fails), nonlinear its %d, linear its %d"
-                % (
-                    ts.getStepNumber(),
-                    ts.getStepRejections(),
-                    ts.getSNESFailures(),
-                    ts.getSNESIterations(),
-                    ts.getKSPIterations(),
-                )
-            )
-
-        # Clean solver
-        pc.destroy()
-        ksp.destroy()
-        snes.destroy()
-        ts.destroy()
-
-        # Get diffused sediment thicknesses
-        x.copy(result=self.h)
-        self.dh.waxpy(-1.0, self.hGlobal, self.h)
-        self.dm.globalToLocal(self.dh, self.tmpL)
-        ndepo = self.tmpL.getArray().copy()
-        self.tmpL.setArray(ndepo)
-        self.dm.localToGlobal(self.tmpL, self.tmp)
-
-        x.destroy()
-        f.destroy()
-        if self.memclear:
-            del ndepo, sedK
-            gc.collect()
+        self.marineKey = subPos
+        self.solvers["marine-diffusion"] = {
+            "solver": ts,
+            "op": mat,
+            "is": None,
+            "time": stime,
+        }
 
         return
 
@@ -430,7 +914,7 @@ class SEAMesh(object):
 
             \mathrm{\frac{\eta_i^{t+\Delta t}-\eta_i^t}{\Delta t}} = \mathrm{G{_m} Q_{s_i} / \Omega_i}
 
-        This system of coupled equations is solved implicitly using PETSc by assembling the matrix and vectors using the nested submatrix and subvectors and by using the ``fieldsplit`` preconditioner combining two separate preconditioners for the collections of variables.
+        This system of coupled equations is solved implicitly using PETSc by assembling the matrix and vectors using the nested submatrix and subvectors and by using the ``fieldsplit`` preconditioner combining two separate preconditioners for the collections of variables. The nested system is kept alive across time steps (see `_coupledSolve`).
 
         :arg sedflux: incoming marine sediment volumes
 
@@ -442,29 +926,7 @@ class SEAMesh(object):
         fDepm[fDepm > 0.99] = 0.99
         fDepm[hl > self.sealevel] = 0.
 
-        # Define submatrices
-        A00 = self._matrix_build_diag(-fDepm)
-        A00.axpy(1.0, self.iMat)
-        A01 = self._matrix_build_diag(-fDepm * self.dt / self.larea)
-        A10 = self._matrix_build_diag(self.larea / self.dt)
-
-        # Assemble the matrix for the coupled system
-        mats = [[A00, A01], [A10, self.dMat2]]
-        sysMat = petsc4py.PETSc.Mat().createNest(mats=mats, comm=MPIcomm)
-        sysMat.assemblyBegin()
-        sysMat.assemblyEnd()
-
-        # Clean up
-        A00.destroy()
-        A01.destroy()
-        A10.destroy()
-        self.dMat2.destroy()
-        mats[0][0].destroy()
-        mats[0][1].destroy()
-        mats[1][0].destroy()
-        mats[1][1].destroy()
-
-        # Create nested vectors
+        # Create right hand side vectors
         self.tmpL.setArray(1. - fDepm)
         self.dm.localToGlobal(self.tmpL, self.tmp)
         self.tmp.pointwiseMult(self.tmp, self.hGlobal)
@@ -475,61 +937,12 @@ class SEAMesh(object):
         self.h.scale(1. / self.dt)
         self.tmp1.axpy(1., self.h)
 
-        rhs_vec = petsc4py.PETSc.Vec().createNest([self.tmp, self.tmp1], comm=MPIcomm)
-        rhs_vec.setUp()
-        hq_vec = rhs_vec.duplicate()
-
-        # Define solver and precondition conditions
-        ksp = petsc4py.PETSc.KSP().create(petsc4py.PETSc.COMM_WORLD)
-        ksp.setType(petsc4py.PETSc.KSP.Type.TFQMR)
-        ksp.setOperators(sysMat)
-        ksp.setTolerances(rtol=self.rtol)
-
-        pc = ksp.getPC()
-        pc.setType("fieldsplit")
-        nested_IS = sysMat.getNestISs()
-        pc.setFieldSplitIS(('h', nested_IS[0][0]), ('q', nested_IS[0][1]))
-
-        subksps = pc.getFieldSplitSubKSP()
-        subksps[0].setType("preonly")
-        subksps[0].getPC().setType("asm")
-        subksps[1].setType("preonly")
-        subksps[1].getPC().setType("bjacobi")
-
-        ksp.solve(rhs_vec, hq_vec)
-        r = ksp.getConvergedReason()
-        if r < 0:
-            KSPReasons = self._make_reasons(petsc4py.PETSc.KSP.ConvergedReason())
-            if MPIrank == 0:
-                print(
-                    "Linear solver for marine deposition failed to converge after iterations",
-                    ksp.getIterationNumber(),
-                    flush=True,
-                )
-                print("with reason: ", KSPReasons[r], flush=True)
-        else:
-            if MPIrank == 0 and self.verbose:
-                print(
-                    "Linear solver for marine deposition converge after %d iterations"
-                    % ksp.getIterationNumber(),
-                    flush=True,
-                )
-
-        # Update the solution
-        self.newH = hq_vec.getSubVector(nested_IS[0][0])
-
-        # Clean up
-        subksps[0].destroy()
-        subksps[1].destroy()
-        nested_IS[0][0].destroy()
-        nested_IS[1][0].destroy()
-        nested_IS[0][1].destroy()
-        nested_IS[1][1].destroy()
-        pc.destroy()
-        ksp.destroy()
-        sysMat.destroy()
-        hq_vec.destroy()
-        rhs_vec.destroy()
+        # Solve the coupled system
+        diags = [-fDepm, -fDepm * self.dt / self.larea, self.larea / self.dt]
+        self._coupledSolve(
+            "marine", self.iMat, self.dMat2, diags, [self.tmp, self.tmp1], ("asm", "bjacobi")
+        )
+        self.dMat2.destroy()
 
         # Get the marine deposition volume
         self.tmp.waxpy(-1.0, self.hGlobal, self.newH)
@@ -544,6 +957,8 @@ class SEAMesh(object):
         Based on the incoming marine volumes of sediment and maximum clinoforms slope we distribute
         locally sediments downslope.
 
+        Each partition routes the sediments in a single pass over its nodes sorted by decreasing filled elevations: a node deposits the incoming volume up to its available space and passes the excess to its receivers. Only the excess reaching ghost nodes is then exchanged with the neighbouring partitions and routed in a new pass, until less than 1 m3 remains to be distributed.
+
         :arg sedflux: incoming marine sediment volumes
 
         :return: vdep (the deposited volume of the distributed sediments)
@@ -551,49 +966,55 @@ class SEAMesh(object):
 
         marVol = self.maxDepQs.copy()
         sinkVol = sedflux.copy()
-        self.tmpL.setArray(sinkVol)
-        self.dm.localToGlobal(self.tmpL, self.tmp)
+        sinkVol[self.ghostIDs] = 0.0
+        inVol = np.zeros(self.lpoints, dtype=float)
         vdep = np.zeros(self.lpoints, dtype=float)
 
         step = 0
-        while self.tmp.sum() > 1.0:
-
-            # Move to downstream nodes
-            self.dMat1.mult(self.tmp, self.tmp1)
-            self.dm.globalToLocal(self.tmp1, self.tmpL)
-
-            # In case there is too much sediment coming in
-            sinkVol = self.tmpL.getArray().copy()
-            excess = sinkVol >= marVol
-            sinkVol[excess] -= marVol[excess]
-            vdep[excess] += marVol[excess]
-            marVol[excess] = 0.0
-
-            # In case there is some room to deposit sediments
-            noexcess = np.invert(excess)
-            marVol[noexcess] -= sinkVol[noexcess]
-            vdep[noexcess] += sinkVol[noexcess]
-            vdep[self.idBorders] = 0.0
-            sinkVol[noexcess] = 0.0
-            sinkVol[self.idBorders] = 0.0
-
-            # Find where excess and sink
-            self.tmpL.setArray(sinkVol)
-            self.dm.localToGlobal(self.tmpL, self.tmp)
-
+        sumExcess = MPI.COMM_WORLD.allreduce(sinkVol.sum())
+        while sumExcess > 1.0:
+
+            # Route downstream over the partition
+            dep, outVol = distocean(
+                self.oRcv.shape[1],
+                self.oOrder,
+                sinkVol,
+                inVol,
+                self.oRcv,
+                self.oWght,
+                marVol,
+            )
+            vdep += dep
+            marVol -= dep
+            sinkVol.fill(0.0)
+            outVol[self.idBorders] = 0.0
+
+            # Send the excess reaching ghost nodes to their partition
+            self.tmpL.setArray(outVol)
+            self.tmp.set(0.0)
+            self.dm.localToGlobal(self.tmpL, self.tmp, addv=petsc4py.PETSc.InsertMode.ADD)
             sumExcess = self.tmp.sum()
+            self.dm.globalToLocal(self.tmp, self.tmpL)
+            inVol = self.tmpL.getArray().copy()
+            inVol[self.ghostIDs] = 0.0
+
             if MPIrank == 0 and self.verbose:
-                if step % 100 == 0:
-                    print(
-                        "  --- Marine excess (sum in km3) %0.05f | iter %d"
-                        % (sumExcess * 10.e-9, step),
-                        flush=True
-                    )
+                print(
+                    "  --- Marine excess (sum in km3) %0.05f | pass %d"
+                    % (sumExcess * 10.e-9, step),
+                    flush=True
+                )
 
             step += 1
 
+        # Update deposited volumes on ghost nodes
+        self.tmpL.setArray(vdep)
+        self.dm.localToGlobal(self.tmpL, self.tmp)
+        self.dm.globalToLocal(self.tmp, self.tmpL)
+        vdep = self.tmpL.getArray().copy()
+
         if self.memclear:
-            del marVol, sinkVol
+            del marVol, sinkVol, inVol
             gc.collect()
 
         return vdep
@@ -639,7 +1060,6 @@ class SEAMesh(object):
         if not self.flatModel and self.Gmar > 0.:
             vdep = self._depMarineSystem(marDep)
             marDep = self._distOcean(vdep)
-        self.dMat1.destroy()
 
         # Diffuse downstream
         dh = np.divide(marDep, self.larea, out=np.zeros_like(self.larea), where=self.larea != 0)
@@ -53,6 +53,11 @@ class SEDMesh(object):
         MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, maxnb, op=MPI.MAX)
         self.maxnb = maxnb[0]
 
+        # Cached hillslope diffusion operator
+        self.hillCoeffs = None
+        self.hillCols = None
+        self.hillDt = None
+
         return
 
     def getSedFlux(self):
@@ -74,7 +79,15 @@ class SEDMesh(object):
 
         # Get the volume of sediment transported in m3 per year
         self.tmp.pointwiseMult(self.tmp, self.areaGlobal)
-        self._solve_KSP(False, self.fMati, self.tmp, self.vSed)
+        self._solve_flow(
+            False,
+            self.fMati,
+            self.tmp,
+            self.vSed,
+            rcv=self.rcvIDi,
+            wght=self.wghtVali,
+            role="sed",
+        )
         self.fMati.destroy()
 
         # Update local vector
@@ -87,20 +100,21 @@ class SEDMesh(object):
 
         return
 
-    def _moveDownstream(self, vSed, step):
+    def _moveDownstream(self, vSed, hl):
         """
         In cases where river sediment fluxes drain into depressions, they might fill the sink completely and overspill or be deposited in it. This function computes the excess of sediment (if any) able to flow dowstream.
 
-        .. important::
+        .. note::
 
-            The excess sediment volume is then added to the downstream sediment flux (`vSed`).
+            Similarly to the water fluxes, the sediment volumes entering each depression are routed over the depressions graph (see `_pitGraph` and `_routePits`) and the excess sediment is distributed downstream in a single solve, with sources located at the spillover nodes of the filled depressions.
 
-        :arg vSed: excess sediment volume array
-        :arg step: downstream distribution step
+        .. important::
 
-        :return: excess (boolean set to True is excess sediment fluxes remain to be distributed)
+            The excess sediment volume is then added to the downstream sediment flux (`vSedLocal`).
+
+        :arg vSed: sediment volume array
+        :arg hl: local elevation prior deposition
         """
-        excess = False
 
         # Remove points belonging to other processors
         vSed = np.multiply(vSed, self.inIDs)
@@ -116,39 +130,32 @@ class SEDMesh(object):
         # Combine incoming volume globally
         MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, inV, op=MPI.SUM)
 
-        # Get excess volume to distribute downstream
-        eV = inV - self.pitVol
-        if (eV > 0.0).any():
-            eIDs = eV > 0.0
-            self.pitVol[eIDs] = 0.0
-            spillIDs = self.pitInfo[eIDs, 0]
-            localSpill = np.where(self.pitInfo[eIDs, 1] == MPIrank)[0]
-            localPts = spillIDs[localSpill]
-            nvSed = np.zeros(self.lpoints, dtype=np.float64)
-            nvSed[localPts] = eV[eIDs][localSpill]
-            ids = np.in1d(self.pitIDs, np.where(eV > 0.0)[0])
-            self.sedFilled[ids] = self.lFill[ids]
-
-        # Update unfilled depressions volumes
-        eIDs = eV < 0
-        self.pitVol[eIDs] -= inV[eIDs]
-        self.pitVol[self.pitVol < 0] = 0.0
-
-        # In case there is still remaining sediment flux to distribute downstream
-        if (eV > 1.0e-3).any():
-            if step == 100:
-                self._buildFlowDirection(self.lFill)
-            else:
-                self._buildFlowDirection(self.sedFilled)
-            self.tmpL.setArray(nvSed)
+        # Route incoming volumes over the depressions graph
+        spill, src, self.pitVol = self._routePits(inV, self.pitVol)
+
+        # Filled depressions
+        pits = self.pitIDs > -1
+        ids = pits.copy()
+        ids[pits] = spill[self.pitIDs[pits]] > 0.0
+        self.sedFilled[ids] = self.lFill[ids]
+
+        # In case there is remaining sediment flux to distribute downstream
+        if (spill > 1.0e-3).any() and src.sum() > 0.5 * self.maxarea[0]:
+            self._buildFlowDirection(self.sedFilled)
+            self.tmpL.setArray(self._spillSources(src))
             self.dm.localToGlobal(self.tmpL, self.tmp)
-            if self.tmp.sum() > 0.5 * self.maxarea[0]:
-                excess = True
-                self._solve_KSP(True, self.fMat, self.tmp, self.tmp1)
-                self.dm.globalToLocal(self.tmp1, self.tmpL)
+            self._solve_flow(
+                True, self.fMat, self.tmp, self.tmp1, role="sed", reuse=self.fMatSame
+            )
+            self.dm.globalToLocal(self.tmp1, self.tmpL)
             self.fMat.destroy()
+            nvSed = self.tmpL.getArray().copy()
+            nvSed[hl < self.sedFilled] = 0.0
+            nvSed[nvSed < 0.0] = 0.0
+            self.tmpL.setArray(nvSed / self.dt)
+            self.vSedLocal.axpy(1.0, self.tmpL)
 
-        return excess
+        return
 
     def _distributeSediment(self, hl):
         """
@@ -166,26 +173,8 @@ class SEDMesh(object):
         # Get the volumetric sediment rate (m3/yr) to distribute during the time step and convert it in volume (m3)
         vSed = self.QsL.getArray().copy() * self.dt
 
-        step = 0
-        excess = True
         self.fMat.destroy()
-        while excess:
-            t1 = process_time()
-            excess = self._moveDownstream(vSed, step)
-            if excess:
-                vSed = self.tmpL.getArray().copy()
-                nvSed = vSed.copy()
-                nvSed[hl < self.sedFilled] = 0.0
-                self.tmpL.setArray(nvSed / self.dt)
-                vSed[self.idBorders] = 0.0
-                self.vSedLocal.axpy(1.0, self.tmpL)
-            if MPIrank == 0 and self.verbose:
-                print(
-                    "Downstream sediment flux computation step %d (%0.02f seconds)"
-                    % (step, process_time() - t1),
-                    flush=True,
-                )
-            step += 1
+        self._moveDownstream(vSed, hl)
         self.dm.localToGlobal(self.vSedLocal, self.vSed)
 
         if MPIrank == 0 and self.verbose:
@@ -252,6 +241,7 @@ class SEDMesh(object):
         hl = self.hLocal.getArray().copy()
         self.lsink = self.lsinki.copy()
         self.pitVol = self.pitParams[:, 0].copy()
+        self._pitGraph(hl, self.rcvIDi, self.wghtVali, self.lsink)
 
         # Distribute inland sediments
         self.sedFilled = hl.copy()
@@ -297,6 +287,65 @@ class SEDMesh(object):
 
         return
 
+    def _hillOperator(self):
+        """
+        Returns the persistent solver of the hillslope diffusion with its operator updated for the current marine nodes (`hillslope` role).
+
+        .. note::
+
+            The operator is assembled once with a sparsity pattern defined by the mesh geometry. At each call, the diffusion coefficients are computed with the fortran `sethillslopecoeff` function and only the rows which have changed since the previous call (nodes whose land/sea status flipped and their neighbours) are updated in place. The preconditioner is kept between calls and only rebuilt when the operator is assembled again (*i.e.* when the time step changes).
+
+        :return: ksp PETSc KSP solver
+        """
+
+        Cd = np.full(self.lpoints, self.Cda, dtype=np.float64)
+        Cd[self.seaID] = self.Cdm
+        diffCoeffs = sethillslopecoeff(self.lpoints, Cd * self.dt)[:, : self.maxnb + 1]
+        if self.flatModel:
+            diffCoeffs[self.idBorders, 1:] = 0.0
+            diffCoeffs[self.idBorders, 0] = 1.0
+
+        ngbs = self.FVmesh_ngbID[:, : self.maxnb]
+        build = self.hillCoeffs is None or self.hillDt != self.dt
+        if build:
+            # Sparsity pattern from the mesh geometry
+            geo = sethillslopecoeff(self.lpoints, np.ones(self.lpoints))
+            geo = geo[:, : self.maxnb + 1]
+            self.hillCols = np.where(geo[:, 1:] != 0.0, ngbs, -1)
+            diffMat = self._matrix_build_csr(ngbs, geo[:, 1:], diag=geo[:, 0])
+            ksp = self._getKSP(
+                "hillslope", diffMat, "richardson", "bjacobi", rtol=self.rtol
+            )
+            diffMat.destroy()
+            rows = np.arange(self.lpoints)
+            self.hillDt = self.dt
+        else:
+            ksp = self.solvers["hillslope"]["solver"]
+            rows = np.where((diffCoeffs != self.hillCoeffs).any(axis=1))[0]
+        self.hillCoeffs = diffCoeffs
+
+        # Update the changed rows in place (ghost rows are ignored)
+        nrows = MPI.COMM_WORLD.allreduce(np.count_nonzero(self.inIDs[rows] == 1))
+        if nrows > 0:
+            t0 = process_time()
+            op = self.solvers["hillslope"]["op"]
+            cols = np.concatenate((rows[:, None], self.hillCols[rows]), axis=1)
+            op.setValuesLocalRCV(
+                rows[:, None].astype(petsc4py.PETSc.IntType),
+                cols.astype(petsc4py.PETSc.IntType),
+                diffCoeffs[rows],
+            )
+            op.assemblyBegin()
+            op.assemblyEnd()
+            self.solvers["hillslope"]["time"][0] += process_time() - t0
+        ksp.setReusePreconditioner(not build)
+
+        if self.memclear:
+            del Cd, ngbs, rows
+            gc.collect()
+
+        return ksp
+
     def _hillSlope(self, smooth=0):
         r"""
         This function computes hillslope using a linear diffusion law commonly referred to as **soil creep**:
@@ -309,7 +358,7 @@ class SEDMesh(object):
         .. note::
             The hillslope processes in `gospl` are considered to be happening at the same rate for coarse and fine sediment sizes.
 
-        :arg smooth: integer specifying if the diffusion equation is used for ice flow (1) and marine deposits (2).
+        :arg smooth: integer specifying if the diffusion equation is used for ice flow (1).
         """
 
         if smooth == 0:
@@ -317,73 +366,52 @@ class SEDMesh(object):
                 return
 
         t0 = process_time()
-        # Diffusion matrix construction
         if smooth == 1:
+            # Diffusion matrix construction
             Cd = np.full(self.lpoints, self.gaussIce, dtype=np.float64)
             Cd[~self.iceIDs] = 0.0
-        elif smooth == 2:
-            # Hard-coded coefficients here, used to generate a smooth surface
-            # for computing marine flow directions...
-            Cd = np.full(self.lpoints, 1.e5, dtype=np.float64)
-            Cd[self.seaID] = 5.e6
-        else:
-            Cd = np.full(self.lpoints, self.Cda, dtype=np.float64)
-            Cd[self.seaID] = self.Cdm
-        diffCoeffs = sethillslopecoeff(self.lpoints, Cd * self.dt)
-        if self.flatModel:
-            diffCoeffs[self.idBorders, 1:] = 0.0
-            diffCoeffs[self.idBorders, 0] = 1.0
-
-        diffMat = self._matrix_build_diag(diffCoeffs[:, 0])
-        indptr = np.arange(0, self.lpoints + 1, dtype=petsc4py.PETSc.IntType)
-
-        for k in range(0, self.maxnb):
-            tmpMat = self._matrix_build()
-            indices = self.FVmesh_ngbID[:, k].copy()
-            data = diffCoeffs[:, k + 1]
-            ids = np.nonzero(data == 0.0)
-            indices[ids] = ids
-            tmpMat.assemblyBegin()
-            tmpMat.setValuesLocalCSR(
-                indptr,
-                indices.astype(petsc4py.PETSc.IntType),
-                data,
+            diffCoeffs = sethillslopecoeff(self.lpoints, Cd * self.dt)
+            if self.flatModel:
+                diffCoeffs[self.idBorders, 1:] = 0.0
+                diffCoeffs[self.idBorders, 0] = 1.0
+
+            diffMat = self._matrix_build_csr(
+                self.FVmesh_ngbID[:, : self.maxnb],
+                diffCoeffs[:, 1 : self.maxnb + 1],
+                diag=diffCoeffs[:, 0],
             )
-            tmpMat.assemblyEnd()
-            diffMat.axpy(1.0, tmpMat)
-            tmpMat.destroy()
 
-        # Get elevation values for considered time step
-        if smooth == 1:
+            # Get elevation values for considered time step
             if self.tmp1.max()[1] > 0:
-                self._solve_KSP(True, diffMat, self.tmp1, self.tmp)
+                self._solve_KSP(True, diffMat, self.tmp1, self.tmp, role="ice")
             else:
                 self.tmp1.copy(result=self.tmp)
             diffMat.destroy()
             self.dm.globalToLocal(self.tmp, self.tmpL)
             return self.tmpL.getArray().copy()
-        elif smooth == 2:
-            self._solve_KSP(True, diffMat, self.hGlobal, self.tmp)
-            diffMat.destroy()
-            self.dm.globalToLocal(self.tmp, self.tmpL)
-            return self.tmpL.getArray().copy()
-        else:
-            self.hGlobal.copy(result=self.hOld)
-            self._solve_KSP(True, diffMat, self.hOld, self.hGlobal)
-            diffMat.destroy()
-            # Update cumulative erosion/deposition and elevation
-            self.tmp.waxpy(-1.0, self.hOld, self.hGlobal)
-            self.cumED.axpy(1.0, self.tmp)
-            self.dm.globalToLocal(self.cumED, self.cumEDLocal)
-            self.dm.globalToLocal(self.hGlobal, self.hLocal)
-
-            if self.memclear:
-                del ids, indices, indptr, diffCoeffs, Cd
-                gc.collect()
-
-            if self.stratNb > 0:
-                self.erodeStrat()
-                self.deposeStrat()
+
+        # Cached diffusion operator and preconditioner
+        ksp = self._hillOperator()
+        self.hGlobal.copy(result=self.hOld)
+        ksp.setInitialGuessNonzero(True)
+        ts0 = process_time()
+        ksp.solve(self.hOld, self.hGlobal)
+        self._solverTime("hillslope", ts0)
+        if ksp.getConvergedReason() < 0:
+            self.hOld.copy(result=self.hGlobal)
+            self._solve_KSP2(
+                self.solvers["hillslope"]["op"], self.hOld, self.hGlobal, "hillslope"
+            )
+
+        # Update cumulative erosion/deposition and elevation
+        self.tmp.waxpy(-1.0, self.hOld, self.hGlobal)
+        self.cumED.axpy(1.0, self.tmp)
+        self.dm.globalToLocal(self.cumED, self.cumEDLocal)
+        self.dm.globalToLocal(self.hGlobal, self.hLocal)
+
+        if self.stratNb > 0:
+            self.erodeStrat()
+            self.deposeStrat()
 
         if MPIrank == 0 and self.verbose:
             print(
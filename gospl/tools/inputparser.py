@@ -247,6 +247,21 @@ class ReadYaml(object):
         except KeyError:
             self.advscheme = 1
 
+        try:
+            flowsolver = domainDict["flowsolver"]
+            if flowsolver == 'topo':
+                self.topoFlow = True
+            elif flowsolver == 'ksp':
+                self.topoFlow = False
+            else:
+                print(
+                    "Key 'flowsolver' should be either 'ksp' or 'topo'!", flush=True
+                )
+                raise ValueError("Flow solver definition is not recognised!")
+        except KeyError:
+            self.topoFlow = False
+        self.topoIter = 100
+
         try:
             self.radius = domainDict["radius"]
         except KeyError:
@@ -257,6 +272,47 @@ class ReadYaml(object):
         except KeyError:
             self.gravity = 9.81
 
+        self._extraDomain3()
+
+        return
+
+    def _extraDomain3(self):
+        """
+        Read domain solvers and depressions filling options.
+        """
+
+        domainDict = self.input["domain"]
+
+        try:
+            self.matFree = domainDict["matfree"]
+        except KeyError:
+            self.matFree = False
+
+        try:
+            self.fillTol = domainDict["filltol"]
+        except KeyError:
+            self.fillTol = None
+
+        try:
+            self.schurSplit = domainDict["schur"]
+        except KeyError:
+            self.schurSplit = False
+
+        try:
+            self.ompThreads = domainDict["threads"]
+        except KeyError:
+            self.ompThreads = None
+
+        try:
+            self.parMesh = domainDict["parmesh"]
+        except KeyError:
+            self.parMesh = False
+
+        try:
+            self.meshCache = domainDict["meshcache"]
+        except KeyError:
+            self.meshCache = None
+
         return
 
     def _readTime(self):
@@ -496,12 +552,22 @@ class ReadYaml(object):
                 self.offshore = hillDict["offshore"]
             except KeyError:
                 self.offshore = 100.e5
+            try:
+                self.smthIt = hillDict["smthIt"]
+            except KeyError:
+                self.smthIt = 0
+            try:
+                self.smthTol = hillDict["smthTol"]
+            except KeyError:
+                self.smthTol = 1.0e-3
         except KeyError:
             self.nlK = 10.0
             self.clinSlp = 1.0e-6
             self.Gmar = 0.
             self.tsStep = 2000
             self.offshore = 100.e5
+            self.smthIt = 0
+            self.smthTol = 1.0e-3
 
         self.clinSlp = max(1.0e-6, self.clinSlp)
 